@@ -1,18 +1,31 @@
 #!/usr/bin/env python3
 import sys, json, math, re, os
-import networkx as nx
-import matplotlib.pyplot as plt
+from array import array
+# networkx / matplotlib are imported inside render_graph: metrics-only runs never load them.
+from agentbound_ir import GEN, GraphIR, csr, read_ir
+from agentbound_kinds import classify
 
-GEN_HINTS = re.compile(
-    r"(?:\b|_)(llm|gpt|model|generate|generator|writer|assistant|agent|supervisor)(?:\b|_)",
-    re.I,
-)
+VALIDATOR_WORDS = ("validator", "validators", "validate", "validates", "validation", "verifier", "verify",
+                   "verification", "guard", "guards", "check", "checks", "checker")
+# Whole words or between underscores, as in agentbound_kinds, so `checkout` or `guardrail_llm` do not count.
+VALIDATOR_HINTS = re.compile(rf"(?:\b|_)({'|'.join(VALIDATOR_WORDS)})(?:\b|_)", re.I)
 OUT_DIR = "out"
 
-def infer_kind(node_id, label):
-    if node_id.startswith("__"): return "aux"
-    txt = f"{node_id} {label or ''}".lower()
-    return "generative" if GEN_HINTS.search(txt) else "deterministic"
+def is_validator(node, kind):
+    """Deterministic nodes tagged `validator: true` / `role: "validator"`, or named like one."""
+    if kind != "deterministic": return False
+    if "validator" in node: return bool(node["validator"])
+    if node.get("role"): return node["role"] == "validator"
+    return bool(VALIDATOR_HINTS.search(f"{node['id']} {node.get('label') or ''}"))
+
+def entropy_from_counts(G, D, gg):
+    """The V0 entropy formula from its three counts (shared with agentbound_whatif)."""
+    coupling = 1.0 + (math.sqrt(gg) / max(1, G)) if G>0 else 1.0
+    score = (G / max(1, G+D)) * coupling + 0.1*gg
+    level = "Low" if score < 0.3 else "Moderate" if score < 0.6 else "High" if score < 0.9 else "Very High"
+    return dict(entropy_score=round(score,3), entropy_level=level,
+                generative_nodes=G, deterministic_nodes=D,
+                gen_to_gen_edges=gg, coupling_factor=round(coupling,3))
 
 def compute_entropy(nodes, edges):
     # exclude aux nodes from scoring
@@ -21,12 +34,209 @@ def compute_entropy(nodes, edges):
     D = sum(1 for n in filtered if n["kind"] == "deterministic")
     gen_ids = {n["id"] for n in filtered if n["kind"] == "generative"}
     gg = sum(1 for a,b in edges if a in gen_ids and b in gen_ids)
-    coupling = 1.0 + (math.sqrt(gg) / max(1, G)) if G>0 else 1.0
-    score = (G / max(1, G+D)) * coupling + 0.1*gg
-    level = "Low" if score < 0.3 else "Moderate" if score < 0.6 else "High" if score < 0.9 else "Very High"
-    return dict(entropy_score=round(score,3), entropy_level=level,
-                generative_nodes=G, deterministic_nodes=D,
-                gen_to_gen_edges=gg, coupling_factor=round(coupling,3))
+    return entropy_from_counts(G, D, gg)
+
+def compute_entropy_ir(ir):
+    return entropy_from_counts(*ir.entropy_counts())
+
+def strongly_connected_components(offsets, targets):
+    """Iterative Tarjan over CSR adjacency; SCCs come out in reverse topological order."""
+    n = len(offsets) - 1
+    index = [-1]*n; low = [0]*n; on_stack = [False]*n
+    stack, sccs, counter = [], [], 0
+    for root in range(n):
+        if index[root] != -1: continue
+        index[root] = low[root] = counter; counter += 1
+        stack.append(root); on_stack[root] = True
+        work = [(root, offsets[root])]
+        while work:
+            v, i = work[-1]
+            if i < offsets[v+1]:
+                work[-1] = (v, i+1)
+                w = targets[i]
+                if index[w] == -1:
+                    index[w] = low[w] = counter; counter += 1
+                    stack.append(w); on_stack[w] = True
+                    work.append((w, offsets[w]))
+                elif on_stack[w]:
+                    low[v] = min(low[v], index[w])
+                continue
+            work.pop()
+            if work:
+                u = work[-1][0]
+                low[u] = min(low[u], low[v])
+            if low[v] == index[v]:
+                comp = []
+                while True:
+                    w = stack.pop(); on_stack[w] = False; comp.append(w)
+                    if w == v: break
+                sccs.append(comp)
+    return sccs
+
+def structural_metrics(nodes, edges):
+    return structural_metrics_ir(GraphIR.from_lists(nodes, edges))
+
+def structural_metrics_ir(ir):
+    """Loops (non-trivial SCCs) and the longest generative-only chain, both O(V+E).
+
+    The chain is a longest path in the condensation of the gen→gen subgraph; a
+    generative loop counts each of its members once and sets gen_chain_has_loop.
+    """
+    ids, offs, tg = ir.ids, ir.offsets, ir.targets
+    is_gen = [k == GEN for k in ir.kinds]
+    self_loop = [False]*ir.n
+    for a, b in ir.edge_pairs():
+        if a == b: self_loop[a] = True
+
+    loops = [c for c in strongly_connected_components(offs, tg) if len(c) > 1 or self_loop[c[0]]]
+    gen_in_loops = sorted(ids[v] for c in loops for v in c if is_gen[v])
+
+    # Generative-only subgraph -> condensation -> longest path by DP (sinks first)
+    src, dst = array("I"), array("I")
+    for a, b in ir.edge_pairs():
+        if is_gen[a] and is_gen[b]: src.append(a); dst.append(b)
+    g_offs, g_tg = csr(ir.n, src, dst)
+    comps = [c for c in strongly_connected_components(g_offs, g_tg) if is_gen[c[0]]]
+    comp_of = {}
+    for ci, c in enumerate(comps):
+        for v in c: comp_of[v] = ci
+    best, nxt = [0]*len(comps), [-1]*len(comps)
+    for ci, c in enumerate(comps):  # successors' comps always have smaller indices
+        for v in c:
+            for i in range(g_offs[v], g_offs[v+1]):
+                cw = comp_of[g_tg[i]]
+                if cw != ci and best[cw] > best[ci]:
+                    best[ci], nxt[ci] = best[cw], cw
+        best[ci] += len(c)
+    path, cyclic = [], False
+    if comps:
+        ci = max(range(len(comps)), key=lambda k: best[k])
+        while ci != -1:
+            c = comps[ci]
+            cyclic = cyclic or len(c) > 1 or self_loop[c[0]]
+            path.extend(ids[v] for v in reversed(c))
+            ci = nxt[ci]
+    return dict(loops=len(loops), generative_nodes_in_loops=gen_in_loops,
+                longest_gen_chain=len(path), longest_gen_chain_path=path,
+                gen_chain_has_loop=cyclic)
+
+def dominator_tree(succ, pred, root):
+    """Immediate dominators from `root` (Lengauer-Tarjan with path compression, iterative).
+
+    succ and pred are (offsets, targets) CSR pairs. Returns idom as a list;
+    idom[root] == root and unreachable vertices stay -1.
+    """
+    s_offs, s_tg = succ
+    p_offs, p_tg = pred
+    n = len(s_offs) - 1
+    dfnum, parent, vertex = [-1]*n, [-1]*n, [root]
+    dfnum[root] = 0
+    work = [(root, s_offs[root])]
+    while work:
+        v, i = work[-1]
+        if i < s_offs[v+1]:
+            work[-1] = (v, i+1)
+            w = s_tg[i]
+            if dfnum[w] == -1:
+                dfnum[w] = len(vertex); parent[w] = v; vertex.append(w)
+                work.append((w, s_offs[w]))
+        else:
+            work.pop()
+
+    semi = dfnum[:]
+    ancestor, label = [-1]*n, list(range(n))
+    idom, bucket = [-1]*n, [[] for _ in range(n)]
+
+    def evaluate(v):
+        if ancestor[v] == -1: return v
+        path = []
+        while ancestor[ancestor[v]] != -1:
+            path.append(v); v = ancestor[v]
+        for u in reversed(path):
+            a = ancestor[u]
+            if semi[label[a]] < semi[label[u]]: label[u] = label[a]
+            ancestor[u] = ancestor[a]
+        return label[path[0]] if path else label[v]
+
+    for i in range(len(vertex)-1, 0, -1):
+        w = vertex[i]
+        for j in range(p_offs[w], p_offs[w+1]):
+            v = p_tg[j]
+            if dfnum[v] == -1: continue
+            u = evaluate(v)
+            if semi[u] < semi[w]: semi[w] = semi[u]
+        bucket[vertex[semi[w]]].append(w)
+        p = parent[w]
+        ancestor[w] = p
+        for v in bucket[p]:
+            u = evaluate(v)
+            idom[v] = u if semi[u] < semi[v] else p
+        bucket[p] = []
+    for w in vertex[1:]:
+        if idom[w] != vertex[semi[w]]: idom[w] = idom[idom[w]]
+    idom[root] = root
+    return idom
+
+def validator_coverage(nodes, edges):
+    return validator_coverage_ir(GraphIR.from_lists(nodes, edges))
+
+def validator_coverage_ir(ir):
+    """Is every path from each generative node to a sink routed through a validator?
+
+    Coverage is reachability with validators removed (no path enumeration);
+    the post-dominator tree (dominators of the reversed graph from a virtual
+    exit behind every sink) names the validator every path goes through, if one does.
+    """
+    ids, n = ir.ids, ir.n
+    exit_ = n
+    sinks = [v for v in range(n) if not ir.out_degree(v)]
+    # Reversed graph with exit -> sink, and its transpose (the graph with sink -> exit)
+    pred = ir.adjacency(reverse=True, extra_src=[exit_]*len(sinks), extra_dst=sinks, size=n+1)
+    succ = ir.adjacency(extra_src=sinks, extra_dst=[exit_]*len(sinks), size=n+1)
+    ipdom = dominator_tree(pred, succ, exit_)
+    validator = ir.validator
+    p_offs, p_tg = pred
+
+    # Reverse BFS from the sinks that never enters a validator; nxt[v] is a hop towards a sink.
+    nxt = [-1]*n
+    seen = [False]*n
+    queue = [v for v in sinks if not validator[v]]
+    for v in queue: seen[v] = True
+    for v in queue:
+        for j in range(p_offs[v], p_offs[v+1]):
+            u = p_tg[j]
+            if not seen[u] and not validator[u]:
+                seen[u] = True; nxt[u] = v; queue.append(u)
+
+    report = []
+    for v in range(n):
+        if ir.kinds[v] != GEN: continue
+        by, d = None, ipdom[v]
+        while d not in (-1, exit_) and by is None:
+            if validator[d]: by = ids[d]
+            d = ipdom[d]
+        reaches = ipdom[v] != -1
+        # A node that reaches no sink has nothing to cover: None, and left out of the percentage.
+        entry = {"node": ids[v], "covered": (not seen[v]) if reaches else None, "validated_by": by,
+                 "reaches_sink": reaches}
+        if seen[v]:
+            path, u = [ids[v]], v
+            while nxt[u] != -1:
+                u = nxt[u]; path.append(ids[u])
+            entry["unvalidated_path"] = path
+        report.append(entry)
+    scored = [e for e in report if e["reaches_sink"]]
+    covered = sum(e["covered"] for e in scored)
+    return {"validators": [ids[v] for v in range(n) if validator[v]],
+            "validator_coverage_pct": round(100.0 * covered / len(scored), 1) if scored else None,
+            "validator_coverage": report}
+
+def graph_metrics(ir):
+    """Entropy, structural metrics and validator coverage of one GraphIR."""
+    met = compute_entropy_ir(ir)
+    met.update(structural_metrics_ir(ir))
+    met.update(validator_coverage_ir(ir))
+    return met
 
 def resilience_index(results):
     try:
@@ -45,27 +255,19 @@ def quadrant(entropy, res):
     if not e_high and r_high:     return "Robust"
     return "Antifragile"
 
-def main(graph_json, results_json=None, kind_map_json=None, output_path=None):
-    # normalize empty-string args
-    results_json = results_json if results_json and results_json.strip() else None
-    kind_map_json = kind_map_json if kind_map_json and kind_map_json.strip() else None
-    output_path  = output_path  if output_path  and output_path.strip()  else None
-    
-    data = json.load(open(graph_json))
-    kind_map = json.load(open(kind_map_json)) if (kind_map_json and os.path.exists(kind_map_json)) else {}
+def load_ir(graph_json, kind_map=None, warn=True):
+    """Stream a graph JSON into a GraphIR, classifying nodes (kind_map > declared kind > inference).
 
-     # Build nodes with kinds (+ warn on kind_map mismatches)
-    nodes = []
-    graph_ids = set()
-    for n in data["nodes"]:
-        nid   = n["id"]
-        label = n.get("label") or nid
-        kind  = (kind_map.get(nid) if kind_map else None) or infer_kind(nid, label)
-        nodes.append({"id": nid, "label": label, "kind": kind})
-        graph_ids.add(nid)
-    edges = [tuple(e) for e in data["edges"]]
-
-    if kind_map:
+    Accepts top-level [[a, b]] edges or per-node "edges" lists; edges to unknown
+    nodes are dropped (ir.dangling).
+    """
+    kind_map = kind_map or {}
+    kind_fn = lambda n: classify(n["id"], n.get("label") or n["id"], n.get("kind"), kind_map)
+    ir = read_ir(graph_json, kind_fn, is_validator)
+
+    # Warn on kind_map mismatches
+    if kind_map and warn:
+        graph_ids = set(ir.ids)
         km_ids = set(kind_map.keys())
         missing_in_graph = sorted(km_ids - graph_ids)
         unused_in_km     = sorted(graph_ids - km_ids)
@@ -73,44 +275,62 @@ def main(graph_json, results_json=None, kind_map_json=None, output_path=None):
             print(f"[warn] kind_map keys not found in graph: {missing_in_graph}")
         if unused_in_km:
             print(f"[note] nodes not in kind_map (will be inferred): {unused_in_km}")
+    return ir
 
-    # Compute metrics
-    met = compute_entropy(nodes, edges)
+def ir_from_doc(data, kind_map=None):
+    """load_ir for an already-parsed graph document (either edge format)."""
+    kind_map = kind_map or {}
+    nodes, edges = [], []
+    for n in data["nodes"]:
+        nid, label = n["id"], n.get("label") or n["id"]
+        kind = classify(nid, label, n.get("kind"), kind_map)
+        nodes.append({"id": nid, "label": label, "kind": kind, "validator": is_validator(n, kind)})
+        edges.extend((nid, t) for t in n.get("edges") or ())
+    edges.extend(tuple(e) for e in data.get("edges") or ())
+    return GraphIR.from_lists(nodes, edges)
 
-    # Optional resilience/quadrant
-    res = None
-    if results_json and os.path.exists(results_json):
-        res = resilience_index(json.load(open(results_json)))
-        if res is not None:
-            met["resilience_index"] = round(res,3)
-            met["quadrant"] = quadrant(met["entropy_score"], res)
+def load_graph(graph_json, kind_map=None, warn=True):
+    """(nodes, edges) as node dicts and (a, b) id tuples, for callers that edit the graph."""
+    ir = load_ir(graph_json, kind_map, warn)
+    return ir.to_nodes(), ir.edges()
+
+def render_graph(nodes, edges, met, out_png, layout="layered", cache_dir=None):
+    import networkx as nx
+    import matplotlib.pyplot as plt
+    from agentbound_layout import compute_layout
 
     # Draw (pure matplotlib)
     G = nx.DiGraph()
     for n in nodes: G.add_node(n["id"], **n)
     for a,b in edges: G.add_edge(a,b)
 
-    pos = nx.spring_layout(G, seed=42)  # deterministic layout
+    pos = compute_layout(G.nodes, G.edges, method=layout, cache_dir=cache_dir)  # deterministic, cached by graph hash
     gen_ids = {n["id"] for n in nodes if n["kind"]=="generative"}
 
+    # Large graphs: bigger canvas, smaller nodes, labels only while they stay readable
+    grow  = min(4.0, max(1.0, (G.number_of_nodes() / 30) ** 0.5))
+    shrink = 1.0 / grow ** 2
+
     # Node styling
     node_colors = []
     node_sizes  = []
     for nid in G.nodes:
         kind = G.nodes[nid]["kind"]
-        if kind=="generative": node_colors.append("#cfe8ff"); node_sizes.append(2200)
-        elif kind=="aux":      node_colors.append("#f5f5f5"); node_sizes.append(1800)
-        else:                  node_colors.append("#e8e8e8"); node_sizes.append(2000)
+        if kind=="generative": node_colors.append("#cfe8ff"); node_sizes.append(2200*shrink)
+        elif kind=="aux":      node_colors.append("#f5f5f5"); node_sizes.append(1800*shrink)
+        else:                  node_colors.append("#e8e8e8"); node_sizes.append(2000*shrink)
 
-    plt.figure(figsize=(9,7))
+    plt.figure(figsize=(9*grow,7*grow))
     nx.draw_networkx_nodes(G, pos, node_color=node_colors, node_size=node_sizes, linewidths=1.2, edgecolors="#444444")
-    nx.draw_networkx_labels(G, pos, labels={n:G.nodes[n].get("label",n) for n in G.nodes}, font_size=10)
+    if G.number_of_nodes() <= 500:
+        nx.draw_networkx_labels(G, pos, labels={n:G.nodes[n].get("label",n) for n in G.nodes}, font_size=10 if grow == 1.0 else 7)
 
     # Draw edges: gen->gen in red
     gg_edges = [(a,b) for a,b in G.edges if a in gen_ids and b in gen_ids]
-    other_edges = [(a,b) for a,b in G.edges if (a,b) not in gg_edges]
-    nx.draw_networkx_edges(G, pos, edgelist=other_edges, arrows=True, arrowsize=14, width=1.2, edge_color="#666666")
-    nx.draw_networkx_edges(G, pos, edgelist=gg_edges, arrows=True, arrowsize=16, width=2.4, edge_color="red")
+    gg_set = set(gg_edges)
+    other_edges = [(a,b) for a,b in G.edges if (a,b) not in gg_set]
+    nx.draw_networkx_edges(G, pos, edgelist=other_edges, arrows=True, arrowsize=14, width=1.2, edge_color="#666666", node_size=node_sizes)
+    nx.draw_networkx_edges(G, pos, edgelist=gg_edges, arrows=True, arrowsize=16, width=2.4, edge_color="red", node_size=node_sizes)
 
     # Footer with metrics
     footer = f"Entropy: {met['entropy_score']} ({met['entropy_level']})  |  G={met['generative_nodes']}  D={met['deterministic_nodes']}  gen→gen={met['gen_to_gen_edges']}  coupling={met['coupling_factor']}"
@@ -119,41 +339,171 @@ def main(graph_json, results_json=None, kind_map_json=None, output_path=None):
     plt.figtext(0.5, 0.01, footer, ha="center", fontsize=9)
 
     plt.tight_layout(rect=(0,0.03,1,0.97))
+    plt.savefig(out_png, dpi=200)
+    plt.close()
 
-    # Build names from the *input* JSON path
-
+def output_paths(graph_json, output_path=None):
     # Determine base output directory.
     # Default: current working directory. Otherwise: user-specified path.
-
     base_dir = output_path if output_path else "."
     out_dir = os.path.join(base_dir, OUT_DIR)
     os.makedirs(out_dir, exist_ok=True)
 
+    # Build names from the *input* JSON path
     basename   = os.path.splitext(os.path.basename(graph_json))[0]
     out_png    = os.path.join(out_dir, f"{basename}.png")
     out_report = os.path.join(out_dir, f"{basename}_report.json")
+    return out_png, out_report
 
-    plt.savefig(out_png, dpi=200)
-    plt.close()
+def score(graph_json, kind_map_json=None, results_json=None):
+    """Metrics only: the report dict without drawing, writing files or importing plotting libraries."""
+    kind_map = json.load(open(kind_map_json)) if (kind_map_json and os.path.exists(kind_map_json)) else {}
+    met = graph_metrics(load_ir(graph_json, kind_map, warn=False))
+    if results_json and os.path.exists(results_json):
+        res = resilience_index(json.load(open(results_json)))
+        if res is not None:
+            met["resilience_index"] = round(res,3)
+            met["quadrant"] = quadrant(met["entropy_score"], res)
+    return {"graph_json": graph_json, **met}
+
+def main(graph_json, results_json=None, kind_map_json=None, output_path=None, render=True, layout="layered"):
+    # normalize empty-string args
+    results_json = results_json if results_json and results_json.strip() else None
+    kind_map_json = kind_map_json if kind_map_json and kind_map_json.strip() else None
+    output_path  = output_path  if output_path  and output_path.strip()  else None
+
+    kind_map = json.load(open(kind_map_json)) if (kind_map_json and os.path.exists(kind_map_json)) else {}
+    ir = load_ir(graph_json, kind_map)
+
+    # Compute metrics
+    met = graph_metrics(ir)
+
+    # Optional resilience/quadrant
+    res = None
+    if results_json and os.path.exists(results_json):
+        res = resilience_index(json.load(open(results_json)))
+        if res is not None:
+            met["resilience_index"] = round(res,3)
+            met["quadrant"] = quadrant(met["entropy_score"], res)
+
+    out_png, out_report = output_paths(graph_json, output_path)
+    if render:
+        render_graph(ir.to_nodes(), ir.edges(), met, out_png, layout, cache_dir=os.path.join(os.path.dirname(out_png), ".layout_cache"))
 
     # Save the metrics to a matching report file (handy for A/B)
     with open(out_report, "w") as f:
         json.dump({"graph_json": graph_json, **met}, f, indent=2)
 
-    print(f"Graph PNG saved to: {out_png}")
+    if render:
+        print(f"Graph PNG saved to: {out_png}")
     print(f"Report saved to: {out_report}")
 
     # Print JSON summary
     print(json.dumps({"graph_json": graph_json, **met}, indent=2))
-    print(f"\nSaved: {out_png}")
+    if render:
+        print(f"\nSaved: {out_png}")
+
+# ---------- Batch mode ----------
+CSV_FIELDS = ["graph_json", "entropy_score", "entropy_level", "generative_nodes",
+              "deterministic_nodes", "gen_to_gen_edges", "coupling_factor", "loops",
+              "longest_gen_chain", "gen_chain_has_loop", "validator_coverage_pct", "error"]
+
+def expand_inputs(inputs):
+    """Directories (recursive *.json), glob patterns and plain files -> sorted unique paths."""
+    import glob
+    paths = set()
+    for item in inputs:
+        if os.path.isdir(item):
+            paths.update(glob.glob(os.path.join(item, "**", "*.json"), recursive=True))
+        elif glob.has_magic(item):
+            paths.update(p for p in glob.glob(item, recursive=True) if os.path.isfile(p))
+        else:
+            paths.add(item)
+    return sorted(paths)
+
+def score_file(graph_json, kind_map=None, render_dir=None):
+    """Score one graph file; failures come back as an 'error' record instead of raising."""
+    try:
+        ir = load_ir(graph_json, kind_map, warn=False)
+        met = graph_metrics(ir)
+        if render_dir:
+            out_png, out_report = output_paths(graph_json, render_dir)
+            render_graph(ir.to_nodes(), ir.edges(), met, out_png, cache_dir=os.path.join(os.path.dirname(out_png), ".layout_cache"))
+            with open(out_report, "w") as f:
+                json.dump({"graph_json": graph_json, **met}, f, indent=2)
+        return {"graph_json": graph_json, **met}
+    except Exception as e:
+        return {"graph_json": graph_json, "error": f"{type(e).__name__}: {e}"}
+
+def _score_task(task):
+    return score_file(*task)
+
+def batch_main(argv):
+    import argparse, csv, time
+    ap = argparse.ArgumentParser(prog="agentbound.py --batch",
+                                 description="Score many graphs in one process and write one aggregate file")
+    ap.add_argument("inputs", nargs="+", help="Graph JSON files, directories (recursive) or glob patterns")
+    ap.add_argument("--out", default=os.path.join(OUT_DIR, "batch_scores.jsonl"),
+                    help="Aggregate output; .csv for CSV, anything else for JSON lines")
+    ap.add_argument("--kind-map", help="JSON mapping node_id->kind applied to every graph")
+    ap.add_argument("--workers", type=int, default=1, help="Worker processes (0 = all cores)")
+    ap.add_argument("--no-render", action="store_true", help="Skip PNG diagrams and per-graph reports")
+    ap.add_argument("--output-path", default=None, help="Base directory for rendered outputs (default: .)")
+    args = ap.parse_args(argv)
+
+    t0 = time.time()
+    paths = expand_inputs(args.inputs)
+    if not paths:
+        raise SystemExit(f"No graph JSON files found in {args.inputs}")
+    kind_map = json.load(open(args.kind_map)) if args.kind_map else {}
+    render_dir = None if args.no_render else (args.output_path or ".")
+    tasks = [(p, kind_map, render_dir) for p in paths]
+
+    workers = args.workers or os.cpu_count() or 1
+    if workers > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            records = list(pool.map(_score_task, tasks, chunksize=max(1, len(tasks) // (workers * 8))))
+    else:
+        records = [_score_task(t) for t in tasks]
+
+    out_dir = os.path.dirname(args.out)
+    if out_dir:
+        os.makedirs(out_dir, exist_ok=True)
+    with open(args.out, "w", newline="") as f:
+        if args.out.endswith(".csv"):
+            w = csv.DictWriter(f, fieldnames=CSV_FIELDS, extrasaction="ignore")
+            w.writeheader()
+            w.writerows(records)
+        else:
+            for r in records:
+                f.write(json.dumps(r) + "\n")
+
+    dt = time.time() - t0
+    errors = sum(1 for r in records if "error" in r)
+    print(f"[batch] Scored {len(records) - errors} graphs ({errors} errors) in {dt:.2f}s "
+          f"({len(records) / max(dt, 1e-9):.1f} graphs/s); output -> {args.out}")
 
 if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        print("Usage: python agentbound.py <graph_json> [results_json] [kind_map_json] [output_path]")
+    if len(sys.argv) > 1 and sys.argv[1] == "--batch":
+        batch_main(sys.argv[2:])
+        sys.exit(0)
+    no_render = "--no-render" in sys.argv[1:]
+    argv = [a for a in sys.argv[1:] if a != "--no-render"]
+    layout = "layered"
+    if "--layout" in argv:
+        i = argv.index("--layout")
+        layout = argv[i+1] if i+1 < len(argv) else ""
+        del argv[i:i+2]
+    if not argv or layout not in ("layered", "spring"):
+        print("Usage: python agentbound.py <graph_json> [results_json] [kind_map_json] [output_path] [--no-render] [--layout layered|spring]")
+        print("       python agentbound.py --batch <dir|glob|file>... [--out scores.jsonl] [--workers N] [--no-render]")
         sys.exit(1)
     main(
-            sys.argv[1],
-            sys.argv[2] if len(sys.argv) > 2 else None,
-            sys.argv[3] if len(sys.argv) > 3 else None,
-            sys.argv[4] if len(sys.argv) > 4 else None,
+            argv[0],
+            argv[1] if len(argv) > 1 else None,
+            argv[2] if len(argv) > 2 else None,
+            argv[3] if len(argv) > 3 else None,
+            render=not no_render,
+            layout=layout,
         )
\ No newline at end of file
@@ -1,67 +1,174 @@
 #!/usr/bin/env python3
-import json, os, math, re, argparse
-import networkx as nx
-import matplotlib.pyplot as plt
-
-GEN_HINTS = re.compile(r"(?:\b|_)(llm|gpt|model|generate|writer|assistant|agent|supervisor)(?:\b|_)", re.I)
-
-def infer_kind(nid, label):
-    if nid.startswith("__"): return "aux"
-    txt = f"{nid} {label or ''}".lower()
-    return "generative" if GEN_HINTS.search(txt) else "deterministic"
-
-def build_nodes_edges(data, kind_map=None):
-    kind_map = kind_map or {}
-    nodes = []
-    for n in data["nodes"]:
-        nid = n["id"]; label = n.get("label") or nid
-        kind = kind_map.get(nid) or infer_kind(nid, label)
-        nodes.append({"id": nid, "label": label, "kind": kind})
-    edges = [tuple(e) for e in data["edges"]]
-    return nodes, edges
-
-def compute_entropy(nodes, edges):
-    filt = [n for n in nodes if n["kind"] != "aux"]
-    Gc = sum(1 for n in filt if n["kind"]=="generative")
-    Dc = sum(1 for n in filt if n["kind"]=="deterministic")
-    gen_ids = {n["id"] for n in filt if n["kind"]=="generative"}
-    gg = sum(1 for a,b in edges if a in gen_ids and b in gen_ids)
-    coupling = 1.0 + (math.sqrt(gg)/max(1,Gc)) if Gc>0 else 1.0
-    score = (Gc/max(1,Gc+Dc))*coupling + 0.1*gg
-    band = "Low" if score<0.3 else "Moderate" if score<0.6 else "High" if score<0.9 else "Very High"
-    return dict(entropy_score=round(score,3), entropy_level=band,
-                generative_nodes=Gc, deterministic_nodes=Dc,
-                gen_to_gen_edges=gg, coupling_factor=round(coupling,3))
-
-def find_drivers(nodes, edges):
-    """Return {'risk_hub': <node or None>, 'anchors': [ids], 'gg_edges': [(a,b),..]}"""
+import json, os, math, random, argparse
+# networkx / matplotlib are imported where drivers and drawings need them, so --no-render stays light.
+
+from agentbound import compute_entropy_ir, load_ir, strongly_connected_components
+from agentbound_ir import DET, GEN
+
+# ---------- Betweenness (Brandes exact, or Riondato-Kornaropoulos path sampling) ----------
+EXACT_MAX_NODES = 1000
+
+def _brandes(succ, sources, bc):
+    """Add unnormalized betweenness from `sources` to bc; Brandes 2001."""
+    n = len(succ)
+    sigma, dist, delta = [0]*n, [-1]*n, [0.0]*n
+    preds = [[] for _ in range(n)]
+    for s in sources:
+        sigma[s] = 1; dist[s] = 0
+        order, head = [s], 0
+        while head < len(order):
+            v = order[head]; head += 1
+            dv, sv = dist[v] + 1, sigma[v]
+            for w in succ[v]:
+                if dist[w] < 0:
+                    dist[w] = dv; order.append(w)
+                if dist[w] == dv:
+                    sigma[w] += sv; preds[w].append(v)
+        for w in reversed(order):
+            coeff = (1.0 + delta[w]) / sigma[w]
+            for v in preds[w]:
+                delta[v] += sigma[v] * coeff
+            if w != s:
+                bc[w] += delta[w]
+        for w in order:  # reset only what this BFS touched
+            sigma[w] = 0; dist[w] = -1; delta[w] = 0.0; preds[w] = []
+    return bc
+
+def _bfs_ecc(adj, root, inside):
+    """Eccentricity of root in the subgraph induced by `inside` (a set)."""
+    seen, frontier, depth = {root}, [root], 0
+    while True:
+        frontier = [w for v in frontier for w in adj[v] if w in inside and w not in seen and not seen.add(w)]
+        if not frontier:
+            return depth
+        depth += 1
+
+def vertex_diameter_bound(ir, succ):
+    """Upper bound on the nodes of any shortest path, O(V+E).
+
+    A shortest path visits each SCC once, in condensation order, and inside an SCC C
+    it is a shortest path of C, so it has at most min(|C|, ecc_in(x) + ecc_out(x) + 1)
+    nodes there for any x in C. The bound is the heaviest condensation path.
+    """
+    sccs = strongly_connected_components(ir.offsets, ir.targets)  # successors' SCCs come first
+    pred = [[] for _ in range(ir.n)]
+    for v in range(ir.n):
+        for w in succ[v]:
+            pred[w].append(v)
+    comp_of = [0]*ir.n
+    for ci, c in enumerate(sccs):
+        for v in c: comp_of[v] = ci
+    best = [0]*len(sccs)
+    for ci, c in enumerate(sccs):
+        size = 1
+        if len(c) > 1:
+            inside = set(c)
+            size = min(len(c), _bfs_ecc(succ, c[0], inside) + _bfs_ecc(pred, c[0], inside) + 1)
+        best[ci] = size + max((best[comp_of[w]] for v in c for w in succ[v] if comp_of[w] != ci), default=0)
+    return max(best, default=0)
+
+def rk_samples(vd, epsilon, delta):
+    """Riondato & Kornaropoulos (2016): path samples for additive error epsilon on every node w.p. 1 - delta."""
+    return math.ceil(0.5 / epsilon**2 * (math.floor(math.log2(max(1, vd - 2))) + 1 + math.log(1 / delta)))
+
+def _sample_paths(succ, samples, rng, counts):
+    """Add to counts[w] the times w is inside one uniform shortest path of a uniform random pair (u, v)."""
+    n = len(succ)
+    sigma, dist = [0]*n, [-1]*n
+    preds = [[] for _ in range(n)]
+    for _ in range(samples):
+        u, v = rng.sample(range(n), 2)
+        sigma[u] = 1; dist[u] = 0
+        order, head = [u], 0
+        while head < len(order):
+            x = order[head]; head += 1
+            if x == v:  # v's level is complete, so are sigma[v] and preds[v]
+                break
+            dx, sx = dist[x] + 1, sigma[x]
+            for w in succ[x]:
+                if dist[w] < 0:
+                    dist[w] = dx; order.append(w)
+                if dist[w] == dx:
+                    sigma[w] += sx; preds[w].append(x)
+        if dist[v] > 0:
+            w = rng.choices(preds[v], weights=[sigma[p] for p in preds[v]])[0]
+            while w != u:
+                counts[w] += 1
+                w = rng.choices(preds[w], weights=[sigma[p] for p in preds[w]])[0]
+        for w in order:
+            sigma[w] = 0; dist[w] = -1; preds[w] = []
+    return counts
+
+def risk_hubs(ir, k=3, mode="auto", epsilon=0.05, delta=0.05, seed=0):
+    """Top-k generative nodes by normalized betweenness (same scale as networkx).
+
+    mode "exact" runs Brandes from every node. "approx" samples node pairs and one
+    uniform shortest path per pair (Riondato & Kornaropoulos 2016); the sample
+    count depends only on a vertex-diameter bound, and every score is within
+    `epsilon` (absolute) of the exact value with probability 1 - delta. When that
+    count is not below the node count, exact is as cheap and runs instead, with
+    "fallback" saying why. "auto" is exact up to EXACT_MAX_NODES nodes.
+    """
+    n = ir.n
+    succ = [list(dict.fromkeys(ir.successors(v))) for v in range(n)]
+    gen = [v for v in range(n) if ir.kinds[v] == GEN]
+    exact = mode == "exact" or (mode == "auto" and n <= EXACT_MAX_NODES) or n <= 2
+    out = {"requested": mode}
+    if not exact:
+        # RK estimate the pair-averaged score (1/(n(n-1))); networkx divides by (n-1)(n-2).
+        scale = n / (n - 2)
+        vd = vertex_diameter_bound(ir, succ)
+        samples = rk_samples(vd, epsilon / scale, delta)
+        out["vertex_diameter_bound"] = vd
+        if samples >= n:
+            exact = True
+            out["fallback"] = f"{samples} path samples for epsilon {epsilon:g} are not fewer than {n} nodes"
+    if exact:
+        bc = _brandes(succ, range(n), [0.0]*n)
+        norm = 1.0 / ((n - 1) * (n - 2)) if n > 2 else 1.0
+        score, err, used = [b * norm for b in bc], 0.0, n
+    else:
+        counts = _sample_paths(succ, samples, random.Random(seed), [0]*n)
+        score, err, used = [c * scale / samples for c in counts], epsilon, samples
+
+    ranked = sorted(gen, key=lambda v: -score[v])
+    hubs = []
+    for rank, v in enumerate(ranked[:k]):
+        nxt = score[ranked[rank + 1]] if rank + 1 < len(ranked) else None
+        hubs.append({"id": ir.ids[v], "betweenness": round(score[v], 4), "error_bound": err,
+                     "confidence": 1.0 if exact else round(1.0 - delta, 4),
+                     # rank is certain if this hub's interval lies above the next candidate's
+                     "rank_certain": nxt is None or score[v] - err > nxt + err})
+    out.update(method="exact" if exact else "approx", pivots=used, hubs=hubs)
+    return out
+
+def find_drivers(ir, k=3, mode="auto", epsilon=0.05, delta=0.05):
+    """Return {'risk_hub': <node or None>, 'risk_hubs': {...}, 'anchors': [ids], 'gg_edges': [(a,b),..]}"""
+    ids, kinds = ir.ids, ir.kinds
+
+    # Risk hubs: generative nodes ranked by betweenness
+    hubs = risk_hubs(ir, k=k, mode=mode, epsilon=epsilon, delta=delta)
+    risk_hub = hubs["hubs"][0]["id"] if hubs["hubs"] else None
+
+    # Anchors: deterministic nodes with degree >= 2 (fan-in/out), counting each distinct edge once
+    degree = [0]*ir.n
+    gg_edges = []
+    for a in range(ir.n):
+        for b in dict.fromkeys(ir.successors(a)):
+            degree[a] += 1; degree[b] += 1
+            if kinds[a] == GEN and kinds[b] == GEN:
+                gg_edges.append((ids[a], ids[b]))
+    anchors = [ids[v] for v in range(ir.n) if kinds[v] == DET and degree[v] >= 2]
+    return {"risk_hub": risk_hub, "risk_hubs": hubs, "anchors": anchors, "gg_edges": gg_edges}
+
+def draw_graph(ax, nodes, edges, title, metrics, drivers, pos=None):
+    import networkx as nx
+    from agentbound_layout import compute_layout
     G = nx.DiGraph()
     for n in nodes: G.add_node(n["id"], **n)
-    for a,b in edges: G.add_edge(a,b)
-
-    gen_ids = {n["id"] for n in nodes if n["kind"]=="generative"}
-    det_ids = {n["id"] for n in nodes if n["kind"]=="deterministic"}
-
-    # Risk hub: highest betweenness among generative nodes (if any)
-    risk_hub = None
-    if gen_ids:
-        bc = nx.betweenness_centrality(G, normalized=True)
-        # pick gen node with max centrality
-        risk_hub = max(gen_ids, key=lambda nid: bc.get(nid, 0.0))
-
-    # Anchors: deterministic nodes with degree >= 2 (fan-in/out)
-    anchors = []
-    for nid in det_ids:
-        deg = G.in_degree(nid) + G.out_degree(nid)
-        if deg >= 2:
-            anchors.append(nid)
-
-    gg_edges = [(a,b) for a,b in G.edges if a in gen_ids and b in gen_ids]
-    return {"risk_hub": risk_hub, "anchors": anchors, "gg_edges": gg_edges, "G": G}
-
-def draw_graph(ax, nodes, edges, title, metrics, drivers):
-    G = drivers["G"]
-    pos = nx.spring_layout(G, seed=42)
+    G.add_edges_from(edges)
+    if pos is None:
+        pos = compute_layout(G.nodes, G.edges)
     gen_ids = {n["id"] for n in nodes if n["kind"]=="generative"}
 
     # Base node styling
@@ -88,7 +195,8 @@ def draw_graph(ax, nodes, edges, title, metrics, drivers):
 
     # Edges (gen→gen in red)
     gg_edges = drivers["gg_edges"]
-    other_edges = [(a,b) for a,b in G.edges if (a,b) not in gg_edges]
+    gg_set = set(gg_edges)
+    other_edges = [(a,b) for a,b in G.edges if (a,b) not in gg_set]
     nx.draw_networkx_edges(G, pos, ax=ax, edgelist=other_edges, arrows=True,
                            arrowsize=12, width=1.2, edge_color="#666666")
     nx.draw_networkx_edges(G, pos, ax=ax, edgelist=gg_edges, arrows=True,
@@ -113,30 +221,122 @@ def draw_graph(ax, nodes, edges, title, metrics, drivers):
 
 def load_json(path): return json.load(open(path))
 
+# ---------- N-way comparison ----------
+def analyze_variant(path, kind_map, drv_opts, render=True):
+    """Score one variant with its risk hubs; nodes, edges and the other drivers only when rendering."""
+    ir = load_ir(path, kind_map, warn=False)
+    met = compute_entropy_ir(ir)
+    if not render:
+        return None, None, met, {"risk_hubs": risk_hubs(ir, **drv_opts)}
+    return ir.to_nodes(), ir.edges(), met, find_drivers(ir, **drv_opts)
+
+def _variant_task(task):
+    return analyze_variant(*task)
+
+def variant_names(paths):
+    """File stems, suffixed with their position when two variants share a stem."""
+    stems = [os.path.splitext(os.path.basename(p))[0] for p in paths]
+    return [f"{s}#{i+1}" if stems.count(s) > 1 else s for i, s in enumerate(stems)]
+
+def delta_matrix(mets, key):
+    """m[i][j] = metric(j) - metric(i), i.e. the change going from row variant to column variant."""
+    vals = [m[key] for m in mets]
+    return [[round(b - a, 3) for b in vals] for a in vals]
+
+def render_grid(names, variants, ranking, out, layout="layered"):
+    """Small-multiples grid in rank order, all panels sharing one union layout."""
+    import matplotlib.pyplot as plt
+    from agentbound_layout import compute_layout
+    union_ids = list(dict.fromkeys(n["id"] for nodes, _, _, _ in variants for n in nodes))
+    union_edges = list(dict.fromkeys(e for _, edges, _, _ in variants for e in edges))
+    pos = compute_layout(union_ids, union_edges, method=layout,
+                         cache_dir=os.path.join("out", ".layout_cache"))
+    cols = math.ceil(math.sqrt(len(names)))
+    rows = math.ceil(len(names) / cols)
+    fig, axes = plt.subplots(rows, cols, figsize=(6*cols, 5*rows), squeeze=False)
+    for ax in axes.flat[len(names):]:
+        ax.axis("off")
+    for rank, i in enumerate(ranking):
+        nodes, edges, met, drv = variants[i]
+        draw_graph(axes.flat[rank], nodes, edges, f"#{rank+1} {names[i]}", met, drv, pos)
+    fig.suptitle(f"AgentBound — {len(names)}-way Design Comparison (ranked by entropy)", fontsize=16)
+    plt.tight_layout()
+    plt.savefig(out, dpi=200 if len(names) <= 4 else 100)
+    plt.close(fig)
+
+def nway_main(args):
+    paths = args.graphs
+    kinds = args.kinds or []
+    if len(kinds) > len(paths):
+        raise SystemExit(f"--kinds has {len(kinds)} entries for {len(paths)} graphs")
+    kind_maps = [load_json(k) if k and k != "-" and os.path.exists(k) else {}
+                 for k in kinds + [None] * (len(paths) - len(kinds))]
+    drv_opts = dict(k=args.top_k, mode=args.betweenness, epsilon=args.epsilon, delta=args.delta)
+    tasks = [(p, km, drv_opts, not args.no_render) for p, km in zip(paths, kind_maps)]
+
+    workers = args.workers or os.cpu_count() or 1
+    if workers > 1 and len(tasks) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as pool:
+            variants = list(pool.map(_variant_task, tasks))
+    else:
+        variants = [_variant_task(t) for t in tasks]
+
+    names = variant_names(paths)
+    mets = [v[2] for v in variants]
+    ranking = sorted(range(len(paths)), key=lambda i: (mets[i]["entropy_score"], mets[i]["coupling_factor"]))
+    report = {
+        "variants": names,
+        "ranking": [{"rank": r + 1, "variant": names[i], "graph_json": paths[i], **mets[i]}
+                    for r, i in enumerate(ranking)],
+        "delta_entropy": delta_matrix(mets, "entropy_score"),
+        "delta_coupling": delta_matrix(mets, "coupling_factor"),
+        "risk_hubs": {names[i]: variants[i][3]["risk_hubs"] for i in range(len(paths))},
+    }
+    if not args.no_render:
+        os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
+        render_grid(names, variants, ranking, args.out, args.layout)
+    print(json.dumps(report, indent=2))
+    if not args.no_render:
+        print("Saved:", args.out)
+
 if __name__ == "__main__":
-    ap = argparse.ArgumentParser(description="Side-by-side AgentBound comparison with driver labels")
-    ap.add_argument("graphA_json")
-    ap.add_argument("graphB_json")
+    ap = argparse.ArgumentParser(description="AgentBound design comparison with driver labels: "
+                                             "side by side for two graphs, ranked N-way for more")
+    ap.add_argument("graphs", nargs="+", metavar="graph_json", help="Two graphs (A, B) or any number of variants")
     ap.add_argument("--kindA", help="JSON mapping node_id->kind for A")
     ap.add_argument("--kindB", help="JSON mapping node_id->kind for B")
-    ap.add_argument("--out", default="out/compare.png")
+    ap.add_argument("--kinds", nargs="+", metavar="KIND_MAP",
+                    help="N-way: kind maps aligned with the graphs ('-' for none)")
+    ap.add_argument("--nway", action="store_true", help="Use the N-way report even for two graphs")
+    ap.add_argument("--workers", type=int, default=1, help="N-way: worker processes for per-variant work (0 = all cores)")
+    ap.add_argument("--out", default=None, help="PNG path (default out/compare.png, out/compare_grid.png for N-way)")
+    ap.add_argument("--no-render", action="store_true", help="Print the JSON diff and risk hubs only (no other drivers, no PNG)")
+    ap.add_argument("--layout", choices=["layered", "spring"], default="layered",
+                    help="Node placement; computed once over A ∪ B so shared nodes line up")
+    ap.add_argument("--betweenness", choices=["auto", "exact", "approx"], default="auto",
+                    help=f"Risk-hub centrality: exact Brandes, or shortest-path sampling (auto: exact up to {EXACT_MAX_NODES} nodes)")
+    ap.add_argument("--epsilon", type=float, default=0.05, help="Approx mode: max absolute error of every betweenness score")
+    ap.add_argument("--delta", type=float, default=0.05, help="Approx mode: probability the error bound fails")
+    ap.add_argument("--top-k", type=int, default=3, help="Number of ranked risk hubs to report")
     args = ap.parse_args()
 
-    os.makedirs("out", exist_ok=True)
+    if len(args.graphs) < 2:
+        ap.error("need at least two graphs to compare")
+    if args.nway or len(args.graphs) > 2:
+        args.out = args.out or os.path.join("out", "compare_grid.png")
+        nway_main(args)
+        raise SystemExit(0)
+    args.out = args.out or os.path.join("out", "compare.png")
 
-    dataA = load_json(args.graphA_json)
-    dataB = load_json(args.graphB_json)
     kindA = json.load(open(args.kindA)) if args.kindA and os.path.exists(args.kindA) else {}
     kindB = json.load(open(args.kindB)) if args.kindB and os.path.exists(args.kindB) else {}
 
-    nodesA, edgesA = build_nodes_edges(dataA, kindA)
-    nodesB, edgesB = build_nodes_edges(dataB, kindB)
+    irA = load_ir(args.graphs[0], kindA, warn=False)
+    irB = load_ir(args.graphs[1], kindB, warn=False)
 
-    metA = compute_entropy(nodesA, edgesA)
-    metB = compute_entropy(nodesB, edgesB)
-
-    drvA = find_drivers(nodesA, edgesA)
-    drvB = find_drivers(nodesB, edgesB)
+    metA = compute_entropy_ir(irA)
+    metB = compute_entropy_ir(irB)
 
     # Δ summary
     def fmt(x): return f"{x:.3f}" if isinstance(x, float) else str(x)
@@ -147,14 +347,35 @@ if __name__ == "__main__":
     delta_text = (f"Δ Entropy: {fmt(delta_entropy)}   |   Δ Coupling: {fmt(delta_coupling)}   |   "
                   f"Δ G: {delta_G}   Δ D: {delta_D}")
 
-    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15,7))
-    draw_graph(ax1, nodesA, edgesA, "Design A — High-entropy Supervisor", metA, drvA)
-    draw_graph(ax2, nodesB, edgesB, "Design B — Anchored Supervisor",     metB, drvB)
-    fig.suptitle("AgentBound — Pre-hoc Design Comparison (A vs B)\n" + delta_text, fontsize=14)
-    plt.tight_layout()
-    plt.savefig(args.out, dpi=200)
+    opts = dict(k=args.top_k, mode=args.betweenness, epsilon=args.epsilon, delta=args.delta)
+    if args.no_render:
+        hubs = {"A": risk_hubs(irA, **opts), "B": risk_hubs(irB, **opts)}
+    else:
+        import matplotlib.pyplot as plt
+        os.makedirs("out", exist_ok=True)
+
+        drvA = find_drivers(irA, **opts)
+        drvB = find_drivers(irB, **opts)
+        hubs = {"A": drvA["risk_hubs"], "B": drvB["risk_hubs"]}
+        nodesA, edgesA = irA.to_nodes(), irA.edges()
+        nodesB, edgesB = irB.to_nodes(), irB.edges()
+
+        # One layout over the union graph: nodes common to A and B stay in place
+        from agentbound_layout import compute_layout
+        union_ids = list(dict.fromkeys([n["id"] for n in nodesA] + [n["id"] for n in nodesB]))
+        pos = compute_layout(union_ids, list(dict.fromkeys(edgesA + edgesB)), method=args.layout,
+                             cache_dir=os.path.join("out", ".layout_cache"))
+
+        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15,7))
+        draw_graph(ax1, nodesA, edgesA, "Design A — High-entropy Supervisor", metA, drvA, pos)
+        draw_graph(ax2, nodesB, edgesB, "Design B — Anchored Supervisor",     metB, drvB, pos)
+        fig.suptitle("AgentBound — Pre-hoc Design Comparison (A vs B)\n" + delta_text, fontsize=14)
+        plt.tight_layout()
+        plt.savefig(args.out, dpi=200)
 
-    print(json.dumps({"A": metA, "B": metB, "delta": {
+    report = {"A": metA, "B": metB, "delta": {
         "entropy": delta_entropy, "coupling": delta_coupling, "G": delta_G, "D": delta_D
-    }}, indent=2))
-    print("Saved:", args.out)
+    }, "risk_hubs": hubs}
+    print(json.dumps(report, indent=2))
+    if not args.no_render:
+        print("Saved:", args.out)
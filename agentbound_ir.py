@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Compact graph IR shared by agentbound.py, agentbound_compare.py and the
+validation scripts.
+
+One graph is held as:
+
+  ids        interned node id strings, index = node number
+  kinds      bytearray, one code per node (KIND_CODES)
+  validator  bytearray, 1 for validator nodes
+  labels     display labels
+  offsets    array('Q') CSR row pointers, len n+1
+  targets    array('I') CSR column indices, len m
+
+Edges keep their multiplicity and, per source node, their file order, so every
+metric sees the same successor order it saw with edge lists. Edges to ids that
+are not nodes are dropped and counted in `dangling`. `offsets`/`targets` can
+be viewed as NumPy arrays without copying (`np.frombuffer`); networkx is only
+built on request (`to_networkx`) for drawing.
+"""
+
+from array import array
+
+from agentbound_loader import load_graph_stream
+
+KIND_NAMES = ("deterministic", "generative", "aux")
+KIND_CODES = {k: i for i, k in enumerate(KIND_NAMES)}
+DET, GEN, AUX = 0, 1, 2
+NUMPY_MIN_EDGES = 1 << 16  # below this the pure-Python counting sort is faster than importing NumPy
+
+def kind_code(kind):
+    code = KIND_CODES.get(str(kind).lower())
+    if code is None:
+        raise ValueError(f"unknown node kind {kind!r} (expected one of {', '.join(KIND_NAMES)})")
+    return code
+
+def csr(n, src, dst):
+    """Stable counting sort of (src, dst) pairs into (offsets, targets)."""
+    if len(src) >= NUMPY_MIN_EDGES:
+        try:
+            import numpy as np
+        except ImportError:
+            np = None
+        if np is not None:
+            s = np.frombuffer(src, dtype=np.uint32)
+            offsets = np.zeros(n + 1, dtype=np.uint64)
+            np.cumsum(np.bincount(s, minlength=n), out=offsets[1:])
+            targets = np.frombuffer(dst, dtype=np.uint32)[np.argsort(s, kind="stable")]
+            return array("Q", offsets.tobytes()), array("I", targets.tobytes())
+    offsets = array("Q", bytes(8 * (n + 1)))
+    for a in src:
+        offsets[a + 1] += 1
+    for i in range(n):
+        offsets[i + 1] += offsets[i]
+    fill = array("Q", offsets[:-1])
+    targets = array("I", bytes(4 * len(src)))
+    for a, b in zip(src, dst):
+        targets[fill[a]] = b
+        fill[a] += 1
+    return offsets, targets
+
+class GraphIR:
+    __slots__ = ("ids", "index", "kinds", "validator", "labels", "offsets", "targets",
+                 "attrs", "meta", "dangling")
+
+    def __init__(self, ids, kinds, validator, labels, src, dst, attrs=None, meta=None, dangling=()):
+        self.ids = ids
+        self.index = {nid: i for i, nid in enumerate(ids)}
+        self.kinds = kinds
+        self.validator = validator
+        self.labels = labels
+        self.offsets, self.targets = csr(len(ids), src, dst)
+        self.attrs = attrs or {}
+        self.meta = meta or {}
+        self.dangling = list(dangling)
+
+    @classmethod
+    def from_lists(cls, nodes, edges):
+        """From load_graph-style node dicts and (a, b) edges."""
+        ids = [n["id"] for n in nodes]
+        index = {nid: i for i, nid in enumerate(ids)}
+        src, dst, dangling = array("I"), array("I"), []
+        for a, b in edges:
+            ia, ib = index.get(a), index.get(b)
+            if ia is None or ib is None:
+                dangling.append((a, b))
+                continue
+            src.append(ia); dst.append(ib)
+        return cls(ids, bytearray(kind_code(n["kind"]) for n in nodes),
+                   bytearray(bool(n.get("validator")) for n in nodes),
+                   [n.get("label") or n["id"] for n in nodes], src, dst, dangling=dangling)
+
+    # ---------- Queries ----------
+    @property
+    def n(self):
+        return len(self.ids)
+
+    @property
+    def m(self):
+        return len(self.targets)
+
+    def successors(self, v):
+        return self.targets[self.offsets[v]:self.offsets[v + 1]]
+
+    def out_degree(self, v):
+        return self.offsets[v + 1] - self.offsets[v]
+
+    def edge_pairs(self):
+        """(a, b) node numbers in CSR order."""
+        offs, tg = self.offsets, self.targets
+        for a in range(self.n):
+            for i in range(offs[a], offs[a + 1]):
+                yield a, tg[i]
+
+    def edges(self):
+        """(a, b) id tuples, e.g. for render_graph."""
+        ids = self.ids
+        return [(ids[a], ids[b]) for a, b in self.edge_pairs()]
+
+    def adjacency(self, reverse=False, extra_src=(), extra_dst=(), size=None):
+        """(offsets, targets) of the graph or its transpose, plus optional extra edges;
+        `size` > n adds rows for virtual nodes (e.g. an exit) numbered from n."""
+        src, dst = array("I"), array("I")
+        for a, b in self.edge_pairs():
+            src.append(b if reverse else a); dst.append(a if reverse else b)
+        src.extend(extra_src); dst.extend(extra_dst)
+        return csr(size or self.n, src, dst)
+
+    def entropy_counts(self):
+        """(G, D, gg) as used by the entropy formula; aux nodes count in neither."""
+        kinds = self.kinds
+        G, D = kinds.count(GEN), kinds.count(DET)
+        offs, tg = self.offsets, self.targets
+        gg = 0
+        for a in range(self.n):
+            if kinds[a] == GEN:
+                gg += sum(1 for i in range(offs[a], offs[a + 1]) if kinds[tg[i]] == GEN)
+        return G, D, gg
+
+    def to_nodes(self):
+        """Node dicts in the shape agentbound.load_graph returns."""
+        return [{"id": nid, "label": self.labels[i], "kind": KIND_NAMES[self.kinds[i]],
+                 "validator": bool(self.validator[i])} for i, nid in enumerate(self.ids)]
+
+    def to_networkx(self):
+        import networkx as nx
+        G = nx.DiGraph()
+        for n in self.to_nodes():
+            G.add_node(n["id"], **n)
+        G.add_edges_from(self.edges())
+        return G
+
+    def nbytes(self):
+        """Bytes held by the array parts (ids/labels strings not included)."""
+        return (len(self.kinds) + len(self.validator) + self.offsets.itemsize * len(self.offsets)
+                + self.targets.itemsize * len(self.targets))
+
+# ---------- Reading ----------
+def read_ir(path, kind_fn, validator_fn=None, attrs=None):
+    """Stream a graph file straight into a GraphIR.
+
+    kind_fn(raw_node) -> kind name; validator_fn(raw_node, kind) -> bool;
+    attrs maps an attribute name to fn(raw_node), kept as per-node lists in ir.attrs.
+    """
+    kinds, validator, labels = bytearray(), bytearray(), []
+    attr_vals = {name: [] for name in attrs or {}}
+
+    def make_node(raw):
+        kind = kind_fn(raw)
+        kinds.append(kind_code(kind))
+        validator.append(bool(validator_fn(raw, kind)) if validator_fn else 0)
+        labels.append(raw.get("label") or raw["id"])
+        for name, fn in (attrs or {}).items():
+            attr_vals[name].append(fn(raw))
+        return raw["id"]
+
+    node_ids, edges, meta = load_graph_stream(path, make_node)
+    # The loader interns ids in order of first sight (edges may mention a node
+    # before it is declared): renumber to node order and set dangling edges aside.
+    number = {nid: i for i, nid in enumerate(node_ids)}
+    remap = [number.get(nid, -1) for nid in edges.ids]
+    dangling = []
+    if remap == list(range(len(remap))):  # nodes declared before any edge mentions them
+        src, dst = edges.src, edges.dst
+    elif min(remap, default=0) >= 0:
+        src, dst = array("I", map(remap.__getitem__, edges.src)), array("I", map(remap.__getitem__, edges.dst))
+    else:
+        src, dst = array("I"), array("I")
+        for a, b in zip(edges.src, edges.dst):
+            ra, rb = remap[a], remap[b]
+            if ra < 0 or rb < 0:
+                dangling.append((edges.ids[a], edges.ids[b]))
+                continue
+            src.append(ra); dst.append(rb)
+    return GraphIR(node_ids, kinds, validator, labels, src, dst, attr_vals, meta, dangling)
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Node-kind classification shared by agentbound.py, agentbound_compare.py and
+validation/compute_metrics.py, so every tool scores a graph the same way.
+
+Precedence for one node: kind_map entry > the node's declared "kind" > inference.
+Inference: ids starting with "__" are aux; otherwise a node is generative when
+its id or label contains one of the hint words (as a whole word or between
+underscores, case-insensitive), deterministic otherwise.
+
+The vocabulary is compiled once into a single regex. Extra words come from
+`KindClassifier(extra_hints=...)` or, for the shared default classifier, the
+AGENTBOUND_GEN_HINTS environment variable (comma-separated), which also reaches
+batch worker processes. Inferred kinds are memoized per (id, label).
+"""
+
+import os
+import re
+
+KINDS = ("generative", "deterministic", "aux")
+DEFAULT_GEN_HINTS = ("llm", "gpt", "model", "generate", "generator", "writer",
+                     "assistant", "agent", "supervisor")
+MEMO_MAX = 1 << 20
+
+class KindClassifier:
+    def __init__(self, gen_hints=DEFAULT_GEN_HINTS, extra_hints=()):
+        words = list(dict.fromkeys(w.strip().lower() for w in (*gen_hints, *extra_hints) if w.strip()))
+        self.hints = tuple(words)
+        alt = "|".join(re.escape(w) for w in words) or r"(?!)"
+        self.pattern = re.compile(rf"(?:\b|_)({alt})(?:\b|_)", re.I)
+        self._memo = {}
+
+    @property
+    def signature(self):
+        """Stable description of the rules, for cache keys."""
+        return self.pattern.pattern
+
+    def infer(self, node_id, label=None):
+        key = (node_id, label)
+        kind = self._memo.get(key)
+        if kind is None:
+            if node_id.startswith("__"):
+                kind = "aux"
+            else:
+                kind = "generative" if self.pattern.search(f"{node_id} {label or ''}") else "deterministic"
+            if len(self._memo) >= MEMO_MAX:
+                self._memo.clear()
+            self._memo[key] = kind
+        return kind
+
+    def classify(self, node_id, label=None, declared=None, kind_map=None):
+        if kind_map and kind_map.get(node_id):
+            return kind_map[node_id]
+        if declared and declared.lower() in KINDS:
+            return declared.lower()
+        return self.infer(node_id, label)
+
+_default = None
+
+def default_classifier():
+    global _default
+    if _default is None:
+        extra = os.environ.get("AGENTBOUND_GEN_HINTS", "")
+        _default = KindClassifier(extra_hints=extra.split(","))
+    return _default
+
+def infer_kind(node_id, label=None):
+    return default_classifier().infer(node_id, label)
+
+def classify(node_id, label=None, declared=None, kind_map=None):
+    return default_classifier().classify(node_id, label, declared, kind_map)
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+In-process scoring of LangGraph graphs, without the JSON export round trip.
+
+    from agentbound_langgraph import score_graph
+    met = score_graph(app)                     # app = StateGraph(...).compile()
+    assert met["validator_coverage_pct"] == 100.0
+
+Accepted inputs (duck-typed, LangGraph itself is never imported):
+
+  * a compiled graph, i.e. anything with `get_graph()`
+  * the drawable graph `get_graph()` returns: `.nodes` maps id -> node with
+    `.name` / `.metadata`, `.edges` holds edges with `.source` / `.target`
+
+Conditional edges contribute every possible target, as in `get_graph()`.
+Kinds follow agentbound.load_graph: kind_map > `metadata["kind"]` > inference
+from id and name (`__start__` / `__end__` are aux). A node is a validator when
+its metadata says so (`validator: true` or `role: "validator"`) or its name
+looks like one.
+"""
+
+from agentbound import graph_metrics, is_validator
+from agentbound_ir import GraphIR
+from agentbound_kinds import classify
+
+def drawable(graph):
+    """The node/edge structure of a compiled graph, or `graph` itself if it already is one."""
+    get_graph = getattr(graph, "get_graph", None)
+    if callable(get_graph):
+        graph = get_graph()
+    if not hasattr(graph, "nodes") or not hasattr(graph, "edges"):
+        raise TypeError(f"expected a compiled LangGraph graph or its get_graph() result, got {type(graph).__name__}")
+    return graph
+
+def nodes_edges(graph, kind_map=None):
+    """(nodes, edges) in the shape agentbound.load_graph returns."""
+    g = drawable(graph)
+    kind_map = kind_map or {}
+    nodes = []
+    for nid, node in g.nodes.items():
+        name = getattr(node, "name", None) or nid
+        raw = {**(getattr(node, "metadata", None) or {}), "id": nid, "label": name}
+        kind = classify(nid, name, raw.get("kind"), kind_map)
+        nodes.append({"id": nid, "label": name, "kind": kind, "validator": is_validator(raw, kind)})
+    edges = [(e.source, e.target) for e in g.edges]
+    return nodes, edges
+
+def graph_ir(graph, kind_map=None):
+    return GraphIR.from_lists(*nodes_edges(graph, kind_map))
+
+def score_graph(graph, kind_map=None):
+    """The metrics agentbound.score() reports for the same graph exported to JSON (no resilience fields)."""
+    return graph_metrics(graph_ir(graph, kind_map))
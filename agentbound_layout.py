@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Layered (Sugiyama-style) layout for directed agent graphs.
+
+Steps, each linear in V+E per pass:
+  1. cycle removal  - DFS from the entry points; back edges are ignored for layering
+  2. layering       - longest path from the sources, so every edge points downwards
+  3. ordering       - a few barycenter sweeps (down, then up) to reduce crossings
+  4. coordinates    - evenly spaced slots per layer, scaled into [-1, 1] like spring_layout
+
+Positions are cached by a hash of the graph (optionally on disk, and in memory
+for the MEMORY_CACHE_SIZE most recently used graphs, so a long-lived
+agentbound_server.py does not grow with every graph it draws). Re-renders and
+A/B comparisons of the same structure reuse them.
+"""
+
+import hashlib
+import json
+import os
+from collections import OrderedDict
+
+LAYOUT_VERSION = 1
+SWEEPS = 4
+MEMORY_CACHE_SIZE = 256
+_memory_cache = OrderedDict()  # LRU: graph key -> positions
+
+def graph_key(node_ids, edges, method="layered"):
+    payload = json.dumps([LAYOUT_VERSION, method, sorted(node_ids), sorted(map(list, edges))],
+                         separators=(",", ":"))
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+def _acyclic_edges(node_ids, succ, indeg):
+    """Drop DFS back edges; roots are sources first, then any node not yet seen."""
+    state = dict.fromkeys(node_ids, 0)  # 0 new, 1 on stack, 2 done
+    keep = []
+    roots = [n for n in node_ids if indeg[n] == 0] + list(node_ids)
+    for root in roots:
+        if state[root]:
+            continue
+        state[root] = 1
+        stack = [(root, iter(succ[root]))]
+        while stack:
+            v, it = stack[-1]
+            for w in it:
+                if state[w] == 1:
+                    continue          # back edge: would close a cycle
+                keep.append((v, w))
+                if state[w] == 0:
+                    state[w] = 1
+                    stack.append((w, iter(succ[w])))
+                    break
+            else:
+                state[v] = 2
+                stack.pop()
+    return keep
+
+def _layers(node_ids, dag_edges):
+    """Longest-path layering via Kahn's algorithm on the acyclic edge set."""
+    out = {n: [] for n in node_ids}
+    indeg = dict.fromkeys(node_ids, 0)
+    for a, b in dag_edges:
+        out[a].append(b)
+        indeg[b] += 1
+    layer = dict.fromkeys(node_ids, 0)
+    queue = [n for n in node_ids if indeg[n] == 0]
+    head = 0
+    while head < len(queue):
+        v = queue[head]; head += 1
+        for w in out[v]:
+            layer[w] = max(layer[w], layer[v] + 1)
+            indeg[w] -= 1
+            if indeg[w] == 0:
+                queue.append(w)
+    return layer
+
+def _order(node_ids, edges, layer):
+    """Barycenter crossing reduction; returns {node: rank within its layer}."""
+    by_layer = {}
+    for n in node_ids:
+        by_layer.setdefault(layer[n], []).append(n)
+    levels = [by_layer[k] for k in sorted(by_layer)]
+    up = {n: [] for n in node_ids}      # neighbours in earlier layers
+    down = {n: [] for n in node_ids}    # neighbours in later layers
+    for a, b in edges:
+        if a == b:
+            continue
+        if layer[a] < layer[b]:
+            up[b].append(a); down[a].append(b)
+        elif layer[b] < layer[a]:
+            up[a].append(b); down[b].append(a)
+
+    rank = {}
+    for level in levels:
+        for i, n in enumerate(level):
+            rank[n] = i / max(1, len(level) - 1)
+
+    def sweep(seq, nbrs):
+        for level in seq:
+            def bary(n):
+                ns = nbrs[n]
+                return sum(rank[m] for m in ns) / len(ns) if ns else rank[n]
+            level.sort(key=bary)
+            for i, n in enumerate(level):
+                rank[n] = i / max(1, len(level) - 1)
+
+    for _ in range(SWEEPS):
+        sweep(levels[1:], up)
+        sweep(levels[-2::-1], down)
+    return levels
+
+def layered_layout(node_ids, edges):
+    """{node: (x, y)} with sources at the top and layers spread horizontally."""
+    node_ids = list(dict.fromkeys(node_ids))
+    succ = {n: [] for n in node_ids}
+    indeg = dict.fromkeys(node_ids, 0)
+    for a, b in edges:
+        if a in succ and b in succ:
+            succ[a].append(b)
+            indeg[b] += 1
+    edges = [(a, b) for a, b in edges if a in succ and b in succ]
+    layer = _layers(node_ids, _acyclic_edges(node_ids, succ, indeg))
+    levels = _order(node_ids, edges, layer)
+
+    depth = max(1, len(levels) - 1)
+    widest = max((len(level) for level in levels), default=1)
+    pos = {}
+    for li, level in enumerate(levels):
+        y = 1.0 - 2.0 * li / depth if len(levels) > 1 else 0.0
+        for i, n in enumerate(level):
+            # Centre each layer; scale by the widest layer so spacing is uniform.
+            x = (i - (len(level) - 1) / 2) / max(1, (widest - 1) / 2)
+            pos[n] = (x, y)
+    return pos
+
+def _remember(key, pos):
+    _memory_cache[key] = pos
+    while len(_memory_cache) > MEMORY_CACHE_SIZE:
+        _memory_cache.popitem(last=False)
+
+def compute_layout(node_ids, edges, method="layered", cache_dir=None):
+    """Positions for a graph, reused from the memory/disk cache when the structure is unchanged."""
+    node_ids = list(node_ids)
+    edges = [tuple(e) for e in edges]
+    key = graph_key(node_ids, edges, method)
+    if key in _memory_cache:
+        _memory_cache.move_to_end(key)
+        return _memory_cache[key]
+    path = os.path.join(cache_dir, f"{key}.json") if cache_dir else None
+    if path and os.path.exists(path):
+        pos = {n: tuple(xy) for n, xy in json.load(open(path)).items()}
+        _remember(key, pos)
+        return pos
+
+    if method == "spring":
+        import networkx as nx
+        G = nx.DiGraph()
+        G.add_nodes_from(node_ids)
+        G.add_edges_from(edges)
+        pos = {n: tuple(float(c) for c in xy) for n, xy in nx.spring_layout(G, seed=42).items()}
+    else:
+        pos = layered_layout(node_ids, edges)
+
+    _remember(key, pos)
+    if path:
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(pos, f)
+        os.replace(tmp, path)
+    return pos
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Streaming reader for graph JSON files.
+
+`json.load` builds the whole document (every node dict, every 2-element edge
+list) before anything can be scored, which costs many times the file size for
+generated graphs of hundreds of MB. This reader walks the top-level object
+with `JSONDecoder.raw_decode` over a bounded text buffer and hands out the
+elements of "nodes" and "edges" one at a time.
+
+Both edge formats are accepted:
+
+  {"nodes": [{"id": ...}, ...], "edges": [[a, b], ...]}       (agentbound.py)
+  {"nodes": [{"id": ..., "edges": [b, ...]}, ...]}             (validation graphs)
+
+`load_graph_stream` interns node ids and keeps edges as two uint32 arrays
+(8 bytes per edge); `EdgeList` iterates them back as (a, b) id tuples, which is
+all the scoring functions need.
+"""
+
+import hashlib
+import json
+import re
+import sys
+from array import array
+
+CHUNK = 1 << 20
+STREAM_KEYS = ("nodes", "edges")
+ITEM, VALUE, END = "item", "value", "end"
+
+_WS = re.compile(r"[ \t\n\r]*")
+_SEP = re.compile(r"[ \t\n\r]*([,\]])[ \t\n\r]*")
+_decoder = json.JSONDecoder()
+
+class _Reader:
+    def __init__(self, f, name, chunk=CHUNK):
+        self.f, self.name, self.chunk = f, name, chunk
+        self.buf, self.pos, self.eof = "", 0, False
+
+    def _fill(self, need=0):
+        data = self.f.read(max(self.chunk, need))
+        if not data:
+            self.eof = True
+            return False
+        if self.pos:
+            self.buf = self.buf[self.pos:]
+            self.pos = 0
+        self.buf += data
+        return True
+
+    def peek(self):
+        while True:
+            self.pos = _WS.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf) or not self._fill():
+                return self.buf[self.pos:self.pos + 1]
+
+    def expect(self, ch):
+        got = self.peek()
+        if got != ch:
+            raise ValueError(f"{self.name}: expected {ch!r}, found {got or 'end of file'!r}")
+        self.pos += 1
+
+    def value(self):
+        if self.pos >= len(self.buf) or self.buf[self.pos] in " \t\n\r":
+            self.peek()
+        while True:
+            try:
+                v, end = _decoder.raw_decode(self.buf, self.pos)
+                # A value ending exactly at the buffer edge may be cut short (e.g. a number).
+                if end < len(self.buf) or self.eof:
+                    self.pos = end
+                    return v
+            except json.JSONDecodeError as e:
+                if self.eof:
+                    raise ValueError(f"{self.name}: {e}") from None
+            # Read at least as much again as is pending, so a large value is not re-parsed per chunk.
+            self._fill(len(self.buf) - self.pos)
+
+def iter_top_level(path, stream_keys=STREAM_KEYS, chunk=CHUNK):
+    """Yield (key, ITEM, element) for arrays under `stream_keys` (then (key, END, count)),
+    and (key, VALUE, value) for every other top-level key."""
+    with open(path, encoding="utf-8") as f:
+        r = _Reader(f, str(path), chunk)
+        r.expect("{")
+        if r.peek() == "}":
+            return
+        while True:
+            key = r.value()
+            r.expect(":")
+            if key in stream_keys and r.peek() == "[":
+                r.pos += 1
+                count = 0
+                if r.peek() == "]":
+                    r.pos += 1
+                else:
+                    while True:
+                        yield key, ITEM, r.value()
+                        count += 1
+                        m = _SEP.match(r.buf, r.pos)
+                        if m and m.end() < len(r.buf):  # fast path: separator and next value in the buffer
+                            sep = m.group(1); r.pos = m.end()
+                        else:
+                            sep = r.peek(); r.pos += 1
+                        if sep == "]":
+                            break
+                        if sep != ",":
+                            raise ValueError(f"{path}: expected ',' or ']' in {key!r}")
+                yield key, END, count
+            else:
+                yield key, VALUE, r.value()
+            sep = r.peek(); r.pos += 1
+            if sep == "}":
+                return
+            if sep != ",":
+                raise ValueError(f"{path}: expected ',' or '}}' after {key!r}")
+
+# ---------- Graphs ----------
+class EdgeList:
+    """Read-only sequence of (a, b) id tuples backed by interned ids and two uint32 arrays."""
+    __slots__ = ("ids", "src", "dst")
+
+    def __init__(self, ids, src, dst):
+        self.ids, self.src, self.dst = ids, src, dst
+
+    def __len__(self):
+        return len(self.src)
+
+    def __iter__(self):
+        ids = self.ids
+        for a, b in zip(self.src, self.dst):
+            yield (ids[a], ids[b])
+
+    def __getitem__(self, i):
+        return (self.ids[self.src[i]], self.ids[self.dst[i]])
+
+def load_graph_stream(path, make_node=None, chunk=CHUNK):
+    """(nodes, EdgeList, meta) without materializing the document.
+
+    `make_node(raw)` turns each raw node dict (its "edges" already taken out)
+    into the record to keep; None drops the node. meta holds the other
+    top-level keys, e.g. start_node.
+    """
+    ids, index = [], {}
+
+    def intern(x):
+        i = index.get(x)
+        if i is None:
+            i = index[x] = len(ids)
+            ids.append(sys.intern(x))
+        return i
+
+    nodes, src, dst, meta = [], array("I"), array("I"), {}
+    seen_nodes = False
+    for key, ev, val in iter_top_level(path, chunk=chunk):
+        seen_nodes = seen_nodes or (key == "nodes" and ev != VALUE)
+        if key == "nodes" and ev == ITEM:
+            targets = val.pop("edges", None) or ()
+            i = intern(val["id"])
+            val["id"] = ids[i]
+            for t in targets:
+                src.append(i); dst.append(intern(t))
+            rec = make_node(val) if make_node else val
+            if rec is not None:
+                nodes.append(rec)
+        elif key == "edges" and ev == ITEM:
+            a, b = index.get(val[0]), index.get(val[1])
+            src.append(intern(val[0]) if a is None else a)
+            dst.append(intern(val[1]) if b is None else b)
+        elif ev == VALUE:
+            meta[key] = val
+    if not seen_nodes:
+        raise ValueError(f"{path}: no top-level \"nodes\" array")
+    return nodes, EdgeList(ids, src, dst), meta
+
+def stream_digest(path, chunk=CHUNK):
+    """Content hash independent of whitespace and key order, computed while streaming."""
+    hashers = {}
+    for key, ev, val in iter_top_level(path, chunk=chunk):
+        h = hashers.setdefault(key, hashlib.sha256())
+        if ev == END:
+            h.update(b"]")
+        else:
+            h.update((json.dumps(val, sort_keys=True, separators=(",", ":")) + ",").encode())
+    combined = json.dumps({k: h.hexdigest() for k, h in hashers.items()}, sort_keys=True)
+    return hashlib.sha256(combined.encode()).hexdigest()
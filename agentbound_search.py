@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Design-space search: where do validators lower entropy the most?
+
+Starting from one graph, the search inserts up to `--budget` deterministic
+validator nodes using two rewrites:
+
+  edge   a→b (both generative)       becomes  a→V→b
+  guard  every a→b with b generative becomes  a→V→b for one shared V
+
+Candidates are scored with IncrementalScorer (apply, read entropy, undo), so
+one evaluation is O(degree). `--beam 1` is greedy; wider beams keep the best
+W partial designs per step. The result is the Pareto front of entropy
+reduction vs. added nodes; structural metrics and validator coverage are only
+computed for the designs on the front.
+"""
+
+import argparse
+import json
+import os
+import sys
+
+from agentbound import load_graph
+from agentbound_whatif import DET, GEN, IncrementalScorer
+
+# ---------- Rewrites ----------
+def candidate_moves(sc, kinds=("edge", "guard")):
+    """Rewrites applicable to the current graph, in a deterministic order."""
+    moves = []
+    for a in sc.nodes:
+        if sc.nodes[a]["kind"] != GEN:
+            continue
+        gen_succ = [b for b in sc.succ[a] if sc.nodes[b]["kind"] == GEN]
+        if "edge" in kinds:
+            moves.extend(("edge", a, b) for b in gen_succ)
+        if "guard" in kinds and len(gen_succ) > 1:
+            moves.append(("guard", a))
+    return moves
+
+def apply_move(sc, move, vid):
+    """Insert validator `vid` as described by `move`; undo with sc.rollback()."""
+    sc.add_node(vid, DET, label=f"Validator {vid.rsplit('_', 1)[-1]}", validator=True)
+    targets = [move[2]] if move[0] == "edge" else \
+        [b for b in list(sc.succ[move[1]]) if sc.nodes[b]["kind"] == GEN and b != vid]
+    a = move[1]
+    for b in targets:
+        for _ in range(sc.succ[a][b]):
+            sc.remove_edge(a, b)
+        sc.add_edge(vid, b)
+    sc.add_edge(a, vid)
+
+def _new_id(sc, n):
+    vid = f"validator_{n}"
+    while vid in sc.nodes:
+        vid += "_"
+    return vid
+
+def _replay(sc, base_mark, moves):
+    sc.rollback(base_mark)
+    for i, m in enumerate(moves):
+        apply_move(sc, m, _new_id(sc, i + 1))
+
+def _score(sc):
+    e = sc.entropy()
+    return (e["entropy_score"], e["gen_to_gen_edges"])
+
+# ---------- Parallel evaluation ----------
+_worker_sc = None
+
+def _init_worker(nodes, edges):
+    global _worker_sc
+    _worker_sc = IncrementalScorer(nodes, edges)
+
+def _evaluate(task):
+    return evaluate(_worker_sc, task)
+
+def evaluate(sc, task):
+    """Score every candidate move on top of one partial design."""
+    moves, candidates = task
+    _replay(sc, 0, moves)
+    out = []
+    for m in candidates:
+        mark = sc.checkpoint()
+        apply_move(sc, m, _new_id(sc, len(moves) + 1))
+        out.append((_score(sc), m))
+        sc.rollback(mark)
+    return out
+
+# ---------- Search ----------
+def search(nodes, edges, budget=3, beam=4, kinds=("edge", "guard"), workers=1):
+    """Beam search over validator insertions; returns the Pareto front (fewest nodes first)."""
+    sc = IncrementalScorer(nodes, edges)
+    best = {0: (_score(sc), ())}
+    frontier = [()]
+    pool = None
+    if workers > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(nodes, edges))
+    try:
+        for step in range(1, budget + 1):
+            tasks = []
+            for moves in frontier:
+                _replay(sc, 0, moves)
+                cands = candidate_moves(sc, kinds)
+                if pool:  # split each partial design's candidates across the workers
+                    size = max(1, -(-len(cands) // workers))
+                    tasks += [(moves, cands[i:i + size]) for i in range(0, len(cands), size)]
+                else:
+                    tasks.append((moves, cands))
+            if pool:
+                results = pool.map(_evaluate, tasks)
+            else:
+                results = [evaluate(sc, t) for t in tasks]
+            scored, seen = [], set()
+            for (moves, _), res in zip(tasks, results):
+                for key, m in res:
+                    design = moves + (m,)
+                    sig = frozenset(design)
+                    if sig not in seen:
+                        seen.add(sig)
+                        scored.append((key, design))
+            if not scored:
+                break
+            scored.sort(key=lambda x: x[0])
+            frontier = [d for _, d in scored[:beam]]
+            best[step] = scored[0]
+    finally:
+        if pool:
+            pool.shutdown()
+
+    front, last = [], None
+    for n in sorted(best):
+        (score, gg), moves = best[n]
+        if last is None or score < last:
+            _replay(sc, 0, moves)
+            met = sc.metrics()
+            front.append({"added_nodes": n, "entropy_score": score,
+                          "entropy_reduction": round(best[0][0][0] - score, 3),
+                          "gen_to_gen_edges": gg, "moves": [list(m) for m in moves],
+                          "longest_gen_chain": met["longest_gen_chain"],
+                          "validator_coverage_pct": met["validator_coverage_pct"],
+                          "graph": sc.to_graph()})
+            last = score
+    return front
+
+def write_design(entry, graph_json, kind_map, out_dir):
+    """Graph JSON + kind map for one front entry, loadable by agentbound.py and run_harness.py.
+
+    The source document is copied through (node attributes such as `__harness`,
+    top-level keys such as `start_node`, and its edge format); only the edges
+    change and the inserted validators are appended.
+    """
+    nodes, edges = entry["graph"]
+    stem = os.path.splitext(os.path.basename(graph_json))[0]
+    base = os.path.join(out_dir, f"{stem}_k{entry['added_nodes']}")
+    with open(graph_json) as f:
+        src = json.load(f)
+    known = {n["id"] for n in src["nodes"]}
+    out_nodes = [dict(n) for n in src["nodes"]]
+    out_nodes += [{"id": n["id"], "label": n["label"], "kind": n["kind"], "validator": True}
+                  for n in nodes if n["id"] not in known]
+    graph = {k: v for k, v in src.items() if k not in ("nodes", "edges")}
+    if src.get("edges"):  # top-level edge list
+        for n in out_nodes:
+            n.pop("edges", None)
+        graph.update(nodes=out_nodes, edges=[list(e) for e in edges])
+    else:
+        succ = {n["id"]: [] for n in out_nodes}
+        for a, b in edges:
+            succ[a].append(b)
+        for n in out_nodes:
+            n["edges"] = succ[n["id"]]
+        graph["nodes"] = out_nodes
+    kinds = {**kind_map, **{n["id"]: n["kind"] for n in nodes if n["id"] not in kind_map or n["validator"]}}
+    with open(base + ".json", "w") as f:
+        json.dump(graph, f, indent=2)
+    with open(base + "_kind_map.json", "w") as f:
+        json.dump(kinds, f, indent=2)
+    return base + ".json"
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Search validator insertions that lower AgentBound entropy")
+    ap.add_argument("graph_json")
+    ap.add_argument("--kind-map", help="JSON mapping node_id->kind")
+    ap.add_argument("--budget", type=int, default=3, help="Maximum validator nodes to add")
+    ap.add_argument("--beam", type=int, default=4, help="Partial designs kept per step (1 = greedy)")
+    ap.add_argument("--moves", default="edge,guard", help="Comma-separated rewrites: edge, guard")
+    ap.add_argument("--workers", type=int, default=1, help="Worker processes for candidate scoring (0 = all cores)")
+    ap.add_argument("--out-dir", help="Write each Pareto design as <graph>_k<N>.json + _kind_map.json")
+    args = ap.parse_args()
+
+    kinds = tuple(k.strip() for k in args.moves.split(",") if k.strip())
+    if not kinds or set(kinds) - {"edge", "guard"}:
+        ap.error(f"--moves must list edge and/or guard, got {args.moves!r}")
+    kind_map = json.load(open(args.kind_map)) if args.kind_map else {}
+    nodes, edges = load_graph(args.graph_json, kind_map, warn=False)
+    front = search(nodes, edges, budget=args.budget, beam=max(1, args.beam), kinds=kinds,
+                   workers=args.workers or os.cpu_count() or 1)
+    if args.out_dir:
+        os.makedirs(args.out_dir, exist_ok=True)
+        for entry in front:
+            entry["graph_json"] = write_design(entry, args.graph_json, kind_map, args.out_dir)
+    for entry in front:
+        del entry["graph"]
+    json.dump({"graph_json": args.graph_json, "pareto_front": front}, sys.stdout, indent=2)
+    print()
@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Long-lived scoring server: keeps the library, networkx and matplotlib
+imported, so CI jobs pay one HTTP round trip instead of an
+interpreter start per graph.
+
+    python agentbound_server.py --port 8765 --workers 4
+    curl -s --data-binary @graph.json localhost:8765/score
+    curl -s -d '{"graph": {...}, "kind_map": {...}, "drivers": true, "render": true}' localhost:8765/score
+
+POST /score takes either a bare graph document or {"graph", "kind_map",
+"drivers", "render", "layout"}. The response holds "metrics" (as
+agentbound.score(), without resilience fields), "drivers" (risk hubs,
+anchors, gen→gen edges as in agentbound_compare.py) and "png" (base64) when
+asked for, plus "cached" and the content "key". GET /health reports cache
+statistics.
+
+Results are cached in a bounded LRU keyed by a canonical hash of graph, kind
+map, options and the kind rules. A byte-identical request is answered from
+the hash of its raw body without parsing the JSON; those raw-body aliases live
+in a separate LRU, so they do not take result slots. Requests are handled on
+threads; scoring and rendering run on `--workers` processes (1 = in the server
+process, with rendering serialized because pyplot is not thread-safe).
+"""
+
+import argparse
+import base64
+import hashlib
+import json
+import os
+import socket
+import sys
+import tempfile
+import threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from agentbound import graph_metrics, ir_from_doc, render_graph
+from agentbound_kinds import default_classifier
+
+CACHE_SIZE = 1024
+CACHE_MB = 256
+MAX_BODY = 256 << 20
+
+# ---------- Cache ----------
+class LRUCache:
+    """Thread-safe mapping bounded by entries and by len() of the values (bytes or str);
+    the least recently used entry is evicted first."""
+
+    def __init__(self, max_entries=CACHE_SIZE, max_bytes=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            val = self._data.get(key)
+            if val is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return val
+
+    def put(self, key, val):
+        if self.max_bytes is not None and len(val) > self.max_bytes:
+            return  # would evict everything else and still not fit
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self.bytes -= len(old)
+            self._data[key] = val
+            self.bytes += len(val)
+            while len(self._data) > self.max_entries or (self.max_bytes is not None and self.bytes > self.max_bytes):
+                self.bytes -= len(self._data.popitem(last=False)[1])
+                self.evictions += 1
+
+    def stats(self):
+        with self._lock:
+            return {"entries": len(self._data), "max_entries": self.max_entries, "bytes": self.bytes,
+                    "max_bytes": self.max_bytes, "hits": self.hits, "misses": self.misses,
+                    "evictions": self.evictions}
+
+# ---------- Scoring ----------
+_render_lock = threading.Lock()
+
+def parse_request(body):
+    """(graph, kind_map, options) from a request body."""
+    req = json.loads(body)
+    if not isinstance(req, dict):
+        raise ValueError("request body must be a JSON object")
+    if "graph" not in req:
+        req = {"graph": req}
+    graph = req["graph"]
+    if not isinstance(graph, dict) or not isinstance(graph.get("nodes"), list):
+        raise ValueError('graph must be an object with a "nodes" array')
+    opts = {"drivers": bool(req.get("drivers")), "render": bool(req.get("render")),
+            "layout": req.get("layout") or "layered"}
+    if opts["layout"] not in ("layered", "spring"):
+        raise ValueError(f"unknown layout {opts['layout']!r}")
+    return graph, req.get("kind_map") or {}, opts
+
+def content_key(graph, kind_map, opts):
+    doc = {"graph": graph, "kind_map": kind_map, "opts": opts, "gen_hints": default_classifier().signature}
+    return hashlib.sha256(json.dumps(doc, sort_keys=True, separators=(",", ":")).encode()).hexdigest()
+
+def score_request(graph, kind_map, opts, layout_cache=None):
+    """The response body for one request (runs in a worker process, or in the server with workers=1)."""
+    ir = ir_from_doc(graph, kind_map)
+    out = {"metrics": graph_metrics(ir)}
+    if opts["drivers"]:
+        from agentbound_compare import find_drivers
+        drv = find_drivers(ir)
+        drv["gg_edges"] = [list(e) for e in drv["gg_edges"]]
+        out["drivers"] = drv
+    if opts["render"]:
+        with tempfile.TemporaryDirectory() as tmp:
+            png = os.path.join(tmp, "graph.png")
+            with _render_lock:
+                render_graph(ir.to_nodes(), ir.edges(), out["metrics"], png, opts["layout"], cache_dir=layout_cache)
+            with open(png, "rb") as f:
+                out["png"] = base64.b64encode(f.read()).decode("ascii")
+    return out
+
+def _warm_worker():
+    # Pay the plotting imports once at startup, not on the first render request.
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot, networkx  # noqa: F401
+
+# ---------- Server ----------
+class ScoringServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, addr, workers=1, cache_size=CACHE_SIZE, cache_mb=CACHE_MB, layout_cache=None, quiet=False):
+        super().__init__(addr, Handler)
+        # Rendered responses carry a base64 PNG of up to several MB, so entries alone do not bound memory.
+        self.cache = LRUCache(cache_size, int(cache_mb * (1 << 20)))
+        self.aliases = LRUCache(cache_size)  # raw body hash -> content key
+        self.layout_cache = layout_cache
+        self.quiet = quiet
+        self.pool = None
+        if workers > 1:
+            from concurrent.futures import ProcessPoolExecutor
+            self.pool = ProcessPoolExecutor(max_workers=workers, initializer=_warm_worker)
+        else:
+            _warm_worker()
+
+    def score(self, body):
+        """(encoded response without "cached", cached?) for a raw request body."""
+        raw_key = hashlib.sha256(body).hexdigest()
+        key = self.aliases.get(raw_key)
+        if key is not None:
+            hit = self.cache.get(key)
+            if hit is not None:
+                return hit, True
+        graph, kind_map, opts = parse_request(body)
+        key = content_key(graph, kind_map, opts)
+        data = self.cache.get(key)
+        cached = data is not None
+        if not cached:
+            if self.pool:
+                out = self.pool.submit(score_request, graph, kind_map, opts, self.layout_cache).result()
+            else:
+                out = score_request(graph, kind_map, opts, self.layout_cache)
+            # Cached already serialized, so a hit costs no JSON encoding
+            data = json.dumps({**out, "key": key}).encode()
+            self.cache.put(key, data)
+        self.aliases.put(raw_key, key)
+        return data, cached
+
+    def server_close(self):
+        super().server_close()
+        if self.pool:
+            self.pool.shutdown()
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        # Headers and body go out as two writes; without this, Nagle + delayed ACK add ~40 ms per small response.
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def _send(self, status, payload):
+        self._send_bytes(status, json.dumps(payload).encode())
+
+    def _send_bytes(self, status, data):
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._send(200, {"status": "ok", "cache": self.server.cache.stats(),
+                             "aliases": self.server.aliases.stats()})
+        else:
+            self._send(404, {"error": f"unknown path {self.path}"})
+
+    def do_POST(self):
+        if self.path != "/score":
+            self._send(404, {"error": f"unknown path {self.path}"})
+            return
+        length = int(self.headers.get("Content-Length") or 0)
+        if length <= 0 or length > MAX_BODY:
+            self._send(413 if length > MAX_BODY else 400, {"error": "missing or oversized request body"})
+            return
+        body = self.rfile.read(length)
+        try:
+            data, cached = self.server.score(body)
+        except (ValueError, KeyError, TypeError) as e:
+            self._send(400, {"error": f"{type(e).__name__}: {e}"})
+        except Exception as e:
+            self._send(500, {"error": f"{type(e).__name__}: {e}"})
+        else:
+            self._send_bytes(200, data[:-1] + (b', "cached": true}' if cached else b', "cached": false}'))
+
+    def log_message(self, fmt, *args):
+        if not self.server.quiet:
+            super().log_message(fmt, *args)
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Serve AgentBound scoring over localhost HTTP")
+    ap.add_argument("--host", default="127.0.0.1", help="Bind address (default: localhost only)")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--workers", type=int, default=1, help="Scoring/rendering processes (0 = all cores, 1 = in-process)")
+    ap.add_argument("--cache-size", type=int, default=CACHE_SIZE, help="Maximum cached results (LRU)")
+    ap.add_argument("--cache-mb", type=float, default=CACHE_MB, help="Maximum size of cached results in MB (LRU)")
+    ap.add_argument("--layout-cache", default=os.path.join("out", ".layout_cache"), help="Layout cache directory for renders")
+    ap.add_argument("--quiet", action="store_true", help="Do not log each request")
+    args = ap.parse_args()
+
+    server = ScoringServer((args.host, args.port), workers=args.workers or os.cpu_count() or 1,
+                           cache_size=args.cache_size, cache_mb=args.cache_mb, layout_cache=args.layout_cache,
+                           quiet=args.quiet)
+    print(f"AgentBound server on http://{args.host}:{args.port} (workers={args.workers or os.cpu_count()})",
+          file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+In-memory what-if scoring for single-edit design exploration.
+
+IncrementalScorer keeps the counts behind compute_entropy (G, D, gen→gen edges)
+and updates them per edit:
+
+  add_edge / remove_edge     O(1)
+  set_kind / set_validator   O(degree)
+  add_node / remove_node     O(1) / O(V) (the node's position is kept for undo)
+
+Every edit pushes its inverse onto an undo stack, so a search loop can try an
+edit, read `entropy()`, and `undo()` (or `rollback(mark)` to a `checkpoint()`).
+
+Structural metrics (loops, longest generative chain) and validator coverage are
+global properties that one edge can change arbitrarily, so they are not updated
+in place: `metrics()` recomputes them in O(V+E) on first request after an edit
+and caches them until the next one. Loops that only need `entropy()` never pay
+for them.
+"""
+
+from collections import Counter
+
+from agentbound import (entropy_from_counts, load_graph, structural_metrics,
+                        validator_coverage)
+from agentbound_kinds import KINDS
+
+GEN, DET, AUX = "generative", "deterministic", "aux"
+
+def _check_kind(kind):
+    """Reject kinds the classifier does not produce; a typo would otherwise count as neither G nor D."""
+    if kind not in KINDS:
+        raise ValueError(f"unknown node kind {kind!r} (expected one of {', '.join(KINDS)})")
+    return kind
+
+class IncrementalScorer:
+    def __init__(self, nodes, edges):
+        self.nodes = {n["id"]: dict(n) for n in nodes}
+        for n in self.nodes.values():
+            n.setdefault("label", n["id"])
+            n.setdefault("validator", False)
+        self.succ = {nid: Counter() for nid in self.nodes}
+        self.pred = {nid: Counter() for nid in self.nodes}
+        self.G = sum(1 for n in self.nodes.values() if n["kind"] == GEN)
+        self.D = sum(1 for n in self.nodes.values() if n["kind"] == DET)
+        self.gg = 0
+        self._undo = []
+        self._cache = {}
+        for a, b in edges:
+            if a in self.nodes and b in self.nodes:  # dangling edges are ignored, as in compute_entropy
+                self._link(a, b, 1)
+        self._undo.clear()
+
+    @classmethod
+    def from_file(cls, graph_json, kind_map=None):
+        return cls(*load_graph(graph_json, kind_map, warn=False))
+
+    # ---------- Queries ----------
+    def _gen(self, nid):
+        return self.nodes[nid]["kind"] == GEN
+
+    def entropy(self):
+        """compute_entropy() of the current graph, from the maintained counts."""
+        return entropy_from_counts(self.G, self.D, self.gg)
+
+    def to_graph(self):
+        """(nodes, edges) in the shape load_graph returns, e.g. for render_graph."""
+        edges = [(a, b) for a, c in self.succ.items() for b, k in c.items() for _ in range(k)]
+        # A validator tag only counts while the node is deterministic (it survives kind round-trips).
+        nodes = [{**n, "validator": n["validator"] and n["kind"] == DET} for n in self.nodes.values()]
+        return nodes, edges
+
+    def _lazy(self, key, fn):
+        if key not in self._cache:
+            self._cache[key] = fn(*self.to_graph())
+        return self._cache[key]
+
+    def metrics(self, structural=True):
+        """Same fields as agentbound.score() (without graph_json/resilience)."""
+        met = self.entropy()
+        if structural:
+            met.update(self._lazy("structural", structural_metrics))
+            met.update(self._lazy("coverage", validator_coverage))
+        return met
+
+    # ---------- Edits ----------
+    def _link(self, a, b, k):
+        """Add k (possibly negative) copies of edge a→b."""
+        self.succ[a][b] += k
+        self.pred[b][a] += k
+        if not self.succ[a][b]:
+            del self.succ[a][b]; del self.pred[b][a]
+        if self._gen(a) and self._gen(b):
+            self.gg += k
+        self._cache.clear()
+
+    def add_edge(self, a, b):
+        for nid in (a, b):
+            if nid not in self.nodes:
+                raise KeyError(f"unknown node {nid!r}")
+        self._link(a, b, 1)
+        self._undo.append((self._link, (a, b, -1)))
+
+    def remove_edge(self, a, b):
+        if not self.succ.get(a, {}).get(b):
+            raise KeyError(f"no edge {a!r} -> {b!r}")
+        self._link(a, b, -1)
+        self._undo.append((self._link, (a, b, 1)))
+
+    def _gen_degree(self, nid):
+        """Edges between nid and generative nodes, counting a self-edge once."""
+        out = sum(k for w, k in self.succ[nid].items() if w != nid and self._gen(w))
+        inc = sum(k for w, k in self.pred[nid].items() if w != nid and self._gen(w))
+        return out + inc + self.succ[nid].get(nid, 0)
+
+    def _count(self, kind, k):
+        if kind == GEN: self.G += k
+        elif kind == DET: self.D += k
+
+    def _set_kind(self, nid, kind):
+        node = self.nodes[nid]
+        old = node["kind"]
+        if old == kind:
+            return old
+        if old == GEN: self.gg -= self._gen_degree(nid)
+        self._count(old, -1)
+        node["kind"] = kind
+        self._count(kind, 1)
+        if kind == GEN: self.gg += self._gen_degree(nid)
+        self._cache.clear()
+        return old
+
+    def set_kind(self, nid, kind):
+        old = self._set_kind(nid, _check_kind(kind))
+        self._undo.append((self._set_kind, (nid, old)))
+
+    def _set_validator(self, nid, flag):
+        old = self.nodes[nid]["validator"]
+        self.nodes[nid]["validator"] = flag
+        self._cache.pop("coverage", None)
+        return old
+
+    def set_validator(self, nid, flag=True):
+        """Tag/untag a node as a validator (it only counts while the node is deterministic, as in load_graph)."""
+        old = self._set_validator(nid, flag)
+        self._undo.append((self._set_validator, (nid, old)))
+
+    def _insert_node(self, node, index=None):
+        nid = node["id"]
+        if index is None or index >= len(self.nodes):
+            self.nodes[nid] = node
+        else:  # restore the original position so tie-breaking in the metrics is unchanged
+            items = list(self.nodes.items())
+            items.insert(index, (nid, node))
+            self.nodes = dict(items)
+        self.succ[nid] = Counter(); self.pred[nid] = Counter()
+        self._count(node["kind"], 1)
+        self._cache.clear()
+
+    def _drop_node(self, nid):
+        node = self.nodes.pop(nid)
+        del self.succ[nid]; del self.pred[nid]
+        self._count(node["kind"], -1)
+        self._cache.clear()
+
+    def add_node(self, nid, kind, label=None, validator=False):
+        if nid in self.nodes:
+            raise KeyError(f"node {nid!r} already exists")
+        self._insert_node({"id": nid, "label": label or nid, "kind": _check_kind(kind),
+                           "validator": bool(validator)})
+        self._undo.append((self._drop_node, (nid,)))
+
+    def remove_node(self, nid):
+        """Remove a node and its edges; undo restores both."""
+        index = list(self.nodes).index(nid)
+        node = self.nodes[nid]
+        out = list(self.succ[nid].items())
+        inc = [(a, k) for a, k in self.pred[nid].items() if a != nid]
+        for b, k in out: self._link(nid, b, -k)
+        for a, k in inc: self._link(a, nid, -k)
+        self._drop_node(nid)
+
+        def restore():
+            self._insert_node(node, index)
+            for b, k in out: self._link(nid, b, k)
+            for a, k in inc: self._link(a, nid, k)
+        self._undo.append((restore, ()))
+
+    # ---------- Undo ----------
+    def undo(self):
+        fn, args = self._undo.pop()
+        fn(*args)
+
+    def checkpoint(self):
+        return len(self._undo)
+
+    def rollback(self, mark):
+        while len(self._undo) > mark:
+            self.undo()
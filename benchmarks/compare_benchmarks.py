@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Compare two run_benchmarks.py result files and flag regressions.
+
+A (topology, nodes, stage) case regresses when the new time exceeds the base
+time by more than --threshold (ratio) *and* by more than --min-delta seconds,
+so sub-millisecond jitter is not reported. Peak memory is checked the same way
+with --min-delta-mb. The exit status is 1 if anything regressed, so the
+script can gate CI.
+
+    python benchmarks/compare_benchmarks.py base.json new.json --threshold 1.2
+"""
+
+import argparse
+import json
+import sys
+
+def load(path):
+    with open(path) as f:
+        report = json.load(f)
+    return report, {(r["topology"], r["nodes"], r["stage"]): r for r in report["results"] if "seconds" in r}
+
+def ratio(new, base):
+    return new / base if base > 0 else float("inf") if new > 0 else 1.0
+
+def compare(base, new, threshold=1.2, min_delta=0.005, min_delta_mb=1.0):
+    """Rows for cases present in both files: (key, base_s, new_s, time_ratio, base_mb, new_mb, flags)."""
+    rows = []
+    for key in sorted(set(base) & set(new), key=lambda k: (k[0], k[1], k[2])):
+        b, n = base[key], new[key]
+        flags = []
+        r = ratio(n["seconds"], b["seconds"])
+        if r > threshold and n["seconds"] - b["seconds"] > min_delta:
+            flags.append("time")
+        bm, nm = b.get("peak_mb"), n.get("peak_mb")
+        if bm is not None and nm is not None and ratio(nm, bm) > threshold and nm - bm > min_delta_mb:
+            flags.append("memory")
+        rows.append((key, b["seconds"], n["seconds"], r, bm, nm, flags))
+    return rows
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Compare two AgentBound benchmark result files")
+    ap.add_argument("base")
+    ap.add_argument("new")
+    ap.add_argument("--threshold", type=float, default=1.2, help="Regression ratio new/base (default 1.2)")
+    ap.add_argument("--min-delta", type=float, default=0.005, help="Ignore time changes below this many seconds")
+    ap.add_argument("--min-delta-mb", type=float, default=1.0, help="Ignore peak-memory changes below this many MB")
+    ap.add_argument("--json", action="store_true", help="Print the comparison as JSON")
+    args = ap.parse_args()
+
+    base_report, base = load(args.base)
+    new_report, new = load(args.new)
+    rows = compare(base, new, args.threshold, args.min_delta, args.min_delta_mb)
+    regressions = [r for r in rows if r[6]]
+    if base_report.get("config", {}).get("engine") != new_report.get("config", {}).get("engine"):
+        print("[warn] the two files used different harness engines", file=sys.stderr)
+
+    if args.json:
+        json.dump({"base": args.base, "new": args.new, "threshold": args.threshold,
+                   "cases": [{"topology": k[0], "nodes": k[1], "stage": k[2], "base_s": bs, "new_s": ns,
+                              "ratio": round(r, 3), "base_mb": bm, "new_mb": nm, "regressed": flags}
+                             for k, bs, ns, r, bm, nm, flags in rows]}, sys.stdout, indent=2)
+        print()
+    else:
+        print(f"{'topology':>10s} {'nodes':>7s}  {'stage':<16s} {'base s':>10s} {'new s':>10s} {'ratio':>7s}  "
+              f"{'base MB':>9s} {'new MB':>9s}")
+        for (topo, n, stage), bs, ns, r, bm, nm, flags in rows:
+            mb = f"{bm:>9.2f} {nm:>9.2f}" if bm is not None and nm is not None else f"{'-':>9s} {'-':>9s}"
+            print(f"{topo:>10s} {n:>7d}  {stage:<16s} {bs:>10.4f} {ns:>10.4f} {r:>7.2f}  {mb}"
+                  + (f"  REGRESSED ({', '.join(flags)})" if flags else ""))
+        only = (set(base) ^ set(new))
+        if only:
+            print(f"\n{len(only)} case(s) present in only one file were not compared")
+        print(f"\n{len(regressions)} regression(s) out of {len(rows)} compared case(s) "
+              f"(threshold ×{args.threshold}, min Δ {args.min_delta}s / {args.min_delta_mb} MB)")
+    sys.exit(1 if regressions else 0)
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Stage-by-stage benchmark of the AgentBound pipeline on synthetic graphs.
+
+For every topology × size (see synthetic_graphs.py) each stage is timed on
+its own (best of --repeat, inputs prepared outside the timer), then run once
+more under tracemalloc for its peak allocation:
+
+  json_load        agentbound_loader.load_graph_stream (raw node dicts)
+  kind_inference   KindClassifier.infer over every node, cold memo
+  load_ir          agentbound.load_ir (stream + classify + CSR)
+  compute_entropy  agentbound.compute_entropy_ir
+  structure        structural metrics + validator coverage
+  find_drivers     agentbound_compare.find_drivers (betweenness --mode auto)
+  layout           agentbound_layout.compute_layout, memory cache cleared per call
+  render           agentbound.render_graph to a PNG (includes an uncached layout)
+  simulate         run_harness.simulate_graph_file (--engine, --runs)
+  compute_metrics  compute_metrics.entropy_metrics, no cache
+
+plus one `correlation` record over all cases (plot_and_correlation.correlation
+of entropy vs. simulated failure rate). Stages that would take minutes on big
+graphs have a node cap (STAGE_MAX_NODES, --max-nodes stage=N) and are recorded
+as skipped above it.
+
+    python benchmarks/run_benchmarks.py --out benchmarks/results/main.json
+    python benchmarks/run_benchmarks.py --quick --out /tmp/pr.json
+    python benchmarks/compare_benchmarks.py benchmarks/results/main.json /tmp/pr.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "validation"))
+
+import matplotlib
+matplotlib.use("Agg")
+
+import agentbound
+import agentbound_layout
+from agentbound_compare import find_drivers
+from agentbound_kinds import KindClassifier
+from agentbound_layout import compute_layout
+from agentbound_loader import load_graph_stream
+from compute_metrics import entropy_metrics
+from plot_and_correlation import correlation
+from run_harness import simulate_graph_file
+from synthetic_graphs import SIZES, TOPOLOGIES, parse_list, write_graph
+
+FORMAT_VERSION = 1
+STAGES = ("json_load", "kind_inference", "load_ir", "compute_entropy", "structure", "find_drivers",
+          "layout", "render", "simulate", "compute_metrics")
+STAGE_MAX_NODES = {"find_drivers": 10_000, "render": 1_000}
+QUICK_SIZES = (10, 100, 1_000)
+
+# ---------- Stages ----------
+def make_stages(path, tmp, args):
+    """name -> zero-argument callable for one graph file; shared inputs are built here, untimed."""
+    ir = agentbound.load_ir(path, warn=False)
+    ids, edges = list(ir.ids), ir.edges()
+    raw = [(nid, lbl) for nid, lbl in zip(ir.ids, ir.labels)]
+    out = {}
+
+    def simulate():
+        out["simulate"] = simulate_graph_file(Path(path), Path(tmp) / "results", args.runs, args.seed,
+                                              args.step_cap, False, Path(tmp) / "raw", engine=args.engine)
+
+    def layout():
+        agentbound_layout._memory_cache.clear()  # repeats must not hit the memo
+        compute_layout(ids, edges)
+
+    def render():
+        agentbound_layout._memory_cache.clear()
+        agentbound.render_graph(ir.to_nodes(), edges, agentbound.compute_entropy_ir(ir), os.path.join(tmp, "graph.png"))
+
+    def infer():
+        k = KindClassifier()
+        for nid, lbl in raw:
+            k.infer(nid, lbl)
+
+    stages = {
+        "json_load": lambda: load_graph_stream(path),
+        "kind_inference": infer,
+        "load_ir": lambda: agentbound.load_ir(path, warn=False),
+        "compute_entropy": lambda: out.__setitem__("entropy", agentbound.compute_entropy_ir(ir)),
+        "structure": lambda: (agentbound.structural_metrics_ir(ir), agentbound.validator_coverage_ir(ir)),
+        "find_drivers": lambda: find_drivers(ir),
+        "layout": layout,
+        "render": render,
+        "simulate": simulate,
+        "compute_metrics": lambda: entropy_metrics(Path(path)),
+    }
+    return stages, ir, out
+
+def measure(fn, repeat, memory):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    rec = {"seconds": round(best, 6)}
+    if memory:
+        tracemalloc.start()
+        try:
+            fn()
+            rec["peak_mb"] = round(tracemalloc.get_traced_memory()[1] / 2**20, 3)
+        finally:
+            tracemalloc.stop()
+    return rec
+
+# ---------- Suite ----------
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=ROOT, capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run_suite(args):
+    caps = {**STAGE_MAX_NODES, **args.max_nodes}
+    results, points = [], []
+    with tempfile.TemporaryDirectory() as tmp:
+        graph_dir = args.graph_dir or os.path.join(tmp, "graphs")
+        os.makedirs(graph_dir, exist_ok=True)
+        for topo in args.topologies:
+            for n in args.sizes:
+                path = write_graph(topo, n, graph_dir, args.seed)
+                stages, ir, out = make_stages(path, tmp, args)
+                case = {"topology": topo, "nodes": ir.n, "edges": ir.m}
+                for stage in args.stages:
+                    if n > caps.get(stage, float("inf")):
+                        results.append({**case, "stage": stage, "skipped": f"nodes > {caps[stage]}"})
+                        continue
+                    rec = {**case, "stage": stage, **measure(stages[stage], args.repeat, not args.no_memory)}
+                    results.append(rec)
+                    print(f"{topo:>10s} {n:>7d}  {stage:<16s} {rec['seconds']:>10.4f}s"
+                          + (f"  {rec['peak_mb']:>9.2f} MB" if "peak_mb" in rec else ""), file=sys.stderr)
+                if "entropy" in out and "simulate" in out:
+                    points.append((out["entropy"]["entropy_score"], out["simulate"]["failure_rate"]))
+
+    if len(points) >= 2:
+        X, Y = [p[0] for p in points], [p[1] for p in points]
+        rec = {"topology": "all", "nodes": len(points), "edges": 0, "stage": "correlation",
+               **measure(lambda: correlation(X, Y), args.repeat, not args.no_memory)}
+        results.append(rec)
+
+    return {
+        "format_version": FORMAT_VERSION,
+        "meta": {"created": datetime.now(timezone.utc).isoformat(timespec="seconds"), "git_commit": git_commit(),
+                 "python": platform.python_version(), "platform": platform.platform(),
+                 "cpu_count": os.cpu_count()},
+        "config": {"topologies": args.topologies, "sizes": args.sizes, "stages": args.stages,
+                   "repeat": args.repeat, "runs": args.runs, "engine": args.engine, "step_cap": args.step_cap,
+                   "seed": args.seed, "max_nodes": caps, "memory": not args.no_memory},
+        "results": results,
+    }
+
+def parse_caps(items):
+    caps = {}
+    for item in items or []:
+        stage, _, n = item.partition("=")
+        if stage not in STAGES or not n.isdigit():
+            raise SystemExit(f"--max-nodes expects stage=N with a known stage, got {item!r}")
+        caps[stage] = int(n)
+    return caps
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Time each AgentBound pipeline stage on synthetic graphs")
+    ap.add_argument("--out", default=str(ROOT / "benchmarks" / "results" / "bench.json"), help="Results JSON")
+    ap.add_argument("--topologies", default=",".join(TOPOLOGIES))
+    ap.add_argument("--sizes", default=None, help=f"Comma-separated node counts (default {','.join(map(str, SIZES))})")
+    ap.add_argument("--quick", action="store_true", help=f"Sizes {','.join(map(str, QUICK_SIZES))} only (unless --sizes)")
+    ap.add_argument("--stages", default=",".join(STAGES), help="Comma-separated subset of stages")
+    ap.add_argument("--repeat", type=int, default=3, help="Timed repetitions per stage (best is kept)")
+    ap.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc pass")
+    ap.add_argument("--max-nodes", nargs="*", metavar="STAGE=N", help="Override per-stage node caps")
+    ap.add_argument("--runs", type=int, default=200, help="Harness runs per graph for the simulate stage")
+    ap.add_argument("--engine", choices=["python", "numpy", "exact"], default="python")
+    ap.add_argument("--step-cap", type=int, default=200)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--graph-dir", help="Keep the generated graphs here instead of a temp dir")
+    args = ap.parse_args()
+
+    args.topologies = parse_list(args.topologies)
+    args.sizes = parse_list(args.sizes, int) if args.sizes else list(QUICK_SIZES if args.quick else SIZES)
+    args.stages = parse_list(args.stages)
+    unknown = set(args.stages) - set(STAGES)
+    if unknown:
+        ap.error(f"unknown stages: {', '.join(sorted(unknown))}")
+    args.max_nodes = parse_caps(args.max_nodes)
+
+    report = run_suite(args)
+    os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+    with open(args.out, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Saved: {args.out}")
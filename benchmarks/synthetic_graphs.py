@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Deterministic synthetic agent graphs for benchmarking.
+
+Topologies (n nodes each, same seed -> same file):
+
+  chain       s → 1 → 2 → … → n-1
+  fork        router → n-2 parallel workers → join
+  loop        chain with a retry edge back 3 steps from every 5th node
+  supervisor  8-ary tree of supervisors; every child reports back to its
+              parent, and the root can hand off to a `finish` sink
+
+Nodes are ~60% generative (`llm_<i>`), and the rest deterministic (`tool_<i>`,
+or `validator_<i>` for half of them). Kinds are declared, so agentbound.py
+and the harness see the same graph. Files use the per-node "edges" format with
+a start_node, as in validation/graphs/, and can be fed to every tool.
+
+    python benchmarks/synthetic_graphs.py --out-dir /tmp/graphs --sizes 10,1000 --topologies chain,loop
+"""
+
+import argparse
+import json
+import os
+import random
+
+TOPOLOGIES = ("chain", "fork", "loop", "supervisor")
+SIZES = (10, 100, 1_000, 10_000, 100_000)
+SUPERVISOR_FANOUT = 8
+
+def _node(i, rng):
+    if rng.random() < 0.6:
+        return {"id": f"llm_{i}", "label": f"LLM step {i}", "kind": "generative", "edges": []}
+    if rng.random() < 0.5:
+        return {"id": f"validator_{i}", "label": f"Validator {i}", "kind": "deterministic",
+                "validator": True, "edges": []}
+    return {"id": f"tool_{i}", "label": f"Tool {i}", "kind": "deterministic", "edges": []}
+
+def _relabel(nodes, ids, i, nid, label, kind):
+    nodes[i].update(id=nid, label=label, kind=kind)
+    nodes[i].pop("validator", None)
+    ids[i] = nid
+
+def generate(topology, n, seed=0):
+    """Graph document with n nodes (n >= 4)."""
+    if topology not in TOPOLOGIES:
+        raise ValueError(f"unknown topology {topology!r} (expected one of {', '.join(TOPOLOGIES)})")
+    if n < 4:
+        raise ValueError("synthetic graphs need at least 4 nodes")
+    rng = random.Random(f"{topology}:{n}:{seed}")
+    nodes = [_node(i, rng) for i in range(n)]
+    ids = [v["id"] for v in nodes]
+
+    def link(a, b):
+        nodes[a]["edges"].append(ids[b])
+
+    if topology in ("chain", "loop"):
+        for i in range(n - 1):
+            link(i, i + 1)
+        if topology == "loop":
+            for i in range(5, n - 1, 5):
+                link(i, i - 3)
+                nodes[i - 3]["__harness"] = {"loop_policy": {"max_iters": 3}}
+    elif topology == "fork":
+        _relabel(nodes, ids, 0, "router_0", "Router", "deterministic")
+        _relabel(nodes, ids, n - 1, f"join_{n - 1}", "Join", "deterministic")
+        for i in range(1, n - 1):
+            link(0, i)
+            link(i, n - 1)
+    else:  # supervisor
+        finish = n - 1
+        for i in range(finish):
+            if i * SUPERVISOR_FANOUT + 1 < finish:  # has children
+                _relabel(nodes, ids, i, f"supervisor_{i}", f"Supervisor {i}", "generative")
+        _relabel(nodes, ids, finish, f"finish_{finish}", "Finish", "deterministic")
+        for i in range(1, finish):
+            parent = (i - 1) // SUPERVISOR_FANOUT
+            link(parent, i)
+            link(i, parent)
+        link(0, finish)
+
+    return {"start_node": ids[0], "nodes": nodes}
+
+def write_graph(topology, n, out_dir, seed=0):
+    path = os.path.join(out_dir, f"{topology}_{n}.json")
+    with open(path, "w") as f:
+        json.dump(generate(topology, n, seed), f, separators=(",", ":"))
+    return path
+
+def parse_list(text, cast=str):
+    return [cast(x.strip()) for x in text.split(",") if x.strip()]
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Write deterministic synthetic agent graphs")
+    ap.add_argument("--out-dir", required=True)
+    ap.add_argument("--topologies", default=",".join(TOPOLOGIES))
+    ap.add_argument("--sizes", default=",".join(map(str, SIZES)), help="Comma-separated node counts")
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+    os.makedirs(args.out_dir, exist_ok=True)
+    for topo in parse_list(args.topologies):
+        for n in parse_list(args.sizes, int):
+            print(write_graph(topo, n, args.out_dir, args.seed))
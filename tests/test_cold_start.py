@@ -0,0 +1,41 @@
+"""
+Cold start of the metrics-only path: agentbound.score() must not import the
+plotting stack and must stay within COLD_START_BUDGET_S, measured in a fresh
+interpreter (startup + import + one score).
+"""
+
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+GRAPH = ROOT / "examples" / "customer_support_agent" / "inputs" / "A_graph.json"
+KIND_MAP = ROOT / "examples" / "customer_support_agent" / "inputs" / "A_kind_map.json"
+
+# ~0.09s measured; the budget leaves room for slow CI machines.
+COLD_START_BUDGET_S = 1.0
+
+SCRIPT = f"""
+import json, sys
+import agentbound
+report = agentbound.score({str(GRAPH)!r}, {str(KIND_MAP)!r})
+print(json.dumps({{"entropy_score": report["entropy_score"],
+                  "loaded": sorted(m for m in ("networkx", "matplotlib") if m in sys.modules)}}))
+"""
+
+def run_score():
+    t0 = time.perf_counter()
+    proc = subprocess.run([sys.executable, "-c", SCRIPT], cwd=ROOT, capture_output=True, text=True, check=True)
+    return json.loads(proc.stdout), time.perf_counter() - t0
+
+def test_score_does_not_import_plotting_libraries():
+    out, _ = run_score()
+    assert out["loaded"] == []
+    assert isinstance(out["entropy_score"], float)
+
+def test_score_cold_start_within_budget():
+    # Best of three, so one slow process spawn does not fail the run.
+    elapsed = min(run_score()[1] for _ in range(3))
+    assert elapsed < COLD_START_BUDGET_S, f"metrics-only cold start took {elapsed:.3f}s"
@@ -0,0 +1,49 @@
+"""
+Approximate risk hubs on a sparse agent graph: path sampling must really sample
+(fewer samples than nodes) and every betweenness score must stay within
+--epsilon of exact Brandes.
+"""
+
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+from agentbound import ir_from_doc
+from agentbound_compare import risk_hubs, vertex_diameter_bound
+from synthetic_graphs import generate
+
+N = 600
+EPSILON = 0.1
+
+def all_scores(result):
+    return {h["id"]: h["betweenness"] for h in result["hubs"]}
+
+def test_approx_samples_and_stays_within_epsilon():
+    ir = ir_from_doc(generate("supervisor", N))
+    exact = all_scores(risk_hubs(ir, k=N, mode="exact"))
+    for seed in range(3):
+        approx = risk_hubs(ir, k=N, mode="approx", epsilon=EPSILON, seed=seed)
+        assert approx["method"] == "approx" and "fallback" not in approx
+        assert approx["pivots"] < N
+        got = all_scores(approx)
+        assert got.keys() == exact.keys()
+        worst = max(abs(got[v] - exact[v]) for v in exact)
+        assert worst <= EPSILON, f"seed {seed}: max error {worst:.4f}"
+
+def test_vertex_diameter_bound_is_an_upper_bound():
+    import networkx as nx
+    doc = generate("supervisor", 200)
+    ir = ir_from_doc(doc)
+    succ = [list(dict.fromkeys(ir.successors(v))) for v in range(ir.n)]
+    G = nx.DiGraph(ir.edges())
+    longest = max(len(path) for _, paths in nx.all_pairs_shortest_path(G) for path in paths.values())
+    assert longest <= vertex_diameter_bound(ir, succ)
+
+def test_approx_falls_back_to_exact_on_a_long_chain():
+    ir = ir_from_doc(generate("chain", 300))
+    result = risk_hubs(ir, mode="approx", epsilon=EPSILON)
+    assert result["method"] == "exact" and result["vertex_diameter_bound"] == 300
+    assert "fallback" in result
@@ -6,39 +6,20 @@ and attach 95% Wilson score confidence intervals to selected rates.
 Writes: validation/results/summary/all_results.json
 """
 
-import argparse, json, math, re
+import argparse, json, math, sys
 from pathlib import Path
 from typing import Dict, List, Tuple
 
-# --- Kind inference from README ---
-_GEN_RE = re.compile(r"(llm|gpt|model|generate|writer|assistant|agent|supervisor)", re.I)
+# --- Kind inference: the shared classifier from the repo root ---
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from agentbound_kinds import classify, default_classifier
+from agentbound_ir import read_ir
+from agentbound_loader import stream_digest
 
 def infer_kind(node: Dict) -> str:
-    k = (node.get("kind") or "").lower()
-    if k in ("generative", "deterministic"):
-        return k
-    label = f"{node.get('id','')} {node.get('label','')}"
-    return "generative" if _GEN_RE.search(label or "") else "deterministic"
-
-def to_canonical(graph: Dict) -> Tuple[List[Dict], List[Tuple[str, str]], str]:
-    if "edges" in graph and isinstance(graph["edges"], list) and graph["edges"] and isinstance(graph["edges"][0], list):
-        nodes = graph["nodes"]
-        edges = [(a, b) for a, b in graph["edges"]]
-        start = graph.get("start_node") or (nodes[0]["id"] if nodes else "")
-        return nodes, edges, start
-    nodes = graph["nodes"]
-    edges: List[Tuple[str, str]] = []
-    for n in nodes:
-        for tgt in (n.get("edges") or []):
-            edges.append((n["id"], tgt))
-    start = graph.get("start_node") or (nodes[0]["id"] if nodes else "")
-    return nodes, edges, start
-
-def compute_counts(nodes: List[Dict], edges: List[Tuple[str, str]]) -> Dict:
-    kinds: Dict[str, str] = {n["id"]: infer_kind(n) for n in nodes}
-    G = sum(1 for k in kinds.values() if k == "generative")
-    D = sum(1 for k in kinds.values() if k == "deterministic")
-    gg = sum(1 for a,b in edges if kinds.get(a)=="generative" and kinds.get(b)=="generative")
+    return classify(node.get("id", ""), node.get("label"), node.get("kind"))
+
+def metrics_from_counts(G: int, D: int, gg: int) -> Dict:
     coupling = 1.0 + (math.sqrt(gg) / max(1, G)) if G > 0 else 1.0
     entropy = (G / max(1, G + D)) * coupling + 0.1 * gg
     level = "Low" if entropy < 0.30 else "Moderate" if entropy < 0.60 else "High" if entropy < 0.90 else "Very High"
@@ -65,12 +46,36 @@ def wilson_interval(phat: float, n: int, z: float = 1.96) -> Tuple[float,float]:
 def read_json(p: Path):
     return json.loads(p.read_text())
 
+def entropy_metrics(graph_path: Path, cache=None) -> Dict:
+    """Entropy metrics for one graph file, memoized on graph content and the kind rules.
+
+    The graph is streamed (both edge formats), so large files are never held as one document.
+    """
+    key = None
+    if cache is not None:
+        key = cache.key({"graph": stream_digest(graph_path), "gen_hints": default_classifier().signature})
+        hit = cache.get(key)
+        if hit is not None:
+            return hit
+    ir = read_ir(graph_path, infer_kind)
+    metrics = metrics_from_counts(*ir.entropy_counts())
+    if cache is not None:
+        cache.put(key, metrics)
+    return metrics
+
 def main():
     ap = argparse.ArgumentParser()
     ap.add_argument("--graphs", required=True, help="Dir with *.json graphs (recurses)")
     ap.add_argument("--results", default="validation/results", help="Harness results base dir")
+    ap.add_argument("--cache-dir", default="validation/.cache", help="Entropy cache shared with run_harness.py")
+    ap.add_argument("--no-cache", action="store_true", help="Recompute entropy for every graph")
     args = ap.parse_args()
 
+    cache = None
+    if not args.no_cache:
+        from result_cache import ResultCache
+        cache = ResultCache(Path(args.cache_dir), "entropy")
+
     graphs_root = Path(args.graphs)
     results_dir = Path(args.results)
     harness_summaries = results_dir / "summary" / "ALL.summaries.json"
@@ -96,14 +101,16 @@ def main():
         loop = float(s.get("loop_rate", 0.0))
         tout = float(s.get("timeout_rate", 0.0))
 
-        fail_ci = wilson_interval(fail, n)
-        loop_ci = wilson_interval(loop, n)
-        tout_ci = wilson_interval(tout, n)
+        if s.get("engine") == "exact":
+            # Exact solver output carries no sampling noise.
+            fail_ci, loop_ci, tout_ci = (fail, fail), (loop, loop), (tout, tout)
+        else:
+            fail_ci = wilson_interval(fail, n)
+            loop_ci = wilson_interval(loop, n)
+            tout_ci = wilson_interval(tout, n)
 
         # Entropy metrics from graph structure
-        gdict = read_json(graph_path)
-        nodes, edges, _ = to_canonical(gdict)
-        ab_metrics = compute_counts(nodes, edges)
+        ab_metrics = entropy_metrics(graph_path, cache)
 
         merged.append({
             "graph": name,
@@ -112,7 +119,7 @@ def main():
             "failure_rate_ci95": [round(fail_ci[0], 6), round(fail_ci[1], 6)],
             "loop_rate_ci95":    [round(loop_ci[0], 6), round(loop_ci[1], 6)],
             "timeout_rate_ci95": [round(tout_ci[0], 6), round(tout_ci[1], 6)],
-            "ci_method": "wilson",
+            "ci_method": "exact" if s.get("engine") == "exact" else "wilson",
             **ab_metrics
         })
 
@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+"""
+Discrete-event simulation of AgentBound graphs under load.
+
+run_harness.py walks one path per run. Here requests arrive as a Poisson
+process (--arrival-rate) and share one clock:
+
+* a node with `"fanout": "all"` in its __harness block starts every successor
+  in parallel (otherwise one successor is picked at random, as in the harness);
+* `"join": "all"` waits for a branch over each incoming edge and continues
+  with the slowest; `"join": "any"` continues with the first branch of a
+  request and drops later ones;
+* calls of nodes with a `pool` (per node, or `default_pool` by kind in the
+  config) queue FIFO for that pool's `concurrency` slots and a token bucket of
+  `rate_per_s` (with `burst`, default 1). A retry gives up its slot while it
+  backs off.
+
+Latency, tokens, failure_prob, retries, backoff and loop budgets are read as in
+run_harness.py; --step-cap bounds node visits per request. A request fails as
+soon as one branch fails; its calls already in service still hold their slots
+until they finish. A request that ends while a join still waits is `stalled`.
+
+Per graph the summary reports end-to-end latency of successful requests, their
+critical path (service and backoff only, i.e. the latency without contention),
+queueing delay (the difference), per-call queue waits and utilization per
+pool, and throughput in successful requests per second.
+
+    ./des_sim.py --graphs graphs/ --config config.yaml --arrival-rate 5 --requests 2000
+"""
+
+import argparse
+import heapq
+import random
+import sys
+import time
+from collections import deque
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from run_harness import DEFAULTS, Node, backoff_delay, distribution, draw_latency, is_timed, load_config, \
+    load_graph, write_json
+
+DES_VERSION = "v0"
+ARRIVE, DONE, RETRY, WAKE = range(4)
+EPS = 1e-9
+
+# ---------- Pools ----------
+class Pool:
+    """FIFO queue in front of `concurrency` slots and a token bucket; times in ms."""
+
+    def __init__(self, name: str, spec: Dict):
+        unknown = set(spec) - {"concurrency", "rate_per_s", "burst"}
+        if unknown:
+            raise ValueError(f"pool {name!r}: unknown keys {sorted(unknown)}")
+        self.name = name
+        self.concurrency = spec.get("concurrency") or float("inf")
+        self.rate = spec["rate_per_s"] / 1000 if spec.get("rate_per_s") else None
+        self.burst = float(spec.get("burst", 1))
+        self.tokens = self.burst
+        self.refilled = 0.0
+        self.busy = 0
+        self.queue = deque()
+        self.wake_at: Optional[float] = None
+        self.waits: List[float] = []
+        self.max_queue = 0
+        self.busy_area = 0.0
+        self.last = 0.0
+
+    def account(self, now: float) -> None:
+        self.busy_area += self.busy * (now - self.last)
+        self.last = now
+
+    def take_token(self, now: float) -> Optional[float]:
+        """Consume one token, or return when the next one is available."""
+        if self.rate is None:
+            return None
+        self.tokens = min(self.burst, self.tokens + (now - self.refilled) * self.rate)
+        self.refilled = now
+        if self.tokens < 1 - EPS:
+            return now + (1 - self.tokens) / self.rate
+        self.tokens -= 1
+        return None
+
+# ---------- Simulation ----------
+class Request:
+    __slots__ = ("arrived", "alive", "active", "steps", "retries", "cost", "cp", "answered", "visits", "joins",
+                 "joined")
+
+    def __init__(self, arrived: float):
+        self.arrived = arrived
+        self.alive = True
+        self.active = 1           # branches not yet finished, parked at a join or dropped
+        self.steps = 0
+        self.retries = 0
+        self.cost = 0.0
+        self.cp = 0.0             # longest service + backoff path over finished branches
+        self.answered = arrived   # when the last branch reached a sink
+        self.visits: Dict[str, int] = {}
+        self.joins: Dict[str, List] = {}   # join node -> [arrivals, slowest branch cp]
+        self.joined = set()
+
+class Simulation:
+    def __init__(self, nodes: Dict[str, Node], start: str, pools: Dict[str, Dict], step_cap: int, seed: int):
+        self.nodes = nodes
+        self.start = start
+        self.step_cap = step_cap
+        self.rng = random.Random(seed)
+        self.pools = {name: Pool(name, spec) for name, spec in pools.items()}
+        for n in nodes.values():
+            if n.pool is not None and n.pool not in self.pools:
+                raise ValueError(f"node {n.id!r} uses unknown pool {n.pool!r}")
+        self.in_degree = {nid: 0 for nid in nodes}
+        for n in nodes.values():
+            for t in n.edges:
+                self.in_degree[t] += 1
+        self.events: List = []
+        self.seq = 0
+        self.now = 0.0
+        self.finished: List[Dict] = []
+
+    def schedule(self, t: float, kind: int, payload) -> None:
+        self.seq += 1
+        heapq.heappush(self.events, (t, self.seq, kind, payload))
+
+    def run(self, arrivals: List[float]) -> List[Dict]:
+        for t in arrivals:
+            self.schedule(t, ARRIVE, None)
+        while self.events:
+            self.now, _, kind, payload = heapq.heappop(self.events)
+            if kind == ARRIVE:
+                self.enter(Request(self.now), self.start, 0.0)
+            elif kind == DONE:
+                self.finish_call(*payload)
+            elif kind == RETRY:
+                self.call(*payload)
+            else:
+                payload.wake_at = None
+                self.dispatch(payload)
+        return self.finished
+
+    # Request lifecycle
+    def end(self, req: Request, outcome: str) -> None:
+        req.alive = False
+        # Branches dropped by a join "any" may still be running; they do not delay the answer.
+        t = req.answered if outcome == "success" else self.now
+        self.finished.append({"outcome": outcome, "latency_ms": t - req.arrived, "cp_ms": req.cp,
+                              "retries": req.retries, "cost": req.cost, "steps": req.steps})
+
+    def retire(self, req: Request) -> None:
+        req.active -= 1
+        if req.active == 0:
+            self.end(req, "stalled" if req.joins else "success")
+
+    def enter(self, req: Request, v: str, cp: float) -> None:
+        req.steps += 1
+        if req.steps > self.step_cap:
+            return self.end(req, "timeout")
+        node = self.nodes[v]
+        seen = req.visits[v] = req.visits.get(v, 0) + 1
+        if node.loop_max_iters is not None and seen > node.loop_max_iters:
+            return self.end(req, "loop")
+        self.call(req, v, 0, cp)
+
+    def advance(self, req: Request, v: str, cp: float) -> None:
+        node = self.nodes[v]
+        if not node.edges:
+            req.cp = max(req.cp, cp)
+            req.answered = self.now
+            return self.retire(req)
+        targets = node.edges if node.fanout == "all" else [self.rng.choice(node.edges)]
+        req.active += len(targets) - 1
+        for w in targets:
+            if not req.alive:
+                return
+            self.deliver(req, w, cp)
+
+    def deliver(self, req: Request, w: str, cp: float) -> None:
+        join = self.nodes[w].join
+        if join == "all":
+            state = req.joins.setdefault(w, [0, 0.0])
+            state[0] += 1
+            state[1] = max(state[1], cp)
+            if state[0] < self.in_degree[w]:
+                return self.retire(req)
+            cp = req.joins.pop(w)[1]
+        elif join == "any":
+            if w in req.joined:
+                return self.retire(req)
+            req.joined.add(w)
+        self.enter(req, w, cp)
+
+    # Calls
+    def call(self, req: Request, v: str, attempt: int, cp: float) -> None:
+        if not req.alive:
+            return
+        pool = self.pools.get(self.nodes[v].pool)
+        if pool is None:
+            return self.start_call(req, v, attempt, cp, None)
+        pool.queue.append((req, v, attempt, cp, self.now))
+        pool.max_queue = max(pool.max_queue, len(pool.queue))
+        self.dispatch(pool)
+
+    def dispatch(self, pool: Pool) -> None:
+        while pool.queue and pool.busy < pool.concurrency:
+            if not pool.queue[0][0].alive:
+                pool.queue.popleft()
+                continue
+            wake = pool.take_token(self.now)
+            if wake is not None:
+                if pool.wake_at is None:
+                    pool.wake_at = wake
+                    self.schedule(wake, WAKE, pool)
+                return
+            req, v, attempt, cp, queued = pool.queue.popleft()
+            pool.account(self.now)
+            pool.busy += 1
+            pool.waits.append(self.now - queued)
+            self.start_call(req, v, attempt, cp, pool)
+
+    def start_call(self, req: Request, v: str, attempt: int, cp: float, pool: Optional[Pool]) -> None:
+        node = self.nodes[v]
+        d = draw_latency(node.latency, self.rng) if node.latency is not None else 0.0
+        req.cost += node.call_cost
+        self.schedule(self.now + d, DONE, (req, v, attempt, cp + d, pool))
+
+    def finish_call(self, req: Request, v: str, attempt: int, cp: float, pool: Optional[Pool]) -> None:
+        if pool is not None:
+            pool.account(self.now)
+            pool.busy -= 1
+            self.dispatch(pool)
+        if not req.alive:
+            return
+        node = self.nodes[v]
+        if self.rng.random() >= node.failure_prob:
+            return self.advance(req, v, cp)
+        if attempt < node.max_retries:
+            wait = backoff_delay(node.backoff, attempt + 1, self.rng)
+            req.retries += 1
+            return self.schedule(self.now + wait, RETRY, (req, v, attempt + 1, cp + wait))
+        self.end(req, "failure")
+
+# ---------- Summary ----------
+def poisson_arrivals(n: int, rate_per_s: float, seed: int) -> List[float]:
+    """Arrival times in ms; a separate stream, so every graph sees the same arrivals."""
+    rng = random.Random(f"arrivals:{seed}")
+    t, out = 0.0, []
+    for _ in range(n):
+        t += rng.expovariate(rate_per_s / 1000)
+        out.append(t)
+    return out
+
+def summarize(sim: Simulation, finished: List[Dict], arrivals: List[float], rate_per_s: float) -> Dict:
+    n = len(finished)
+    ok = [r for r in finished if r["outcome"] == "success"]
+    makespan_s = (sim.now - arrivals[0]) / 1000 if arrivals else 0.0
+    count = {k: sum(1 for r in finished if r["outcome"] == k) for k in ("failure", "timeout", "loop", "stalled")}
+    pools = {}
+    for name, p in sim.pools.items():
+        mean_busy = p.busy_area / (makespan_s * 1000) if makespan_s else 0.0
+        pools[name] = {"calls": len(p.waits), "wait_ms": distribution(p.waits), "max_queue": p.max_queue,
+                       "mean_busy": round(mean_busy, 6),
+                       "utilization": round(mean_busy / p.concurrency, 6) if p.concurrency != float("inf") else None}
+    return {
+        "requests": n,
+        "arrival_rate_per_s": rate_per_s,
+        "failure_rate": round((n - len(ok)) / n, 6) if n else 0.0,
+        "timeout_rate": round(count["timeout"] / n, 6) if n else 0.0,
+        "loop_budget_rate": round(count["loop"] / n, 6) if n else 0.0,
+        "stall_rate": round(count["stalled"] / n, 6) if n else 0.0,
+        "avg_retries": round(sum(r["retries"] for r in finished) / n, 6) if n else 0.0,
+        "latency_ms": distribution([r["latency_ms"] for r in ok]),
+        "critical_path_ms": distribution([r["cp_ms"] for r in ok]),
+        "queueing_delay_ms": distribution([r["latency_ms"] - r["cp_ms"] for r in ok]),
+        "throughput_per_s": round(len(ok) / makespan_s, 6) if makespan_s else 0.0,
+        "makespan_s": round(makespan_s, 6),
+        "cost_per_success": round(sum(r["cost"] for r in finished) / len(ok), 6) if ok else None,
+        "pools": pools,
+    }
+
+def simulate_graph(graph_path: Path, arrivals: List[float], rate_per_s: float, seed: int, step_cap: int,
+                   defaults=DEFAULTS) -> Dict:
+    nodes, start = load_graph(graph_path, defaults)
+    if not is_timed(nodes):
+        print(f"[des] {graph_path.stem}: no latency_ms on any node; every call takes 0 ms", file=sys.stderr)
+    sim = Simulation(nodes, start, defaults["pools"], step_cap, seed)
+    return summarize(sim, sim.run(arrivals), arrivals, rate_per_s)
+
+# ---------- CLI ----------
+def main():
+    t0 = time.time()
+    ap = argparse.ArgumentParser(description="AgentBound discrete-event simulation under load")
+    ap.add_argument("--graphs", required=True, help="Dir with *.json graphs (recurses).")
+    ap.add_argument("--results", default="validation/results", help="Output dir; writes <results>/des/")
+    ap.add_argument("--config", default=None, help="YAML/JSON defaults incl. pools and default_pool (see config.yaml).")
+    ap.add_argument("--arrival-rate", type=float, default=1.0, help="Poisson request arrivals per second.")
+    ap.add_argument("--requests", type=int, default=1000, help="Requests per graph.")
+    ap.add_argument("--seed", type=int, default=None)
+    ap.add_argument("--step-cap", type=int, default=None, help="Node visits per request.")
+    args = ap.parse_args()
+    if args.arrival_rate <= 0 or args.requests <= 0:
+        raise SystemExit("--arrival-rate and --requests must be positive")
+
+    defaults = load_config(Path(args.config)) if args.config else DEFAULTS
+    seed = defaults["global_seed"] if args.seed is None else args.seed
+    step_cap = defaults["step_cap"] if args.step_cap is None else args.step_cap
+    graph_files = sorted(p for p in Path(args.graphs).rglob("*.json") if p.is_file())
+    if not graph_files:
+        raise SystemExit(f"No JSON graphs found under {args.graphs}")
+
+    out_dir = Path(args.results) / "des"
+    arrivals = poisson_arrivals(args.requests, args.arrival_rate, seed)
+    summaries = {}
+    for g in graph_files:
+        try:
+            s = simulate_graph(g, arrivals, args.arrival_rate, seed, step_cap, defaults)
+        except (ValueError, KeyError) as e:
+            raise SystemExit(f"[des] {g} failed: {type(e).__name__}: {e}")
+        write_json(out_dir / f"{g.stem}.des.json", {"graph": str(g), **s})
+        summaries[g.stem] = s
+        print(f"[des] {g.stem}: p95 {s['latency_ms']['p95']:.0f} ms, queueing p95 "
+              f"{s['queueing_delay_ms']['p95']:.0f} ms, {s['throughput_per_s']:.2f} ok/s, "
+              f"failure {s['failure_rate']:.3f}", flush=True)
+    write_json(out_dir / "metadata.json", {"requests": args.requests, "arrival_rate_per_s": args.arrival_rate,
+                                           "seed": seed, "step_cap": step_cap, "config": args.config,
+                                           "pools": defaults["pools"], "des_version": DES_VERSION})
+    write_json(out_dir / "ALL.des.json", summaries)
+    print(f"[des] Simulated {len(graph_files)} graphs in {time.time() - t0:.2f}s; output -> {out_dir}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Exact absorbing-Markov-chain solver for the AgentBound validation harness.
+
+The harness model (per-node failure_prob and max_retries, uniform choice over
+edges, terminal nodes without edges) is a finite Markov chain once the state is
+augmented with what `simulate_run` remembers about the past:
+
+* visit counts of nodes that sit on a cycle (capped at their `loop_max_iters`),
+* whether any node has been revisited yet (`touched_loop`).
+
+Nodes outside every cycle can be entered at most once, so they need no counter.
+The augmented transient states are enumerated once into a sparse transition
+matrix Q plus per-state absorption vectors (success, attempt failure, loop
+budget exceeded on the next entry). The step cap is handled as a step-indexed
+horizon: the state distribution is pushed through Q for `step_cap` steps, and
+whatever is still moving after the last step is absorbed as a timeout.
+"""
+
+from typing import Dict, List, Set, Tuple
+
+import numpy as np
+
+# Guard against graphs whose augmented state space explodes.
+MAX_STATES = 2_000_000
+
+# ---------- Graph helpers ----------
+def cyclic_nodes(nodes: Dict) -> Set[str]:
+    """Ids of nodes that lie on a directed cycle (iterative Tarjan SCC)."""
+    index: Dict[str, int] = {}
+    low: Dict[str, int] = {}
+    on_stack: Set[str] = set()
+    stack: List[str] = []
+    result: Set[str] = set()
+    counter = 0
+    for root in nodes:
+        if root in index:
+            continue
+        work = [(root, iter(nodes[root].edges))]
+        index[root] = low[root] = counter; counter += 1
+        stack.append(root); on_stack.add(root)
+        while work:
+            v, it = work[-1]
+            for w in it:
+                if w not in index:
+                    index[w] = low[w] = counter; counter += 1
+                    stack.append(w); on_stack.add(w)
+                    work.append((w, iter(nodes[w].edges)))
+                    break
+                if w in on_stack:
+                    low[v] = min(low[v], index[w])
+            else:
+                work.pop()
+                if work:
+                    low[work[-1][0]] = min(low[work[-1][0]], low[v])
+                if low[v] == index[v]:
+                    scc = []
+                    while True:
+                        w = stack.pop(); on_stack.discard(w); scc.append(w)
+                        if w == v:
+                            break
+                    if len(scc) > 1 or v in nodes[v].edges:
+                        result.update(scc)
+    return result
+
+def attempt_outcome(failure_prob: float, max_retries: int) -> Tuple[float, float]:
+    """(P(all attempts fail), E[retries]) for one visit, mirroring simulate_run."""
+    f, r = failure_prob, max_retries
+    p_fail = f ** (r + 1)
+    exp_retries = sum(k * f ** k * (1.0 - f) for k in range(r + 1)) + r * p_fail
+    return p_fail, exp_retries
+
+# ---------- Solver ----------
+def solve(nodes: Dict, start: str, step_cap: int) -> Dict:
+    """Exact harness tally (expected counts for a single run) plus state count."""
+    for nid, n in nodes.items():
+        for tgt in n.edges:
+            if tgt not in nodes:
+                raise KeyError(f"node {nid!r} has an edge to unknown node {tgt!r}")
+
+    tracked = sorted(cyclic_nodes(nodes))
+    slot = {nid: i for i, nid in enumerate(tracked)}
+
+    def enter(w: str, touched: bool, counts: Tuple[int, ...]):
+        """Entry bookkeeping of simulate_run; None means the loop budget is exceeded."""
+        limit = nodes[w].loop_max_iters
+        if w not in slot:
+            return None if limit is not None and 1 > limit else (w, touched, counts)
+        seen = counts[slot[w]] + 1
+        if limit is not None and seen > limit:
+            return None
+        touched = touched or seen > 1
+        c = list(counts)
+        c[slot[w]] = seen if limit is not None else min(seen, 1)
+        if touched:
+            # Once a loop is recorded, unbudgeted counters no longer matter.
+            c = [x if nodes[tracked[i]].loop_max_iters is not None else 0 for i, x in enumerate(c)]
+        return (w, touched, tuple(c))
+
+    tally = {"runs": 1.0, "failures": 0.0, "timeouts": 0.0, "loops": 0.0, "retries": 0.0,
+             "successes": 0.0, "steps_success": 0.0, "steps_failure": 0.0,
+             "gg_handoffs": 0.0, "gg_errors": 0.0}
+    if step_cap < 1:
+        tally.update(failures=1.0, timeouts=1.0)
+        return {**tally, "states": 0}
+    first = enter(start, False, (0,) * len(tracked))
+    if first is None:
+        tally.update(failures=1.0, loops=1.0, steps_failure=1.0)
+        return {**tally, "states": 0}
+
+    # Enumerate reachable transient states and their outgoing probabilities.
+    states = {first: 0}
+    order = [first]
+    rows: List[int] = []; cols: List[int] = []; vals: List[float] = []
+    p_success: List[float] = []; p_fail: List[float] = []; p_budget: List[float] = []
+    p_cont: List[float] = []; e_retries: List[float] = []; e_gg: List[float] = []
+    touched_flags: List[bool] = []
+    outcome = {nid: attempt_outcome(n.failure_prob, n.max_retries) for nid, n in nodes.items()}
+    i = 0
+    while i < len(order):
+        v, touched, counts = order[i]
+        node = nodes[v]
+        fail, retries = outcome[v]
+        ok = 1.0 - fail
+        deg = len(node.edges)
+        budget = gg = 0.0
+        for w in node.edges:
+            p = ok / deg
+            if node.kind == "generative" and nodes[w].kind == "generative":
+                gg += p
+            nxt = enter(w, touched, counts)
+            if nxt is None:
+                budget += p
+                continue
+            j = states.get(nxt)
+            if j is None:
+                if len(order) >= MAX_STATES:
+                    raise ValueError(f"more than {MAX_STATES} augmented states; use a sampling engine")
+                j = states[nxt] = len(order)
+                order.append(nxt)
+            rows.append(i); cols.append(j); vals.append(p)
+        p_success.append(ok if deg == 0 else 0.0)
+        p_fail.append(fail)
+        p_budget.append(budget)
+        p_cont.append(ok if deg else 0.0)
+        e_retries.append(retries)
+        e_gg.append(gg)
+        touched_flags.append(touched)
+        i += 1
+
+    S = len(order)
+    rows_a, cols_a, vals_a = np.array(rows, dtype=np.int64), np.array(cols, dtype=np.int64), np.array(vals)
+    succ, fail_v, budget_v = np.array(p_success), np.array(p_fail), np.array(p_budget)
+    cont, retries_v, gg_v = np.array(p_cont), np.array(e_retries), np.array(e_gg)
+    touched_v = np.array(touched_flags, dtype=np.float64)
+
+    # Step-indexed horizon: x[s] = P(executing state s at step t).
+    x = np.zeros(S); x[0] = 1.0
+    for t in range(1, step_cap + 1):
+        xt = x * touched_v
+        tally["retries"] += x @ retries_v
+        tally["gg_handoffs"] += x @ gg_v
+        ps, pf = x @ succ, x @ fail_v
+        tally["successes"] += ps; tally["steps_success"] += t * ps
+        tally["failures"] += pf; tally["steps_failure"] += t * pf
+        tally["loops"] += xt @ succ + xt @ fail_v
+        if t == step_cap:
+            pc = x @ cont
+            tally["failures"] += pc; tally["timeouts"] += pc
+            tally["steps_failure"] += step_cap * pc
+            tally["loops"] += xt @ cont
+            break
+        pb = x @ budget_v
+        tally["failures"] += pb; tally["steps_failure"] += (t + 1) * pb; tally["loops"] += pb
+        x = np.bincount(cols_a, weights=x[rows_a] * vals_a, minlength=S)
+        if not x.any():
+            break
+    return {**tally, "states": S}
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Batched NumPy engine for the AgentBound validation harness.
+
+A graph is compiled once into integer-indexed arrays (CSR adjacency, per-node
+failure/retry/loop parameters) and every run of a block advances in lockstep:
+each loop iteration executes one step for all still-active runs, with retries,
+loop budgets and the step cap handled as boolean masks.
+
+Visit counts (for loop budgets and touched_loop) are kept only for nodes that
+can be visited twice or have a finite loop budget: nodes on a cycle, or with
+`max_iters` set. Blocks shrink (by halving) so that the runs x tracked-nodes
+count matrix stays within VISIT_CELLS on large cyclic graphs.
+
+The random stream differs from the per-run `random.Random(seed + i)` engine, so
+results are statistically equivalent rather than identical; they are exactly
+reproducible for a given seed because block `first` always draws from
+`default_rng([seed, first])`.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List
+
+import numpy as np
+
+from agentbound import strongly_connected_components
+
+# Runs simulated together; also the granularity of the RNG streams.
+BLOCK_RUNS = 4096
+MIN_BLOCK_RUNS = 64
+VISIT_CELLS = 1 << 22           # int32 visit counts per block (16 MB)
+NO_LOOP_LIMIT = np.iinfo(np.int64).max
+
+# ---------- Compiled graph ----------
+@dataclass
+class CompiledGraph:
+    ids: List[str]
+    start: int
+    is_gen: np.ndarray          # bool[n]
+    failure_prob: np.ndarray    # float64[n]
+    max_retries: np.ndarray     # int64[n]
+    loop_max_iters: np.ndarray  # int64[n], NO_LOOP_LIMIT when unset
+    offsets: np.ndarray         # int64[n+1], CSR row pointers into targets
+    targets: np.ndarray         # int64[m]
+    visit_slot: np.ndarray      # int64[n], column in the visit matrix, -1 for nodes visited at most once
+    n_tracked: int
+
+    @property
+    def block_runs(self) -> int:
+        """BLOCK_RUNS halved until the visit matrix fits VISIT_CELLS; always divides BLOCK_RUNS."""
+        block = BLOCK_RUNS
+        while block > MIN_BLOCK_RUNS and block * self.n_tracked > VISIT_CELLS:
+            block //= 2
+        return block
+
+    @property
+    def out_degree(self) -> np.ndarray:
+        return np.diff(self.offsets)
+
+def compile_graph(nodes: Dict, start: str) -> CompiledGraph:
+    """Compile the `load_graph` node dict into flat arrays."""
+    ids = list(nodes)
+    index = {nid: i for i, nid in enumerate(ids)}
+    offsets = [0]
+    targets: List[int] = []
+    for nid in ids:
+        for tgt in nodes[nid].edges:
+            if tgt not in index:
+                raise KeyError(f"node {nid!r} has an edge to unknown node {tgt!r}")
+            targets.append(index[tgt])
+        offsets.append(len(targets))
+    # Only nodes on a cycle can be revisited; those and any node with a loop budget get a visit counter.
+    tracked = [nodes[nid].loop_max_iters is not None for nid in ids]
+    for comp in strongly_connected_components(offsets, targets):
+        v = comp[0]
+        if len(comp) > 1 or v in targets[offsets[v]:offsets[v + 1]]:
+            for v in comp:
+                tracked[v] = True
+    slots = np.cumsum(tracked) - 1
+    return CompiledGraph(
+        ids=ids,
+        start=index[start],
+        is_gen=np.array([nodes[i].kind == "generative" for i in ids], dtype=bool),
+        failure_prob=np.array([nodes[i].failure_prob for i in ids], dtype=np.float64),
+        max_retries=np.array([nodes[i].max_retries for i in ids], dtype=np.int64),
+        loop_max_iters=np.array(
+            [NO_LOOP_LIMIT if nodes[i].loop_max_iters is None else nodes[i].loop_max_iters for i in ids],
+            dtype=np.int64,
+        ),
+        offsets=np.array(offsets, dtype=np.int64),
+        targets=np.array(targets, dtype=np.int64),
+        visit_slot=np.where(tracked, slots, -1).astype(np.int64),
+        n_tracked=int(sum(tracked)),
+    )
+
+# ---------- Simulation ----------
+def simulate_block(cg: CompiledGraph, step_cap: int, seed: int, first: int, count: int) -> Dict[str, int]:
+    """Simulate runs [first, first + count) and return a harness tally."""
+    rng = np.random.default_rng([seed, first])
+    deg_all = cg.out_degree
+    max_attempts = int(cg.max_retries.max()) + 1 if len(cg.ids) else 1
+
+    rows = np.arange(count)                       # row of each active run in `visits`
+    cur = np.full(count, cg.start, dtype=np.int64)
+    retries = np.zeros(count, dtype=np.int64)
+    touched = np.zeros(count, dtype=bool)
+    visits = np.zeros((count, cg.n_tracked), dtype=np.int32)
+
+    t = {"runs": count, "failures": 0, "timeouts": 0, "loops": 0, "retries": 0,
+         "successes": 0, "steps_success": 0, "steps_failure": 0,
+         "gg_handoffs": 0, "gg_errors": 0}
+
+    step = 0
+    while rows.size:
+        step += 1
+        k = rows.size
+        if step > step_cap:
+            t["failures"] += k
+            t["timeouts"] += k
+            t["loops"] += int(touched.sum())
+            t["retries"] += int(retries.sum())
+            t["steps_failure"] += k * step_cap
+            break
+
+        # Loop budget (untracked nodes are never revisited, so they are on their first visit)
+        slot = cg.visit_slot[cur]
+        tr = slot >= 0
+        seen = np.ones(k, dtype=np.int32)
+        if tr.any():
+            vr, vs = rows[tr], slot[tr]
+            visits[vr, vs] += 1
+            seen[tr] = visits[vr, vs]
+        over_budget = seen > cg.loop_max_iters[cur]
+        touched |= over_budget | (seen > 1)
+
+        # Attempts + retries: first successful attempt within max_retries + 1
+        allowed = cg.max_retries[cur] + 1
+        ok = rng.random((k, max_attempts)) >= cg.failure_prob[cur][:, None]
+        first_ok = np.where(ok.any(axis=1), ok.argmax(axis=1), max_attempts)
+        succeeded = first_ok < allowed
+        retries += np.where(over_budget, 0, np.where(succeeded, first_ok, allowed - 1))
+
+        # Advance
+        deg = deg_all[cur]
+        failed = over_budget | ~succeeded
+        finished_ok = ~failed & (deg == 0)
+        moving = ~failed & (deg > 0)
+        pick = cg.offsets[cur] + (rng.random(k) * deg).astype(np.int64)
+        nxt = cg.targets[np.where(moving, pick, 0)] if cg.targets.size else cur
+
+        for mask, count_key, steps_key in ((failed, "failures", "steps_failure"),
+                                           (finished_ok, "successes", "steps_success")):
+            n = int(mask.sum())
+            if n:
+                t[count_key] += n
+                t[steps_key] += n * step
+                t["loops"] += int(touched[mask].sum())
+                t["retries"] += int(retries[mask].sum())
+        t["gg_handoffs"] += int((moving & cg.is_gen[cur] & cg.is_gen[nxt]).sum())
+
+        rows, cur = rows[moving], nxt[moving]
+        retries, touched = retries[moving], touched[moving]
+    return t
+
+def simulate_runs(cg: CompiledGraph, runs: int, seed: int, step_cap: int, first: int = 0) -> Dict[str, int]:
+    """Simulate `runs` runs starting at run index `first`, block by block."""
+    tally = None
+    block_runs = cg.block_runs
+    for start in range(first, first + runs, block_runs):
+        count = min(block_runs, first + runs - start)
+        block = simulate_block(cg, step_cap, seed, start, count)
+        tally = block if tally is None else {k: tally[k] + block[k] for k in tally}
+    return tally or simulate_block(cg, step_cap, seed, first, 0)
@@ -26,6 +26,21 @@ def ranks(vals):
         i = j+1
     return r
 
+def correlation(X, Y):
+    """(pearson, spearman, intercept, slope) of Y against X."""
+    mx, my = mean(X), mean(Y); sx, sy = std(X), std(Y)
+    cov = sum((x-mx)*(y-my) for x,y in zip(X,Y)) / max(1, len(X)-1)
+    pearson = cov / (sx*sy) if sx>0 and sy>0 else float("nan")
+    rx, ry = ranks(X), ranks(Y)
+    mrx, mry = mean(rx), mean(ry)
+    srx = std(rx); sry = std(ry)
+    covr = sum((a-mrx)*(b-mry) for a,b in zip(rx,ry)) / max(1, len(rx)-1)
+    spearman = covr / (srx*sry) if srx>0 and sry>0 else float("nan")
+
+    b = cov / (sx*sx) if sx>0 else 0.0
+    a = my - b*mx
+    return pearson, spearman, a, b
+
 def load_family_map(cfg_path: Path):
     if cfg_path.exists():
         return json.loads(cfg_path.read_text())
@@ -119,17 +134,7 @@ def main():
     fams = [family_for(n, fam_map) for n in names]
 
     # correlations/regression use the chosen Y series
-    mx, my = mean(X), mean(Yvals); sx, sy = std(X), std(Yvals)
-    cov = sum((x-mx)*(y-my) for x,y in zip(X,Yvals)) / max(1, len(X)-1)
-    pearson = cov / (sx*sy) if sx>0 and sy>0 else float("nan")
-    rx, ry = ranks(X), ranks(Yvals)
-    mrx, mry = mean(rx), mean(ry)
-    srx = std(rx); sry = std(ry)
-    covr = sum((a-mrx)*(b-mry) for a,b in zip(rx,ry)) / max(1, len(rx)-1)
-    spearman = covr / (srx*sry) if srx>0 and sry>0 else float("nan")
-
-    b = cov / (sx*sx) if sx>0 else 0.0
-    a = my - b*mx
+    pearson, spearman, a, b = correlation(X, Yvals)
 
     print("Points:")
     for n,x,y in zip(names,X,Yvals):
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Content-addressed result cache shared by run_harness.py and compute_metrics.py.
+
+Entries are small JSON files named by the SHA-256 of a canonical JSON payload
+(graph content digest plus every parameter that affects the result), so an
+edited graph or a changed parameter is simply a miss. Writes go through a
+temporary file and `os.replace`, which keeps concurrent invocations safe: a
+reader sees either the old entry, the new one, or nothing.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+DEFAULT_CACHE_DIR = "validation/.cache"
+
+def canonical_json(obj) -> str:
+    return json.dumps(obj, sort_keys=True, separators=(",", ":"))
+
+def graph_digest(path: Path) -> str:
+    """Hash of the parsed graph, so whitespace and key order do not matter."""
+    return hashlib.sha256(canonical_json(json.loads(Path(path).read_text())).encode()).hexdigest()
+
+class ResultCache:
+    def __init__(self, root: Path, namespace: str):
+        self.dir = Path(root) / namespace
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(payload: Dict) -> str:
+        return hashlib.sha256(canonical_json(payload).encode()).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.dir / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Dict]:
+        p = self._path(key)
+        try:
+            value = json.loads(p.read_text())
+            os.utime(p)  # mark as recently used for age-based eviction
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return value
+
+    def put(self, key: str, value: Dict) -> None:
+        p = self._path(key)
+        p.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=p.parent, prefix=".tmp-", suffix=".json")
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.write(json.dumps(value))
+            os.replace(tmp, p)
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+
+    def evict(self, max_bytes: Optional[int] = None, max_age_days: Optional[float] = None) -> int:
+        """Drop entries unused for `max_age_days`, then least recently used ones beyond `max_bytes`."""
+        entries = []
+        for p in self.dir.glob("*/*.json"):
+            try:
+                st = p.stat()
+            except OSError:
+                continue  # removed by a concurrent eviction
+            entries.append((st.st_mtime, st.st_size, p))
+        entries.sort()
+        removed = 0
+        now = time.time()
+        total = sum(size for _, size, _ in entries)
+        for mtime, size, p in entries:
+            too_old = max_age_days is not None and now - mtime > max_age_days * 86400
+            too_big = max_bytes is not None and total > max_bytes
+            if not (too_old or too_big):
+                continue
+            try:
+                p.unlink()
+                removed += 1
+            except OSError:
+                pass
+            total -= size
+        return removed
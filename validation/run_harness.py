@@ -5,11 +5,22 @@ AgentBound validation harness (simulator)
 
 import argparse
 import json
+import math
+import os
 import random
+import sys
 import time
 from dataclasses import dataclass, asdict
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Tuple
+
+from compute_metrics import wilson_interval  # also puts the repo root on sys.path
+from agentbound_ir import KIND_CODES, read_ir
+from result_cache import DEFAULT_CACHE_DIR, ResultCache, graph_digest
+
+# Part of every harness cache key: bump it whenever the simulated model or the summary schema changes.
+# v1 latency/token cost/backoff model, v2 fanout/join/pool validation, v3 sensitivity tallies.
+HARNESS_VERSION = "v3"
 
 # ---------- Defaults (overridable via CLI/config) ----------
 DEFAULTS = {
@@ -17,8 +28,22 @@ DEFAULTS = {
     "global_seed": 42,
     "step_cap": 200,
     "default_failure_prob": {"generative": 0.12, "deterministic": 0.02},
+    # Latency/cost model (python engine); off unless a graph or config declares latency, tokens or backoff.
+    "retry_backoff": "fixed",          # fixed | exponential
+    "retry_backoff_ms": 0,
+    "retry_backoff_max_ms": 30000,
+    "retry_jitter": "none",            # none | full | equal
+    "default_latency_ms": {},          # by kind, same forms as __harness.latency_ms
+    "default_tokens": {},              # by kind: {"input": n, "output": n} per call
+    "token_price_per_1k": {"input": 0.0, "output": 0.0},
+    # Discrete-event mode only (des_sim.py): shared call pools and which pool each kind uses.
+    "pools": {},                       # name: {"concurrency": n, "rate_per_s": r, "burst": b}
+    "default_pool": {},                # by kind: pool name
 }
 
+TIMING_DEFAULTS = ("retry_backoff", "retry_backoff_ms", "retry_backoff_max_ms", "retry_jitter",
+                   "default_latency_ms", "default_tokens", "token_price_per_1k")
+
 # ---------- Data structures ----------
 @dataclass
 class Node:
@@ -28,6 +53,13 @@ class Node:
     failure_prob: Optional[float] = None
     max_retries: int = 0
     loop_max_iters: Optional[int] = None
+    latency: Optional[Tuple] = None         # compiled by latency_spec
+    backoff: Tuple = ("fixed", 0.0, 0.0, "none")  # (policy, base_ms, max_ms, jitter)
+    tokens: int = 0                         # per attempt, input + output
+    call_cost: float = 0.0                  # per attempt
+    fanout: str = "one"                     # "all" runs every successor in parallel (des_sim.py only)
+    join: Optional[str] = None              # "all" | "any": merge parallel branches (des_sim.py only)
+    pool: Optional[str] = None              # shared concurrency/rate pool (des_sim.py only)
 
 @dataclass
 class RunStats:
@@ -39,24 +71,130 @@ class RunStats:
     touched_loop: bool
     handoffs: List[Dict]  # [{from_kind, to_kind, ok}]
     path: List[str]
+    latency_ms: float = 0.0  # attempts + backoff waits, only with the latency/cost model
+    tokens: int = 0
+    cost: float = 0.0
+    attempts: Optional[List[Tuple]] = None  # [(node, failed attempts, succeeded, retries so far)] with --sensitivity
+
+# ---------- Latency and cost ----------
+LATENCY_DISTS = ("fixed", "uniform", "exponential", "lognormal")
+BACKOFF_POLICIES = ("fixed", "exponential")
+JITTER_MODES = ("none", "full", "equal")
+FANOUT_MODES = ("one", "all")
+JOIN_MODES = ("all", "any")
+Z95 = 1.6448536269514722
+
+def latency_spec(spec) -> Optional[Tuple]:
+    """Compile a `latency_ms` entry: a number (fixed) or {"dist": ..., params} -> (dist, a, b)."""
+    if spec is None:
+        return None
+    if isinstance(spec, (int, float)):
+        return ("fixed", float(spec), 0.0)
+    dist = spec.get("dist", "fixed")
+    if dist == "fixed":
+        return ("fixed", float(spec["value"]), 0.0)
+    if dist == "uniform":
+        return ("uniform", float(spec["min"]), float(spec["max"]))
+    if dist == "exponential":
+        return ("exponential", 1.0 / float(spec["mean"]), 0.0)
+    if dist == "lognormal":
+        median = float(spec["median"])
+        sigma = float(spec["sigma"]) if "sigma" in spec else math.log(float(spec["p95"]) / median) / Z95
+        return ("lognormal", math.log(median), sigma)
+    raise ValueError(f"unknown latency dist {dist!r} (expected one of {', '.join(LATENCY_DISTS)})")
+
+def draw_latency(spec: Tuple, rng: random.Random) -> float:
+    dist, a, b = spec
+    if dist == "fixed":
+        return a
+    if dist == "uniform":
+        return rng.uniform(a, b)
+    if dist == "exponential":
+        return rng.expovariate(a)
+    return rng.lognormvariate(a, b)
+
+def backoff_spec(policy: Dict, defaults=DEFAULTS) -> Tuple:
+    kind = policy.get("backoff", defaults["retry_backoff"])
+    jitter = policy.get("jitter", defaults["retry_jitter"])
+    if kind not in BACKOFF_POLICIES:
+        raise ValueError(f"unknown retry backoff {kind!r} (expected one of {', '.join(BACKOFF_POLICIES)})")
+    if jitter not in JITTER_MODES:
+        raise ValueError(f"unknown retry jitter {jitter!r} (expected one of {', '.join(JITTER_MODES)})")
+    return (kind, float(policy.get("base_ms", defaults["retry_backoff_ms"])),
+            float(policy.get("max_ms", defaults["retry_backoff_max_ms"])), jitter)
+
+def backoff_delay(backoff: Tuple, retry: int, rng: random.Random) -> float:
+    """Wait before retry number `retry` (1-based)."""
+    kind, base, cap, jitter = backoff
+    d = base if kind == "fixed" else min(cap, base * 2 ** (retry - 1))
+    if jitter == "full":
+        return rng.uniform(0.0, d)
+    if jitter == "equal":
+        return d / 2 + rng.uniform(0.0, d / 2)
+    return d
+
+def is_timed(nodes: Dict[str, "Node"]) -> bool:
+    """Whether any node contributes latency or cost, i.e. whether runs need a clock."""
+    return any(n.latency is not None or n.tokens or n.call_cost or (n.max_retries and n.backoff[1])
+               for n in nodes.values())
+
+def percentile(sorted_vals: List[float], q: float) -> float:
+    """Linearly interpolated percentile (q in 0..100) of an already sorted list."""
+    if not sorted_vals:
+        return 0.0
+    pos = (len(sorted_vals) - 1) * q / 100
+    lo = int(pos)
+    hi = min(lo + 1, len(sorted_vals) - 1)
+    return sorted_vals[lo] + (sorted_vals[hi] - sorted_vals[lo]) * (pos - lo)
+
+def distribution(vals: List[float]) -> Dict[str, float]:
+    vals = sorted(vals)
+    return {"p50": round(percentile(vals, 50), 6), "p95": round(percentile(vals, 95), 6),
+            "p99": round(percentile(vals, 99), 6), "mean": round(sum(vals) / len(vals), 6) if vals else 0.0}
 
 # ---------- Loader ----------
+def harness_kind(raw: Dict) -> str:
+    return (raw.get("kind") or "generative").lower()
+
 def load_graph(path: Path, defaults=DEFAULTS) -> Tuple[Dict[str, Node], str]:
-    data = json.loads(Path(path).read_text())
+    # Streamed into the shared GraphIR; kinds outside the scorer's three are kept as written.
+    ir = read_ir(path, lambda raw: harness_kind(raw) if harness_kind(raw) in KIND_CODES else "aux",
+                 attrs={"kind": harness_kind, "harness": lambda raw: raw.get("__harness", {}) or {}})
+    if not ir.n:
+        raise ValueError(f"{path}: graph has no nodes")
+    if ir.dangling:
+        a, b = ir.dangling[0]
+        raise ValueError(f"node {a!r} has an edge to unknown node {b!r}")
+    ids = ir.ids
+    prices = defaults["token_price_per_1k"]
     nodes: Dict[str, Node] = {}
-    for raw in data["nodes"]:
-        edges = list(raw.get("edges") or [])
-        h = raw.get("__harness", {}) or {}
-        node = Node(
-            id=raw["id"],
-            kind=(raw.get("kind") or "generative").lower(),
-            edges=edges,
+    for v, nid in enumerate(ids):
+        h = ir.attrs["harness"][v]
+        kind = ir.attrs["kind"][v]
+        retry = h.get("retry_policy", {})
+        tok = h.get("tokens", defaults["default_tokens"].get(kind)) or {}
+        price = {**prices, **h.get("token_price_per_1k", {})}
+        nodes[nid] = Node(
+            id=nid,
+            kind=kind,
+            edges=[ids[t] for t in ir.successors(v)],
             failure_prob=h.get("failure_prob"),
-            max_retries=int(h.get("retry_policy", {}).get("max_retries", 0)),
+            max_retries=int(retry.get("max_retries", 0)),
             loop_max_iters=h.get("loop_policy", {}).get("max_iters"),
+            latency=latency_spec(h.get("latency_ms", defaults["default_latency_ms"].get(kind))),
+            backoff=backoff_spec(retry, defaults),
+            tokens=int(tok.get("input", 0)) + int(tok.get("output", 0)),
+            call_cost=(tok.get("input", 0) * price.get("input", 0.0)
+                       + tok.get("output", 0) * price.get("output", 0.0)) / 1000,
+            fanout=h.get("fanout", "one"),
+            join=h.get("join"),
+            pool=h.get("pool", defaults["default_pool"].get(kind)),
         )
-        nodes[node.id] = node
-    start = data.get("start_node") or data["nodes"][0]["id"]
+        if nodes[nid].fanout not in FANOUT_MODES or nodes[nid].join not in (None, *JOIN_MODES):
+            raise ValueError(f"node {nid!r}: fanout must be one of {FANOUT_MODES}, join one of {JOIN_MODES}")
+    start = ir.meta.get("start_node") or ids[0]
+    if start not in nodes:
+        raise ValueError(f"start node {start!r} is not a node of the graph")
     # Fill missing failure_prob with defaults by kind
     for n in nodes.values():
         if n.failure_prob is None:
@@ -77,20 +215,31 @@ def simulate_run(
     start_node: str,
     step_cap: int,
     seed: int,
+    timed: bool = False,
+    track: bool = False,
 ) -> RunStats:
     rng = random.Random(seed)
+    # Latency draws use their own stream, so outcomes match untimed runs with the same seed.
+    clock_rng = random.Random(f"latency:{seed}") if timed else None
+    latency = cost = 0.0
+    tokens = 0
     retries_total = 0
     steps = 0
     visited_counts: Dict[str, int] = {}
     touched_loop = False
     handoffs: List[Dict] = []
     path: List[str] = []
+    attempts: Optional[List[Tuple]] = [] if track else None
+
+    def end(success: bool, timeout: bool, steps: int, touched: bool) -> RunStats:
+        return RunStats(seed, success, timeout, retries_total, steps, touched, handoffs, path, latency, tokens, cost,
+                        attempts)
 
     current_id = start_node
     while True:
         steps += 1
         if steps > step_cap:
-            return RunStats(seed, False, True, retries_total, step_cap, touched_loop, handoffs, path)
+            return end(False, True, step_cap, touched_loop)
 
         node = nodes[current_id]
         path.append(current_id)
@@ -98,7 +247,7 @@ def simulate_run(
         # Loop budget
         visited_counts[current_id] = visited_counts.get(current_id, 0) + 1
         if node.loop_max_iters is not None and visited_counts[current_id] > node.loop_max_iters:
-            return RunStats(seed, False, False, retries_total, steps, True, handoffs, path)
+            return end(False, False, steps, True)
         if visited_counts[current_id] > 1:
             touched_loop = True
 
@@ -106,54 +255,97 @@ def simulate_run(
         attempts_left = node.max_retries + 1
         succeeded = False
         while attempts_left > 0:
+            if timed:
+                if attempts_left <= node.max_retries:
+                    latency += backoff_delay(node.backoff, node.max_retries + 1 - attempts_left, clock_rng)
+                if node.latency is not None:
+                    latency += draw_latency(node.latency, clock_rng)
+                tokens += node.tokens
+                cost += node.call_cost
             if attempt_node(node, rng):
                 succeeded = True
                 break
             attempts_left -= 1
             if attempts_left > 0:
                 retries_total += 1
+        if track:
+            attempts.append((current_id, node.max_retries + 1 - attempts_left, succeeded, retries_total))
         if not succeeded:
-            return RunStats(seed, False, False, retries_total, steps, touched_loop, handoffs, path)
+            return end(False, False, steps, touched_loop)
 
         # Advance
         next_id = choose_next(node, rng)
         if next_id is None:
-            return RunStats(seed, True, False, retries_total, steps, touched_loop, handoffs, path)
+            return end(True, False, steps, touched_loop)
 
         to_node = nodes[next_id]
         handoffs.append({"from_kind": node.kind, "to_kind": to_node.kind, "ok": True})
         current_id = next_id
 
 # ---------- Aggregation ----------
-def summarize_runs(runs: List[RunStats]) -> Dict:
-    n = len(runs)
-    failure_runs = [r for r in runs if not r.success]
-    timeout_runs = [r for r in runs if r.timeout]
-    loop_runs = [r for r in runs if r.touched_loop]
-
-    def mean(xs: List[float]) -> float:
-        return sum(xs) / len(xs) if xs else 0.0
-
-    retries_mean = mean([r.retries for r in runs])
-    steps_success = mean([r.steps for r in runs if r.success])
-    steps_failure = mean([r.steps for r in runs if not r.success])
+def tally_runs(runs: List[RunStats], timed: bool = False) -> Dict[str, int]:
+    """Reduce runs to the additive counters that summarize_tally needs.
 
-    gg_events = 0
+    Timed runs add per-success latency/cost samples (lists, concatenated by
+    merge_tallies) for the percentiles, and spend totals over all runs.
+    """
     gg_total = 0
+    gg_errors = 0
     for r in runs:
         for h in r.handoffs:
             if h["from_kind"] == "generative" and h["to_kind"] == "generative":
                 gg_total += 1
-                gg_events += (0 if h.get("ok", True) else 1)
-    handoff_error_rate = (gg_events / gg_total) if gg_total else 0.0
-
-    failure_rate = len(failure_runs) / n if n else 0.0
-    loop_rate = len(loop_runs) / n if n else 0.0
-    timeout_rate = len(timeout_runs) / n if n else 0.0
-
-    brittleness = 0.6 * failure_rate + 0.2 * loop_rate + 0.2 * min(1.0, retries_mean / 2.0)
-
-    return {
+                gg_errors += (0 if h.get("ok", True) else 1)
+    tally = {
+        "runs": len(runs),
+        "failures": sum(1 for r in runs if not r.success),
+        "timeouts": sum(1 for r in runs if r.timeout),
+        "loops": sum(1 for r in runs if r.touched_loop),
+        "retries": sum(r.retries for r in runs),
+        "successes": sum(1 for r in runs if r.success),
+        "steps_success": sum(r.steps for r in runs if r.success),
+        "steps_failure": sum(r.steps for r in runs if not r.success),
+        "gg_handoffs": gg_total,
+        "gg_errors": gg_errors,
+    }
+    if timed:
+        tally["latency_success"] = [r.latency_ms for r in runs if r.success]
+        tally["cost_success"] = [r.cost for r in runs if r.success]
+        tally["tokens_total"] = sum(r.tokens for r in runs)
+        tally["cost_total"] = sum(r.cost for r in runs)
+    return tally
+
+def merge_tallies(a: Dict, b: Dict) -> Dict:
+    out = {}
+    for k in {**a, **b}:
+        if k not in a or k not in b:
+            out[k] = a[k] if k in a else b[k]
+        elif isinstance(a[k], dict):
+            out[k] = merge_tallies(a[k], b[k])
+        else:
+            out[k] = a[k] + b[k]
+    return out
+
+def brittleness_index(failure_rate: float, loop_rate: float, retries_mean: float) -> float:
+    return 0.6 * failure_rate + 0.2 * loop_rate + 0.2 * min(1.0, retries_mean / 2.0)
+
+def summarize_tally(t: Dict) -> Dict:
+    n = t["runs"]
+    n_success = t["successes"]
+    n_failure = t["failures"]
+
+    retries_mean = t["retries"] / n if n else 0.0
+    steps_success = t["steps_success"] / n_success if n_success else 0.0
+    steps_failure = t["steps_failure"] / n_failure if n_failure else 0.0
+    handoff_error_rate = (t["gg_errors"] / t["gg_handoffs"]) if t["gg_handoffs"] else 0.0
+
+    failure_rate = n_failure / n if n else 0.0
+    loop_rate = t["loops"] / n if n else 0.0
+    timeout_rate = t["timeouts"] / n if n else 0.0
+
+    brittleness = brittleness_index(failure_rate, loop_rate, retries_mean)
+
+    summary = {
         "runs": n,
         "failure_rate": round(failure_rate, 6),
         "avg_retries": round(retries_mean, 6),
@@ -164,12 +356,263 @@ def summarize_runs(runs: List[RunStats]) -> Dict:
         "handoff_error_rate": round(handoff_error_rate, 6),
         "brittleness_index": round(brittleness, 6),
     }
+    if "latency_success" in t:
+        # End-to-end latency and spend of successful runs; cost_per_success also pays for the failed ones.
+        summary["latency_ms"] = distribution(t["latency_success"])
+        summary["cost_success_run"] = distribution(t["cost_success"])
+        summary["cost_per_success"] = round(t["cost_total"] / n_success, 6) if n_success else None
+        summary["tokens_per_run"] = round(t["tokens_total"] / n, 3) if n else 0.0
+    return summary
+
+def summarize_runs(runs: List[RunStats]) -> Dict:
+    return summarize_tally(tally_runs(runs))
+
+# ---------- Sensitivity ----------
+# Per-node sums over runs, merged like the tally. `score` is d/dp log P(run) for the node's
+# failure_prob p: failed attempts / p - successful attempts / (1 - p).
+SENS_SUMS = ("score", "score2", "y_score", "y_score2", "loops_score", "retries_score",
+             "exhausted", "exhausted_loops", "cont_visits", "cont_success", "cont_loops", "cont_retries")
+
+def tally_sensitivity(runs: List[RunStats], nodes: Dict[str, Node]) -> Dict[str, Dict[str, float]]:
+    acc: Dict[str, Dict[str, float]] = {}
+    for r in runs:
+        y = 0 if r.success else 1
+        score: Dict[str, float] = {}
+        for v, fails, ok, retries in r.attempts:
+            p = nodes[v].failure_prob
+            score[v] = score.get(v, 0.0) + (fails / p if fails else 0.0) - (1 / (1 - p) if ok else 0.0)
+            a = acc.get(v) or acc.setdefault(v, dict.fromkeys(SENS_SUMS, 0))
+            if ok:
+                # What the rest of a run looks like once this node succeeds (for the extra-retry estimate).
+                a["cont_visits"] += 1
+                a["cont_success"] += 1 - y
+                a["cont_loops"] += r.touched_loop
+                a["cont_retries"] += r.retries - retries
+            else:
+                a["exhausted"] += 1
+                a["exhausted_loops"] += r.touched_loop
+        for v, sv in score.items():
+            a = acc[v]
+            a["score"] += sv
+            a["score2"] += sv * sv
+            a["y_score"] += y * sv
+            a["y_score2"] += y * sv * sv
+            a["loops_score"] += r.touched_loop * sv
+            a["retries_score"] += r.retries * sv
+    return acc
+
+def sensitivity_table(acc: Dict[str, Dict[str, float]], nodes: Dict[str, Node], tally: Dict) -> List[Dict]:
+    """Per-node rows ranked by d(failure_rate)/d(failure_prob).
+
+    Derivatives are score-function (likelihood-ratio) estimates with the mean as
+    baseline. The +1 retry deltas assume a run that exhausted its attempts at
+    the node would, if the extra attempt succeeds (prob. 1 - p), continue like
+    the observed runs after a successful visit to that node.
+    """
+    n = tally["runs"]
+    if not n:
+        return []
+    F, L, R = tally["failures"] / n, tally["loops"] / n, tally["retries"] / n
+    base = brittleness_index(F, L, R)
+    rows = []
+    for v, a in acc.items():
+        node = nodes[v]
+        p = node.failure_prob
+        d_f = (a["y_score"] - F * a["score"]) / n
+        var = (a["y_score2"] * (1 - 2 * F) + F * F * a["score2"]) / n - d_f * d_f
+        d_l = (a["loops_score"] - L * a["score"]) / n
+        d_r = (a["retries_score"] - R * a["score"]) / n
+        d_b = 0.6 * d_f + 0.2 * d_l + (0.1 * d_r if R < 2.0 else 0.0)
+        row = {"node": v, "kind": node.kind, "failure_prob": p, "max_retries": node.max_retries,
+               "d_failure_rate_d_failure_prob": round(d_f, 6), "se": round(math.sqrt(max(var, 0.0) / n), 6),
+               "d_brittleness_d_failure_prob": round(d_b, 6),
+               "delta_failure_rate_retry": None, "delta_brittleness_retry": None}
+        if a["cont_visits"]:
+            carry = a["exhausted"] * (1 - p) / n
+            dF = -carry * a["cont_success"] / a["cont_visits"]
+            dL = carry * a["cont_loops"] / a["cont_visits"] - a["exhausted_loops"] * (1 - p) / n
+            dR = a["exhausted"] / n + carry * a["cont_retries"] / a["cont_visits"]
+            row["delta_failure_rate_retry"] = round(dF, 6)
+            row["delta_brittleness_retry"] = round(brittleness_index(F + dF, L + dL, R + dR) - base, 6)
+        rows.append(row)
+    rows.sort(key=lambda r: (-r["d_failure_rate_d_failure_prob"], r["node"]))
+    for i, r in enumerate(rows, 1):
+        r["rank"] = i
+    return rows
+
+def format_sensitivity(rows: List[Dict], top: int = 5) -> str:
+    lines = [f"    {'#':>2s} {'node':<24s} {'p':>6s} {'dF/dp':>9s} {'±se':>8s} {'dB/dp':>9s} {'ΔF +1 retry':>12s}"]
+    for r in rows[:top]:
+        retry = f"{r['delta_failure_rate_retry']:>12.4f}" if r["delta_failure_rate_retry"] is not None else f"{'-':>12s}"
+        lines.append(f"    {r['rank']:>2d} {r['node'][:24]:<24s} {r['failure_prob']:>6.3f} "
+                     f"{r['d_failure_rate_d_failure_prob']:>9.4f} {r['se']:>8.4f} "
+                     f"{r['d_brittleness_d_failure_prob']:>9.4f} {retry}")
+    return "\n".join(lines)
 
 # ---------- IO helpers ----------
+def load_config(path: Path) -> Dict:
+    """DEFAULTS overlaid with a YAML (or .json) config such as validation/config.yaml."""
+    text = path.read_text()
+    if path.suffix == ".json":
+        cfg = json.loads(text)
+    else:
+        try:
+            import yaml
+        except ImportError:
+            raise SystemExit("A YAML --config needs PyYAML (pip install pyyaml); or pass a .json config")
+        cfg = yaml.safe_load(text) or {}
+    unknown = sorted(set(cfg) - set(DEFAULTS))
+    if unknown:
+        raise SystemExit(f"Unknown keys {unknown} in {path}; expected {sorted(DEFAULTS)}")
+    return {**DEFAULTS, **cfg}
+
 def write_json(path: Path, obj) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
     path.write_text(json.dumps(obj, indent=2))
 
+def write_summary(results_dir: Path, graph_path: Path, summary: Dict) -> None:
+    summary_path = results_dir / "summary" / f"{graph_path.stem}.summary.json"
+    write_json(summary_path, {"graph": str(graph_path), **summary})
+
+# ---------- Graph simulation ----------
+# Seed-range granularity for splitting one graph across workers. Must stay a
+# multiple of harness_numpy.BLOCK_RUNS so numpy RNG streams do not depend on it.
+RUN_CHUNK = 16384
+
+def simulate_chunk(
+    graph_path: Path,
+    first: int,
+    count: int,
+    seed: int,
+    step_cap: int,
+    engine: str = "python",
+    write_raw: bool = False,
+    raw_dir: Optional[Path] = None,
+    defaults=DEFAULTS,
+    raw_format: str = "trace",
+    stop: Optional[Callable[[Dict], bool]] = None,
+    batch_runs: int = RUN_CHUNK,
+    profile: Optional[Dict] = None,
+    sensitivity: bool = False,
+) -> Dict:
+    """Tally runs [first, first + count) of one graph (the exact engine ignores the range).
+
+    With `stop`, runs are simulated in batches of `batch_runs` and the range is cut
+    short as soon as `stop(tally_so_far)` returns True. A `profile` dict is filled
+    with stage seconds (load/compile/simulate/raw_write) and raw_bytes. With
+    `sensitivity`, the tally gains per-node sums for sensitivity_table.
+    """
+    clock = time.perf_counter
+    if profile is not None:
+        profile.update(load_s=0.0, compile_s=0.0, simulate_s=0.0, raw_write_s=0.0, raw_bytes=0)
+        t = clock()
+    nodes, start = load_graph(graph_path, defaults)
+    if profile is not None:
+        profile["load_s"] = clock() - t
+    if (write_raw or sensitivity) and engine != "python":
+        raise ValueError("--write-raw and --sensitivity need per-run traces; use --engine python")
+    timed = is_timed(nodes)
+    if timed and engine != "python":
+        print(f"[harness] {graph_path.stem}: latency/cost model needs --engine python; ignored", file=sys.stderr)
+    if engine == "exact":
+        import harness_exact
+        if profile is None:
+            return harness_exact.solve(nodes, start, step_cap)
+        t = clock()
+        tally = harness_exact.solve(nodes, start, step_cap)
+        profile["simulate_s"] = clock() - t
+        return tally
+
+    if engine == "numpy":
+        import harness_numpy
+        if profile is not None:
+            t = clock()
+        compiled = harness_numpy.compile_graph(nodes, start)
+        if profile is not None:
+            profile["compile_s"] = clock() - t
+
+    writer = None
+    if write_raw:
+        raw_dir.mkdir(parents=True, exist_ok=True)
+        if raw_format == "trace":
+            from trace_store import TraceWriter
+            writer = TraceWriter(raw_dir / f"{graph_path.stem}.trace", {n.id: n.kind for n in nodes.values()})
+
+    def run_range(lo: int, n: int) -> Dict:
+        if engine == "numpy":
+            return harness_numpy.simulate_runs(compiled, n, seed, step_cap, lo)
+        run_stats: List[RunStats] = []
+        for i in range(lo, lo + n):
+            rseed = seed + i
+            stats = simulate_run(nodes, start, step_cap, rseed, timed, sensitivity)
+            run_stats.append(stats)
+            if not write_raw:
+                continue
+            if profile is not None:
+                t = clock()
+            if writer is not None:
+                writer.append(stats)
+            else:
+                raw_path = raw_dir / f"{graph_path.stem}_seed{rseed}.json"
+                write_json(raw_path, asdict(stats))
+            if profile is not None:
+                profile["raw_write_s"] += clock() - t
+                if writer is None:
+                    profile["raw_bytes"] += raw_path.stat().st_size
+        tally = tally_runs(run_stats, timed)
+        if sensitivity:
+            tally["sensitivity"] = tally_sensitivity(run_stats, nodes)
+        return tally
+
+    step = batch_runs if stop is not None else max(1, count)
+    if profile is not None:
+        t_sim = clock()
+    try:
+        tally = run_range(first, 0)
+        for lo in range(first, first + count, step):
+            tally = merge_tallies(tally, run_range(lo, min(step, first + count - lo)))
+            if stop is not None and stop(tally):
+                break
+    finally:
+        if writer is not None:
+            if profile is not None:
+                t = clock()
+            writer.close()
+            if profile is not None:
+                profile["raw_write_s"] += clock() - t
+                profile["raw_bytes"] = writer.path.stat().st_size
+    if profile is not None:
+        profile["simulate_s"] = clock() - t_sim - profile["raw_write_s"]
+    return tally
+
+# ---------- Adaptive sampling ----------
+# Binomial rates and the tally counter behind each.
+CI_COUNTERS = {"failure_rate": "failures", "loop_rate": "loops", "timeout_rate": "timeouts"}
+
+def ci_widths(tally: Dict, metrics: List[str]) -> Dict[str, float]:
+    n = tally["runs"]
+    widths = {}
+    for m in metrics:
+        lo, hi = wilson_interval(tally[CI_COUNTERS[m]] / n if n else 0.0, n)
+        widths[m] = hi - lo
+    return widths
+
+def ci_stop(target_width: float, min_runs: int, metrics: List[str]) -> Callable[[Dict], bool]:
+    """Stop rule: at least `min_runs` runs and every 95% Wilson interval narrower than the target."""
+    def stop(tally: Dict) -> bool:
+        if tally["runs"] < min_runs:
+            return False
+        return all(w <= target_width for w in ci_widths(tally, metrics).values())
+    return stop
+
+def summarize_engine_tally(tally: Dict, engine: str) -> Dict:
+    if engine == "exact":
+        # Expected counts for one run: rates are exact, nothing was sampled.
+        tally = dict(tally)
+        states = tally.pop("states")
+        return {**summarize_tally(tally), "runs": 0, "engine": "exact", "states": states}
+    return summarize_tally(tally)
+
 def simulate_graph_file(
     graph_path: Path,
     results_dir: Path,
@@ -179,44 +622,142 @@ def simulate_graph_file(
     write_raw: bool,
     raw_dir: Path,
     defaults=DEFAULTS,
+    engine: str = "python",
 ) -> Dict:
-    nodes, start = load_graph(graph_path, defaults)
-    run_stats: List[RunStats] = []
-    if write_raw:
-        raw_dir.mkdir(parents=True, exist_ok=True)
-
-    for i in range(runs):
-        rseed = seed + i
-        stats = simulate_run(nodes, start, step_cap, rseed)
-        run_stats.append(stats)
-        if write_raw:
-            raw_path = raw_dir / f"{graph_path.stem}_seed{rseed}.json"
-            write_json(raw_path, asdict(stats))
-
-    summary = summarize_runs(run_stats)
-    summary_path = results_dir / "summary" / f"{graph_path.stem}.summary.json"
-    write_json(summary_path, {"graph": str(graph_path), **summary})
+    tally = simulate_chunk(graph_path, 0, runs, seed, step_cap, engine, write_raw, raw_dir, defaults)
+    summary = summarize_engine_tally(tally, engine)
+    write_summary(results_dir, graph_path, summary)
     return summary
 
+# ---------- Parallel execution ----------
+def plan_chunks(runs: int, engine: str, split: bool) -> List[Tuple[int, int]]:
+    """(first, count) seed ranges for one graph; fixed boundaries keep results worker-independent."""
+    if not split or engine == "exact" or runs <= RUN_CHUNK:
+        return [(0, runs)]
+    return [(first, min(RUN_CHUNK, runs - first)) for first in range(0, runs, RUN_CHUNK)]
+
+def _run_task(task: Tuple) -> Dict:
+    graph_path, first, count, kwargs = task
+    kwargs = dict(kwargs)
+    adaptive = kwargs.pop("adaptive", None)
+    if adaptive:
+        kwargs["stop"] = ci_stop(adaptive["target_ci_width"], adaptive["min_runs"], adaptive["metrics"])
+        kwargs["batch_runs"] = adaptive["batch_runs"]
+    if not kwargs.pop("profile", False):
+        return simulate_chunk(graph_path, first, count, **kwargs)
+    # The stage timers ride back from the worker with the tally; main() pops them before merging.
+    prof: Dict = {}
+    tally = simulate_chunk(graph_path, first, count, profile=prof, **kwargs)
+    return {**tally, "profile": prof}
+
+def run_tasks(tasks: List[Tuple], workers: int):
+    """Yield (task index, tally) as tasks finish; a failing graph aborts the whole run."""
+    if workers <= 1:
+        for i, task in enumerate(tasks):
+            try:
+                yield i, _run_task(task)
+            except Exception as e:
+                raise SystemExit(f"[harness] {task[0]} failed: {type(e).__name__}: {e}")
+        return
+
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(_run_task, task): i for i, task in enumerate(tasks)}
+        for fut in as_completed(futures):
+            i = futures[fut]
+            try:
+                result = fut.result()
+            except Exception as e:
+                pool.shutdown(wait=False, cancel_futures=True)
+                raise SystemExit(f"[harness] {tasks[i][0]} failed: {type(e).__name__}: {e}")
+            yield i, result
+
+# ---------- Profiling ----------
+PROFILE_STAGES = ("load_s", "compile_s", "simulate_s", "raw_write_s")
+
+def graph_profile(chunk_profiles: List[Dict], tally: Dict, engine: str) -> Dict:
+    """Per-graph profile: stage seconds summed over chunks, throughput and the counters behind it."""
+    prof = {k: round(sum(c[k] for c in chunk_profiles), 6) for k in PROFILE_STAGES}
+    prof["raw_bytes"] = sum(c["raw_bytes"] for c in chunk_profiles)
+    prof["chunks"] = len(chunk_profiles)
+    if engine == "exact":
+        # Expected counts for one run; nothing was sampled, so there is no throughput.
+        prof["states"] = tally["states"]
+        return prof
+    sim = prof["simulate_s"]
+    steps = tally["steps_success"] + tally["steps_failure"]
+    prof.update(runs=tally["runs"], steps=steps, retries=tally["retries"], step_cap_hits=tally["timeouts"],
+                runs_per_s=round(tally["runs"] / sim, 1) if sim else None,
+                steps_per_s=round(steps / sim, 1) if sim else None)
+    return prof
+
+def profile_totals(graphs: Dict[str, Dict]) -> Dict:
+    sampled = [g for g in graphs.values() if "runs" in g]
+    totals = {k: round(sum(g.get(k, 0) for g in graphs.values()), 6) for k in PROFILE_STAGES}
+    totals["raw_bytes"] = sum(g.get("raw_bytes", 0) for g in graphs.values())
+    for k in ("runs", "steps", "retries", "step_cap_hits"):
+        totals[k] = sum(g[k] for g in sampled)
+    sim = sum(g["simulate_s"] for g in sampled)
+    totals["runs_per_s"] = round(totals["runs"] / sim, 1) if sim else None
+    totals["steps_per_s"] = round(totals["steps"] / sim, 1) if sim else None
+    return totals
+
 # ---------- CLI ----------
 def parse_args():
     p = argparse.ArgumentParser(description="AgentBound validation harness")
     p.add_argument("--graphs", required=True, help="Dir with *.json graphs (recurses).")
     p.add_argument("--results", default="validation/results", help="Output dir for results/")
-    p.add_argument("--runs", type=int, default=DEFAULTS["runs_per_graph"])
-    p.add_argument("--seed", type=int, default=DEFAULTS["global_seed"])
-    p.add_argument("--step-cap", type=int, default=DEFAULTS["step_cap"])
+    p.add_argument("--config", default=None,
+                  help="YAML/JSON defaults (e.g. validation/config.yaml): runs, seed, step cap, failure "
+                       "probabilities, retry backoff, latency/token defaults and token prices.")
+    p.add_argument("--runs", type=int, default=None, help=f"Runs per graph (default {DEFAULTS['runs_per_graph']}).")
+    p.add_argument("--seed", type=int, default=None, help=f"Global seed (default {DEFAULTS['global_seed']}).")
+    p.add_argument("--step-cap", type=int, default=None, help=f"Steps per run (default {DEFAULTS['step_cap']}).")
     p.add_argument("--write-raw", action="store_true",
-                  help="Write per-run JSONs (default: summaries only).")
+                  help="Write per-run traces (default: summaries only).")
     p.add_argument("--raw-dir", default="validation/results/raw_runs",
                   help="Directory for raw run files if --write-raw is set.")
+    p.add_argument("--raw-format", choices=["trace", "json"], default="trace",
+                  help="One compact <graph>.trace file per graph (see trace_store.py) "
+                       "or the legacy one JSON file per seed.")
     p.add_argument("--clean", action="store_true",
-                  help="Delete results dir before running.")   
+                  help="Delete results dir before running.")
+    p.add_argument("--engine", choices=["python", "numpy", "exact"], default="python",
+                  help="Simulation engine: per-run Python loop, batched NumPy arrays, "
+                       "or exact Markov-chain solution (no sampling).")
+    p.add_argument("--workers", type=int, default=1,
+                  help="Worker processes (0 = all cores). Graphs, and seed chunks of large --runs, "
+                       "are distributed across them; summaries do not depend on this.")
+    p.add_argument("--target-ci-width", type=float, default=None,
+                  help="Adaptive sampling: simulate in batches and stop a graph once every 95%% Wilson "
+                       "interval in --ci-metrics is at most this wide (e.g. 0.02).")
+    p.add_argument("--ci-metrics", default="failure_rate",
+                  help=f"Comma-separated rates checked by --target-ci-width ({', '.join(CI_COUNTERS)}).")
+    p.add_argument("--min-runs", type=int, default=200, help="Adaptive sampling: minimum runs per graph.")
+    p.add_argument("--max-runs", type=int, default=None,
+                  help="Adaptive sampling: run budget per graph (default: --runs).")
+    p.add_argument("--batch-runs", type=int, default=500, help="Adaptive sampling: runs between checks.")
+    p.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR,
+                  help="Content-addressed summary cache; unchanged graphs are not re-simulated.")
+    p.add_argument("--no-cache", action="store_true", help="Always simulate and do not update the cache.")
+    p.add_argument("--cache-max-mb", type=float, default=None, help="Evict least recently used entries beyond this size.")
+    p.add_argument("--cache-max-age-days", type=float, default=None, help="Evict entries unused for this long.")
+    p.add_argument("--profile", action="store_true",
+                  help="Write summary/profile.json: stage timers, runs/s and steps/s, retries, "
+                       "step-cap hits and raw-write bytes per graph.")
+    p.add_argument("--sensitivity", action="store_true",
+                  help="Estimate d(failure_rate)/d(failure_prob) and the effect of one more retry for every node "
+                       "from the same runs; adds a ranked `sensitivity` table to each summary (python engine).")
     return p.parse_args()
 
 def main():
     t0 = time.time()
+    clock = time.perf_counter
     args = parse_args()
+    defaults = load_config(Path(args.config)) if args.config else DEFAULTS
+    args.runs = defaults["runs_per_graph"] if args.runs is None else args.runs
+    args.seed = defaults["global_seed"] if args.seed is None else args.seed
+    args.step_cap = defaults["step_cap"] if args.step_cap is None else args.step_cap
     if args.clean:
         if Path(args.results).exists():
             import shutil
@@ -231,31 +772,136 @@ def main():
     if not graph_files:
         raise SystemExit(f"No JSON graphs found under {graphs_root}")
 
+    if args.write_raw and args.engine != "python":
+        raise SystemExit("--write-raw needs per-run traces; use --engine python")
+    if args.sensitivity and args.engine != "python":
+        raise SystemExit("--sensitivity needs per-run traces; use --engine python")
+    workers = args.workers or os.cpu_count() or 1
+
+    adaptive = None
+    runs = args.runs
+    if args.target_ci_width is not None and args.engine != "exact":
+        metrics = [m.strip() for m in args.ci_metrics.split(",") if m.strip()]
+        unknown = [m for m in metrics if m not in CI_COUNTERS]
+        if unknown:
+            raise SystemExit(f"Unknown --ci-metrics {unknown}; choose from {list(CI_COUNTERS)}")
+        runs = args.max_runs or args.runs
+        adaptive = {"target_ci_width": args.target_ci_width, "metrics": metrics,
+                    "min_runs": args.min_runs, "batch_runs": args.batch_runs}
+
+    # One task per (graph, seed range); raw traces and adaptive stopping keep one task per graph.
+    chunk_kwargs = dict(seed=args.seed, step_cap=args.step_cap, engine=args.engine,
+                        write_raw=args.write_raw, raw_dir=raw_dir, raw_format=args.raw_format,
+                        defaults=defaults, adaptive=adaptive, profile=args.profile, sensitivity=args.sensitivity)
+    split = workers > 1 and not args.write_raw and adaptive is None
+
+    # Raw traces are a side effect of simulating, so --write-raw bypasses the cache.
+    cache = None if args.no_cache or args.write_raw else ResultCache(Path(args.cache_dir), "harness")
+    cache_keys: Dict[Path, str] = {}
+    cached: Dict[Path, Dict] = {}
+    stage_s: Dict[str, float] = {}
+    t = clock()
+    if cache is not None:
+        params = {"runs": runs, "seed": args.seed, "step_cap": args.step_cap, "engine": args.engine,
+                  "default_failure_prob": defaults["default_failure_prob"],
+                  "harness_version": HARNESS_VERSION, "adaptive": adaptive, "sensitivity": args.sensitivity}
+        params.update({k: defaults[k] for k in TIMING_DEFAULTS})
+        for g in graph_files:
+            cache_keys[g] = cache.key({"graph": graph_digest(g), **params})
+            hit = cache.get(cache_keys[g])
+            if hit is not None:
+                cached[g] = hit
+    stage_s["cache_lookup_s"] = clock() - t
+
+    tasks = []
+    for g in graph_files:
+        if g in cached:
+            continue
+        for first, count in plan_chunks(runs, args.engine, split):
+            tasks.append((g, first, count, chunk_kwargs))
+
+    tallies: Dict[Path, List[Tuple[int, Dict]]] = {g: [] for g in graph_files}
+    remaining = {g: sum(1 for t in tasks if t[0] == g) for g in graph_files}
+    chunk_profiles: Dict[Path, List[Dict]] = {g: [] for g in graph_files}
+    done = len(cached)
+    t = clock()
+    for i, tally in run_tasks(tasks, workers):
+        g, first = tasks[i][0], tasks[i][1]
+        if args.profile:
+            chunk_profiles[g].append(tally.pop("profile"))
+        tallies[g].append((first, tally))
+        remaining[g] -= 1
+        if remaining[g] == 0:
+            done += 1
+            print(f"[harness] ({done}/{len(graph_files)}) {g.stem}", flush=True)
+    stage_s["tasks_wall_s"] = clock() - t
+
     summaries = {}
+    graph_profiles: Dict[str, Dict] = {}
+    t = clock()
     for g in graph_files:
-        s = simulate_graph_file(
-            graph_path=g,
-            results_dir=results_dir,
-            runs=args.runs,
-            seed=args.seed,
-            step_cap=args.step_cap,
-            write_raw=args.write_raw,
-            raw_dir=raw_dir,
-        )
+        if g in cached:
+            write_summary(results_dir, g, cached[g])
+            summaries[g.stem] = cached[g]
+            graph_profiles[g.stem] = {"cached": True}
+            continue
+        chunks = [c for _, c in sorted(tallies[g], key=lambda c: c[0])]
+        merged = chunks[0]
+        for c in chunks[1:]:
+            merged = merge_tallies(merged, c)
+        if args.profile:
+            graph_profiles[g.stem] = graph_profile(chunk_profiles[g], merged, args.engine)
+        sens = merged.pop("sensitivity", None)
+        s = summarize_engine_tally(merged, args.engine)
+        if sens is not None:
+            s["sensitivity"] = sensitivity_table(sens, load_graph(g, defaults)[0], merged)
+            print(f"[harness] {g.stem} sensitivity (top {min(5, len(s['sensitivity']))}):\n"
+                  + format_sensitivity(s["sensitivity"]), flush=True)
+        if adaptive:
+            widths = ci_widths(merged, adaptive["metrics"])
+            s["runs_budget"] = runs
+            s["ci_target_width"] = adaptive["target_ci_width"]
+            s["ci_width"] = {m: round(w, 6) for m, w in widths.items()}
+            s["converged"] = all(w <= adaptive["target_ci_width"] for w in widths.values())
+        write_summary(results_dir, g, s)
         summaries[g.stem] = s
+        if cache is not None:
+            cache.put(cache_keys[g], s)
+    if cache is not None and (args.cache_max_mb is not None or args.cache_max_age_days is not None):
+        max_bytes = int(args.cache_max_mb * 1024 * 1024) if args.cache_max_mb is not None else None
+        cache.evict(max_bytes, args.cache_max_age_days)
 
     # metadata + ALL.summaries.json
     meta = {
         "runs": args.runs,
         "seed": args.seed,
         "step_cap": args.step_cap,
-        "harness_version": "v0",
+        "engine": args.engine,
+        "harness_version": HARNESS_VERSION,
     }
+    if args.config:
+        meta["config"] = args.config
+    if adaptive:
+        meta["runs"] = runs
+        meta["adaptive"] = adaptive
+        meta["total_runs"] = sum(s["runs"] for s in summaries.values())
     write_json(results_dir / "summary" / "metadata.json", meta)
     write_json(results_dir / "summary" / "ALL.summaries.json", summaries)
+    stage_s["summarize_s"] = clock() - t
 
     dt = time.time() - t0
-    print(f"[harness] Simulated {len(graph_files)} graphs in {dt:.2f}s; output -> {results_dir}")
+    if args.profile:
+        # Graph stages are summed over workers, so with --workers > 1 they can exceed tasks_wall_s.
+        write_json(results_dir / "summary" / "profile.json", {
+            "engine": args.engine,
+            "workers": workers,
+            "wall_s": round(dt, 6),
+            "stages": {k: round(v, 6) for k, v in stage_s.items()},
+            "totals": {"graphs": len(graph_files), "cached": len(cached), **profile_totals(graph_profiles)},
+            "graphs": graph_profiles,
+        })
+    print(f"[harness] Simulated {len(graph_files) - len(cached)} graphs ({len(cached)} cached) in {dt:.2f}s; "
+          f"output -> {results_dir}")
 
 if __name__ == "__main__":
     main()
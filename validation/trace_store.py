@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Compact per-graph storage for raw harness runs (`run_harness.py --write-raw`).
+
+One `.trace` file holds every run of a graph:
+
+    header   MAGIC, uint32 length, JSON {"nodes": [...], "kinds": [...], "node_kinds": [...]}
+    records  one per run, appended in order:
+               <q seed> <B flags> <I retries> <I steps> <I path_len> <I n_handoffs>
+               <d latency_ms> <I tokens> <d cost> <I n_attempts>
+               path_len x uint32 interned node ids
+               n_handoffs x 3 bytes (from_kind id, to_kind id, ok) for handoffs that
+               cannot be derived from consecutive path nodes
+               n_attempts x <I node id> <I failed> <B succeeded> <I retries so far>
+               (`--sensitivity` runs; the ATTEMPTS flag tells [] from None)
+    footer   uint64 record offsets, then <Q runs> <Q offsets_pos> END_MAGIC
+
+Handoffs between consecutive path nodes are implied by the node kinds, so a
+normal run costs 49 bytes plus 4 bytes per step. A file without a footer (e.g.
+the writer was killed) is still readable: the reader falls back to scanning.
+"""
+
+import argparse
+import json
+import mmap
+import struct
+import sys
+from array import array
+from dataclasses import asdict, is_dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+MAGIC = b"ABTRACE2"
+END_MAGIC = b"ABTREND1"
+RECORD = struct.Struct("<qBIIIIdIdI")
+ATTEMPT = struct.Struct("<IIBI")
+TRAILER = struct.Struct("<QQ8s")
+
+SUCCESS, TIMEOUT, TOUCHED_LOOP, EXPLICIT_HANDOFFS, ATTEMPTS = 1, 2, 4, 8, 16
+
+def _u32(values) -> bytes:
+    a = array("I", values)
+    if sys.byteorder == "big":
+        a.byteswap()
+    return a.tobytes()
+
+# ---------- Writer ----------
+class TraceWriter:
+    """Buffered, append-only writer; use as a context manager so the footer is written."""
+
+    def __init__(self, path: Path, node_kinds: Dict[str, str], buffer_size: int = 1 << 20):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.nodes = list(node_kinds)
+        self.index = {nid: i for i, nid in enumerate(self.nodes)}
+        self.kinds = sorted(set(node_kinds.values()))
+        self.kind_index = {k: i for i, k in enumerate(self.kinds)}
+        self.node_kind = [self.kind_index[node_kinds[nid]] for nid in self.nodes]
+        self.offsets = array("Q")
+
+        self._f = open(self.path, "wb", buffering=buffer_size)
+        meta = json.dumps({"nodes": self.nodes, "kinds": self.kinds, "node_kinds": self.node_kind},
+                          separators=(",", ":")).encode()
+        self._f.write(MAGIC + struct.pack("<I", len(meta)) + meta)
+        self._pos = len(MAGIC) + 4 + len(meta)
+
+    def _kind_id(self, kind: str) -> int:
+        if kind not in self.kind_index:
+            raise ValueError(f"kind {kind!r} is not in the trace header")
+        return self.kind_index[kind]
+
+    def append(self, run) -> None:
+        r = asdict(run) if is_dataclass(run) else run
+        path = [self.index[nid] for nid in r["path"]]
+        implied = [(self.node_kind[a], self.node_kind[b], 1) for a, b in zip(path, path[1:])]
+        actual = [(self._kind_id(h["from_kind"]), self._kind_id(h["to_kind"]), int(h.get("ok", True)))
+                  for h in r["handoffs"]]
+        flags = (SUCCESS * r["success"]) | (TIMEOUT * r["timeout"]) | (TOUCHED_LOOP * r["touched_loop"])
+        if actual[:len(implied)] == implied:
+            extra = actual[len(implied):]   # e.g. the handoff that ran into the step cap
+        else:
+            flags |= EXPLICIT_HANDOFFS
+            extra = actual
+        attempts = r.get("attempts")
+        if attempts is not None:
+            flags |= ATTEMPTS
+        attempts = attempts or ()
+        blob = (RECORD.pack(r["seed"], flags, r["retries"], r["steps"], len(path), len(extra),
+                            r.get("latency_ms", 0.0), r.get("tokens", 0), r.get("cost", 0.0), len(attempts))
+                + _u32(path) + bytes(b for h in extra for b in h)
+                + b"".join(ATTEMPT.pack(self.index[nid], fails, ok, so_far) for nid, fails, ok, so_far in attempts))
+        self.offsets.append(self._pos)
+        self._f.write(blob)
+        self._pos += len(blob)
+
+    def close(self) -> None:
+        if self._f.closed:
+            return
+        offsets = array("Q", self.offsets)
+        if sys.byteorder == "big":
+            offsets.byteswap()
+        self._f.write(offsets.tobytes())
+        self._f.write(TRAILER.pack(len(self.offsets), self._pos, END_MAGIC))
+        self._f.close()
+
+    def __enter__(self) -> "TraceWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+# ---------- Reader ----------
+class TraceReader:
+    """Memory-mapped reader; runs are decoded lazily, filters only touch record headers."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._file = open(self.path, "rb")
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mm[:len(MAGIC)] != MAGIC:
+            if self._mm[:len(MAGIC) - 1] == MAGIC[:-1]:
+                raise ValueError(f"{self.path} uses an older trace format; re-run run_harness.py --write-raw")
+            raise ValueError(f"{self.path} is not an AgentBound trace file")
+        (meta_len,) = struct.unpack_from("<I", self._mm, len(MAGIC))
+        body = len(MAGIC) + 4
+        meta = json.loads(self._mm[body:body + meta_len])
+        self.nodes: List[str] = meta["nodes"]
+        self.kinds: List[str] = meta["kinds"]
+        self._node_kind: List[int] = meta["node_kinds"]
+        self._offsets = self._read_offsets(body + meta_len)
+
+    def _read_offsets(self, first: int):
+        size = len(self._mm)
+        if size >= first + TRAILER.size:
+            runs, pos, end = TRAILER.unpack_from(self._mm, size - TRAILER.size)
+            if end == END_MAGIC and pos + 8 * runs + TRAILER.size == size:
+                if sys.byteorder == "little":
+                    return memoryview(self._mm)[pos:pos + 8 * runs].cast("Q")
+                offsets = array("Q", self._mm[pos:pos + 8 * runs])
+                offsets.byteswap()
+                return offsets
+        # No footer: recover by scanning the records.
+        offsets = array("Q")
+        pos = first
+        while pos + RECORD.size <= size:
+            n_path, n_extra, n_att = (RECORD.unpack_from(self._mm, pos)[i] for i in (4, 5, 9))
+            end = pos + RECORD.size + 4 * n_path + 3 * n_extra + ATTEMPT.size * n_att
+            if end > size:
+                break
+            offsets.append(pos)
+            pos = end
+        return offsets
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def header(self, i: int) -> Dict:
+        seed, flags, retries, steps, _, _, latency, tokens, cost, _ = RECORD.unpack_from(self._mm, self._offsets[i])
+        return {"seed": seed, "success": bool(flags & SUCCESS), "timeout": bool(flags & TIMEOUT),
+                "retries": retries, "steps": steps, "touched_loop": bool(flags & TOUCHED_LOOP),
+                "latency_ms": latency, "tokens": tokens, "cost": cost}
+
+    def __getitem__(self, i: int) -> Dict:
+        """Run i in the same shape as `asdict(RunStats)`."""
+        pos = self._offsets[i]
+        (seed, flags, retries, steps, n_path, n_extra,
+         latency, tokens, cost, n_att) = RECORD.unpack_from(self._mm, pos)
+        pos += RECORD.size
+        ids = array("I", self._mm[pos:pos + 4 * n_path])
+        if sys.byteorder == "big":
+            ids.byteswap()
+        pos += 4 * n_path
+        extra = self._mm[pos:pos + 3 * n_extra]
+        handoffs = [] if flags & EXPLICIT_HANDOFFS else [
+            (self._node_kind[a], self._node_kind[b], 1) for a, b in zip(ids, ids[1:])]
+        handoffs += [tuple(extra[j:j + 3]) for j in range(0, len(extra), 3)]
+        pos += 3 * n_extra
+        attempts = None
+        if flags & ATTEMPTS:
+            attempts = [(self.nodes[v], fails, bool(ok), so_far) for v, fails, ok, so_far in
+                        ATTEMPT.iter_unpack(self._mm[pos:pos + ATTEMPT.size * n_att])]
+        return {
+            "seed": seed,
+            "success": bool(flags & SUCCESS),
+            "timeout": bool(flags & TIMEOUT),
+            "retries": retries,
+            "steps": steps,
+            "touched_loop": bool(flags & TOUCHED_LOOP),
+            "handoffs": [{"from_kind": self.kinds[a], "to_kind": self.kinds[b], "ok": bool(ok)}
+                         for a, b, ok in handoffs],
+            "path": [self.nodes[j] for j in ids],
+            "latency_ms": latency,
+            "tokens": tokens,
+            "cost": cost,
+            "attempts": attempts,
+        }
+
+    def __iter__(self) -> Iterator[Dict]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def filter(self, success: Optional[bool] = None, timeout: Optional[bool] = None,
+               touched_loop: Optional[bool] = None) -> Iterator[Dict]:
+        """Yield runs matching every given flag; non-matching runs are never decoded."""
+        want = {"success": success, "timeout": timeout, "touched_loop": touched_loop}
+        want = {k: v for k, v in want.items() if v is not None}
+        for i in range(len(self)):
+            h = self.header(i)
+            if all(h[k] == v for k, v in want.items()):
+                yield self[i]
+
+    def close(self) -> None:
+        if isinstance(self._offsets, memoryview):
+            self._offsets.release()
+        self._mm.close()
+        self._file.close()
+
+    def __enter__(self) -> "TraceReader":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+# ---------- CLI ----------
+def main():
+    ap = argparse.ArgumentParser(description="Print runs from a harness .trace file as JSON lines")
+    ap.add_argument("trace")
+    ap.add_argument("--failed", action="store_true", help="Only runs that did not succeed.")
+    ap.add_argument("--timeouts", action="store_true", help="Only runs that hit the step cap.")
+    ap.add_argument("--limit", type=int, default=None)
+    args = ap.parse_args()
+
+    with TraceReader(Path(args.trace)) as reader:
+        runs = reader.filter(success=False if args.failed else None, timeout=True if args.timeouts else None)
+        for n, run in enumerate(runs):
+            if args.limit is not None and n >= args.limit:
+                break
+            print(json.dumps(run))
+
+if __name__ == "__main__":
+    main()